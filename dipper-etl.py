@@ -5,9 +5,14 @@ import logging
 import unittest
 import importlib
 import time
+import resource
+import multiprocessing
 from tests.test_general import GeneralGraphTestCase
 from dipper.utils.TestUtils import TestUtils
 from dipper.utils.GraphUtils import GraphUtils
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils.SortUtil import SortUtil
+from dipper import config
 
 logging.basicConfig()
 
@@ -16,64 +21,217 @@ requests_log.setLevel(logging.ERROR)
 
 test_suite = unittest.TestLoader().loadTestsFromTestCase(GeneralGraphTestCase)
 
+# TODO this should be generated by looking in the dipper/sources directory
+# or read from a sources/dataset/config yaml or dir of yamls
+source_to_class_map = {
+    # 'facebase_alpha': 'FaceBase_alpha',
+    'hpoa': 'HPOAnnotations',   # ~3 min
+    'zfin': 'ZFIN',
+    'omim': 'OMIM',  # first run takes ~15 min, due to required throttling
+    'biogrid': 'BioGrid',  # interactions file takes <10 minutes
+    'mgi': 'MGI',
+    'impc': 'IMPC',
+    # Panther takes ~1hr to map 7 species-worth of associations
+    'panther': 'Panther',
+    'oma': 'OMA',
+    'ncbigene': 'NCBIGene',  # takes about 4 minutes to process 2 species
+    'ucscbands': 'UCSCBands',
+    'ctd': 'CTD',
+    'genereviews': 'GeneReviews',
+    'eom': 'EOM',  # Takes about 5 seconds.
+    'coriell': 'Coriell',
+    'clinvar': 'ClinVar',  # a few minutes, less with --workers
+    'monochrom': 'Monochrom',
+    'kegg': 'KEGG',
+    'animalqtldb': 'AnimalQTLdb',
+    'ensembl': 'Ensembl',
+    'hgnc': 'HGNC',
+    'orphanet': 'Orphanet',
+    'omia': 'OMIA',
+    'flybase': 'FlyBase',
+    'mmrrc': 'MMRRC',
+    'wormbase': 'WormBase',
+    'mpd': 'MPD',
+    'gwascatalog': 'GWASCatalog',
+    'monarch': 'Monarch',
+    'go': 'GeneOntology',
+    'reactome': 'Reactome',
+    'udp': 'UDP',
+    'mgi-slim': 'MGISlim',
+    'zfinslim': 'ZFINSlim',
+    'bgee': 'Bgee',
+    'mydrug': 'MyDrug',
+    'stringdb': 'StringDB',
+    'rgd': 'RGD',
+    'sgd': 'SGD',
+    'mychem': 'MyChem',
+    'ebi': 'EBIGene2Phen',
+}
+
+taxa_supported = [  # these are not taxa
+    'Panther', 'NCBIGene', 'BioGrid', 'UCSCBands', 'GeneOntology',
+    'Bgee', 'Ensembl', 'StringDB', 'OMA']
+
+workers_supported = [  # sources which can parse in several processes
+    'GeneOntology', 'Bgee', 'ClinVar', 'ZFIN', 'MGI']
+
+logger = logging.getLogger(__name__)
+
+
+def process_source(source, args, tax_ids):
+    """
+    Fetch, test, parse and write a single source with its own graph.
+    :param source: str key into source_to_class_map
+    :param args: parsed command line arguments
+    :param tax_ids: list of int NCBITaxon numbers or None
+    :return: dict of wall time and peak memory for this source
+    """
+    logger.info("\n******* %s *******", source)
+    start_source = time.time()
+    src = source_to_class_map[source]
+
+    # import source lib
+    module = "dipper.sources.{0}".format(src)
+    imported_module = importlib.import_module(module)
+    source_class = getattr(imported_module, src)
+    mysource = None
+    # arg factory
+    source_args = dict(
+        graph_type=args.graph
+    )
+    source_args['are_bnodes_skolemized'] = not args.use_bnodes
+    if src in taxa_supported:
+        source_args['tax_ids'] = tax_ids
+    if args.version:
+        source_args['version'] = args.version
+    if src in workers_supported:
+        source_args['workers'] = args.workers
+
+    mysource = source_class(**source_args)
+    try:
+        if args.parse_only is False:
+            start_fetch = time.time()
+            mysource.fetch(args.force)
+            end_fetch = time.time()
+            logger.info("Fetching time: %d sec", end_fetch-start_fetch)
 
-def main():
-    # TODO this should be generated by looking in the dipper/sources directory
-    # or read from a sources/dataset/config yaml or dir of yamls
-    source_to_class_map = {
-        # 'facebase_alpha': 'FaceBase_alpha',
-        'hpoa': 'HPOAnnotations',   # ~3 min
-        'zfin': 'ZFIN',
-        'omim': 'OMIM',  # full file takes ~15 min, due to required throttling
-        'biogrid': 'BioGrid',  # interactions file takes <10 minutes
-        'mgi': 'MGI',
-        'impc': 'IMPC',
-        # Panther takes ~1hr to map 7 species-worth of associations
-        'panther': 'Panther',
-        'oma': 'OMA',
-        'ncbigene': 'NCBIGene',  # takes about 4 minutes to process 2 species
-        'ucscbands': 'UCSCBands',
-        'ctd': 'CTD',
-        'genereviews': 'GeneReviews',
-        'eom': 'EOM',  # Takes about 5 seconds.
-        'coriell': 'Coriell',
-        # 'clinvar': 'ClinVar',                   # takes ~ half hour
-        # 'clinvarxml_alpha': 'ClinVarXML_alpha', # takes ~ five minutes
-        'monochrom': 'Monochrom',
-        'kegg': 'KEGG',
-        'animalqtldb': 'AnimalQTLdb',
-        'ensembl': 'Ensembl',
-        'hgnc': 'HGNC',
-        'orphanet': 'Orphanet',
-        'omia': 'OMIA',
-        'flybase': 'FlyBase',
-        'mmrrc': 'MMRRC',
-        'wormbase': 'WormBase',
-        'mpd': 'MPD',
-        'gwascatalog': 'GWASCatalog',
-        'monarch': 'Monarch',
-        'go': 'GeneOntology',
-        'reactome': 'Reactome',
-        'udp': 'UDP',
-        'mgi-slim': 'MGISlim',
-        'zfinslim': 'ZFINSlim',
-        'bgee': 'Bgee',
-        'mydrug': 'MyDrug',
-        'stringdb': 'StringDB',
-        'rgd': 'RGD',
-        'sgd': 'SGD',
-        'mychem': 'MyChem',
-        'ebi': 'EBIGene2Phen',
+        mysource.settestonly(args.test_only)
+
+        # run tests first
+        if (args.no_verify or args.skip_tests) is not True:
+            suite = mysource.getTestSuite()
+            if suite is None:
+                logger.warning(
+                    "No tests configured for this source: %s", source)
+            else:
+                unittest.TextTestRunner(verbosity=2).run(suite)
+        else:
+            logger.info("Skipping Tests for source: %s", source)
+
+        if args.test_only is False and args.fetch_only is False:
+            start_parse = time.time()
+            mysource.parse(args.limit)
+            end_parse = time.time()
+            logger.info("Parsing time: %d sec", end_parse-start_parse)
+            if args.graph == 'rdf_graph':
+                logger.info("Found %d nodes", len(mysource.graph))
+
+                # Add property axioms
+                start_axiom_exp = time.time()
+                logger.info("Adding property axioms")
+
+                properties = GraphUtils.get_properties_from_graph(mysource.graph)
+                GraphUtils.add_property_axioms(mysource.graph, properties)
+                end_axiom_exp = time.time()
+                logger.info(
+                    "Property axioms added: %d sec", end_axiom_exp-start_axiom_exp)
+
+                start_write = time.time()
+                mysource.write(fmt=args.dest_fmt)
+                end_write = time.time()
+                logger.info("Writing time: %d sec", end_write-start_write)
+            elif args.graph == 'streamed_graph':
+                # triples are already on disk, property axioms come from what was seen
+                start_axiom_exp = time.time()
+                logger.info("Adding property axioms")
+
+                properties = GraphUtils.get_properties_from_graph(mysource.graph)
+                mysource.graph.addGraph(
+                    GraphUtils.add_property_axioms(RDFGraph(), properties))
+                end_axiom_exp = time.time()
+                logger.info(
+                    "Property axioms added: %d sec", end_axiom_exp-start_axiom_exp)
+
+                start_write = time.time()
+                mysource.write(fmt='nt')
+                end_write = time.time()
+                logger.info("Writing time: %d sec", end_write-start_write)
+    finally:
+        # an on disk graph store is only scratch space, written out or not
+        mysource.close()
+    # if args.no_verify is not True:
+
+    #    status = mysource.verify()
+    #    if status is not True:
+    #        logger.error(
+    #            'Source %s did not pass verification tests.', source)
+    #        exit(1)
+    # else:
+    #    logger.info('skipping verification step')
+    logger.info('***** Finished with %s *****', source)
+
+    return {
+        'source': source,
+        'status': 'ok',
+        'output': mysource.outfile,
+        'wall_time': time.time() - start_source,
+        # kilobytes on linux (bytes on macOS); a high water mark for the process
+        'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
     }
 
-    logger = logging.getLogger(__name__)
 
+def run_source_job(source, args, tax_ids):
+    """
+    Pool worker wrapper, a failing source should not take down its siblings
+    """
+    start_source = time.time()
+    try:
+        return process_source(source, args, tax_ids)
+    except Exception:  # report every source, then fail the run
+        logger.exception('Source %s failed', source)
+        return {
+            'source': source,
+            'status': 'failed',
+            'output': None,
+            'wall_time': time.time() - start_source,
+            'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+
+
+def log_run_summary(run_stats):
+    """
+    Per source wall time and peak resident memory, once all are done
+    """
+    logger.info(
+        "%-16s %-8s %12s %14s", 'source', 'status', 'wall (sec)', 'peak RSS (MB)')
+    for stat in run_stats:
+        logger.info(
+            "%-16s %-8s %12d %14.1f", stat['source'], stat['status'],
+            stat['wall_time'], stat['peak_rss'] / 1024)
+
+
+def main():
     parser = argparse.ArgumentParser(
         description='Dipper: Data Ingestion Pipeline for SciGraph',
         formatter_class=argparse.RawTextHelpFormatter)
     parser.add_argument(
         '-g', '--graph', type=str, default="rdf_graph",
         help='graph type: rdf_graph, streamed_graph')
+    parser.add_argument(
+        '--graph_store', type=str, choices=['memory', 'sqlite'],
+        help='where an rdf_graph keeps its triples while parsing,\n'
+        'sqlite trades speed for memory on the largest sources\n'
+        'defaults to graph_store in conf.yaml, else memory')
     parser.add_argument(
         '-s', '--sources', type=str, required=True,
         help='comma separated list of sources')
@@ -128,6 +286,27 @@ def main():
         help='serialization format: [turtle], nt, nquads, rdfxml, n3, raw',
         type=str)
 
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of sources to process at once, each in its own process.\n'
+        'only list sources which do not share raw files or instantiate each other')
+
+    parser.add_argument(
+        '-w', '--workers', type=int, default=1,
+        help='number of processes a source may parse its files with\n'
+        '(into a streamed_graph). '
+        'Implemented for: ' + ', '.join(workers_supported))
+
+    parser.add_argument(
+        '--release', type=str,
+        help='merge the (nt or nquads) output of every source into this file,\n'
+        'sorted with duplicate triples removed; .gz or .zst compresses it')
+
+    parser.add_argument(
+        '--refresh_axioms', action='store_true',
+        help='parse the property axiom ontologies again (see GraphUtils)\n'
+        'rather than use their declarations cached in raw/property_axioms.yaml')
+
     parser.add_argument(
         '--version', '-v',
         help='version of source',
@@ -138,10 +317,6 @@ def main():
     if args.taxon is not None:
         tax_ids = [int(t) for t in args.taxon.split(',')]
 
-    taxa_supported = [  # these are not taxa
-        'Panther', 'NCBIGene', 'BioGrid', 'UCSCBands', 'GeneOntology',
-        'Bgee', 'Ensembl', 'StringDB', 'OMA']
-
     formats_supported = [
         'turtle', 'ttl',
         'ntriples', 'nt',
@@ -158,6 +333,10 @@ def main():
         else:
             logging.getLogger().setLevel(logging.INFO)
 
+    if args.graph_store is not None:
+        # read by Source when it creates its graph (also in the -j processes)
+        config.get_config()['graph_store'] = args.graph_store
+
     if not args.use_bnodes:
         logger.info("Will Skolemize Blank Nodes")
 
@@ -203,79 +382,45 @@ def main():
     else:
         args.dest_fmt = 'turtle'
 
-    # iterate through all the sources
-    for source in args.sources.split(','):
-        logger.info("\n******* %s *******", source)
-        source = source.lower()
-        src = source_to_class_map[source]
-
-        # import source lib
-        module = "dipper.sources.{0}".format(src)
-        imported_module = importlib.import_module(module)
-        source_class = getattr(imported_module, src)
-        mysource = None
-        # arg factory
-        source_args = dict(
-            graph_type=args.graph
-        )
-        source_args['are_bnodes_skolemized'] = not args.use_bnodes
-        if src in taxa_supported:
-            source_args['tax_ids'] = tax_ids
-        if args.version:
-            source_args['version'] = args.version
-
-        mysource = source_class(**source_args)
-        if args.parse_only is False:
-            start_fetch = time.clock()
-            mysource.fetch(args.force)
-            end_fetch = time.clock()
-            logger.info("Fetching time: %d sec", end_fetch-start_fetch)
-
-        mysource.settestonly(args.test_only)
+    if args.release is not None and args.graph != 'streamed_graph' and \
+            args.dest_fmt not in ('nt', 'nquads'):
+        logger.error("--release needs --dest_fmt nt, nquads or a streamed_graph")
+        exit(1)
 
-        # run tests first
-        if (args.no_verify or args.skip_tests) is not True:
-            suite = mysource.getTestSuite()
-            if suite is None:
-                logger.warning(
-                    "No tests configured for this source: %s", source)
-            else:
-                unittest.TextTestRunner(verbosity=2).run(suite)
-        else:
-            logger.info("Skipping Tests for source: %s", source)
+    # read (or rebuild) the cached property axioms once for every source,
+    # before any -j process would each go looking for them
+    if args.refresh_axioms or (args.test_only or args.fetch_only) is not True:
+        GraphUtils.get_property_types(refresh=args.refresh_axioms)
 
-        if args.test_only is False and args.fetch_only is False:
-            start_parse = time.clock()
-            mysource.parse(args.limit)
-            end_parse = time.clock()
-            logger.info("Parsing time: %d sec", end_parse-start_parse)
-            if args.graph == 'rdf_graph':
-                logger.info("Found %d nodes", len(mysource.graph))
+    # iterate through all the sources
+    sources = [source.lower() for source in args.sources.split(',')]
+    if len(sources) > 1:
+        # a fresh process per source, even one at a time, keeps each peak RSS
+        # figure honest: ru_maxrss is a high water mark of the whole process
+        pool = multiprocessing.Pool(
+            processes=min(max(args.jobs, 1), len(sources)), maxtasksperchild=1)
+        try:
+            run_stats = pool.starmap(
+                run_source_job,
+                [(source, args, tax_ids) for source in sources],
+                chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        run_stats = [process_source(source, args, tax_ids) for source in sources]
 
-                # Add property axioms
-                start_axiom_exp = time.clock()
-                logger.info("Adding property axioms")
+    log_run_summary(run_stats)
+    if any(stat['status'] != 'ok' for stat in run_stats):
+        exit(1)
 
-                properties = GraphUtils.get_properties_from_graph(mysource.graph)
-                GraphUtils.add_property_axioms(mysource.graph, properties)
-                end_axiom_exp = time.clock()
-                logger.info(
-                    "Property axioms added: %d sec", end_axiom_exp-start_axiom_exp)
+    if args.release is not None:
+        start_merge = time.time()
+        outputs = [stat['output'] for stat in run_stats if stat['output'] is not None]
+        logger.info("Merging %s into %s", ', '.join(outputs), args.release)
+        SortUtil.sort_unique(outputs, args.release)
+        logger.info("Merging time: %d sec", time.time() - start_merge)
 
-                start_write = time.clock()
-                mysource.write(fmt=args.dest_fmt)
-                end_write = time.clock()
-                logger.info("Writing time: %d sec", end_write-start_write)
-        # if args.no_verify is not True:
-
-        #    status = mysource.verify()
-        #    if status is not True:
-        #        logger.error(
-        #            'Source %s did not pass verification tests.', source)
-        #        exit(1)
-        # else:
-        #    logger.info('skipping verification step')
-        logger.info('***** Finished with %s *****', source)
     # load configuration parameters
     # for example, keys
 
@@ -11,6 +11,8 @@ from dipper import curie_map as curie_map_class
 
 LOG = logging.getLogger(__name__)
 
+NODE_CACHE_SIZE = 2 ** 20   # curies remembered as rdflib nodes
+
 
 class RDFGraph(DipperGraph, ConjunctiveGraph):
     """
@@ -18,6 +20,10 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
     The goal of this class is wrap the creation
     of triples and manage creation of URIRef,
     Bnodes, and literals from an input curie
+
+    Nodes are interned per graph: the same curie always gives back
+    the same URIRef/BNode object, and a prefix is bound to the
+    namespace manager only the first time it is seen.
     """
 
     curie_map = curie_map_class.get()
@@ -28,15 +34,24 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
         globaltt = yaml.safe_load(fhandle)
         globaltcid = {v: k for k, v in globaltt.items()}
 
-    def __init__(self, are_bnodes_skized=True, identifier=None):
+    def __init__(self, are_bnodes_skized=True, identifier=None, store='IOMemory'):
+        '''
+        :param are_bnodes_skized: bool skolemize blank nodes
+        :param identifier: str graph identifier
+        :param store: rdflib store name or instance, i.e. an open SQLiteStore
+                      for graphs too large to hold in memory
+        '''
         # print("in RDFGraph  with id: ", identifier)
-        super().__init__('IOMemory', identifier)
+        super().__init__(store, identifier)
         self.are_bnodes_skized = are_bnodes_skized
+        self._node_cache = {}
+        self._bound_prefixes = set()
 
         # Can be removed when this is resolved
         # https://github.com/RDFLib/rdflib/issues/632
         for pfx in ('OBO',):  # , 'ORPHA'):
             self.bind(pfx, Namespace(self.curie_map[pfx]))
+            self._bound_prefixes.add(pfx)
 
         # try adding them all
         # self.bind_all_namespaces()  # too much
@@ -102,7 +117,10 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
         :param curie: str identifier formatted as curie or iri
         :return: node: RDFLib URIRef or BNode object
         """
-        node = None
+        node = self._node_cache.get(curie)
+        if node is not None:
+            return node
+
         if curie[0] == '_':
             if self.are_bnodes_skized is True:
                 node = self.skolemizeBlankNode(curie)
@@ -115,14 +133,20 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
         else:
             iri = RDFGraph.curie_util.get_uri(curie)
             if iri is not None:
-                node = URIRef(RDFGraph.curie_util.get_uri(curie))
+                node = URIRef(iri)
                 # Bind prefix map to graph
                 prefix = curie.split(':')[0]
-                if prefix not in self.namespace_manager.namespaces():
+                if prefix not in self._bound_prefixes:
                     mapped_iri = self.curie_map[prefix]
                     self.bind(prefix, Namespace(mapped_iri))
+                    self._bound_prefixes.add(prefix)
             else:
                 LOG.error("couldn't make URI for %s", curie)
+
+        if node is not None:
+            if len(self._node_cache) >= NODE_CACHE_SIZE:
+                self._node_cache.clear()
+            self._node_cache[curie] = node
         return node
 
     def bind_all_namespaces(self):
@@ -134,6 +158,7 @@ class RDFGraph(DipperGraph, ConjunctiveGraph):
         for prefix in self.curie_map.keys():
             iri = self.curie_map[prefix]
             self.bind(prefix, Namespace(iri))
+            self._bound_prefixes.add(prefix)
         return
 
     # serialize() conflicts between rdflib & Graph.serialize abstractmethod
@@ -0,0 +1,319 @@
+import logging
+import os
+import sqlite3
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.store import Store, VALID_STORE, NO_STORE
+
+LOG = logging.getLogger(__name__)
+
+TERM_CACHE_SIZE = 2 ** 20   # terms whose integer id is remembered in memory
+PAGE_CACHE_KB = 256 * 1024  # sqlite page cache, the bulk of what stays in RAM
+FETCH_ROWS = 10000          # rows read from a cursor at a time
+COMMIT_ROWS = 100000        # triples added between commits, bounds dirty pages
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, key TEXT UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS contexts (id INTEGER PRIMARY KEY)",
+    "CREATE TABLE IF NOT EXISTS quads ("
+    " s INTEGER, p INTEGER, o INTEGER, c INTEGER,"
+    " PRIMARY KEY (s, p, o, c)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS quads_pos ON quads (p, o, s)",
+    "CREATE INDEX IF NOT EXISTS quads_os ON quads (o, s)",
+)
+
+
+class SQLiteStore(Store):
+    """
+    An rdflib Store kept in a single SQLite file, for graphs which
+    do not fit in memory.
+
+    Each distinct term (IRI, blank node or literal) is stored once and
+    given an integer id; triples are rows of four integer ids
+    (subject, predicate, object, context).
+    Only the sqlite page cache and the most recently used term ids are held
+    in memory, so a graph of tens of millions of triples needs a few GB of
+    disk rather than tens of GB of RAM.
+
+    The file is treated as scratch space: writes are not journaled or synced,
+    opening with create=True starts from an empty file and destroy() removes it.
+
+        graph = RDFGraph(True, identifier, SQLiteStore('raw/mgi/graph.sqlite'))
+
+    """
+
+    context_aware = True
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration=None, identifier=None):
+        self.path = None
+        self._conn = None
+        self._pending = 0
+        self._term_ids = {}
+        self._contexts = {}
+        self._namespace = {}
+        self._prefix = {}
+        super().__init__(configuration)
+        self.identifier = identifier
+
+    def open(self, configuration, create=True):
+        """
+        :param configuration: str path of the sqlite file
+        :param create: bool start a new (empty) store
+        :return: VALID_STORE or NO_STORE
+        """
+        self.path = configuration
+        if create:
+            if os.path.exists(self.path):
+                LOG.info("Replacing graph store %s", self.path)
+                os.remove(self.path)
+        elif not os.path.exists(self.path):
+            return NO_STORE
+
+        self._conn = sqlite3.connect(self.path)
+        for pragma in (
+                'journal_mode = OFF', 'synchronous = OFF',
+                'cache_size = -{}'.format(PAGE_CACHE_KB)):
+            self._conn.execute('PRAGMA ' + pragma)
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        for (ctx_id,) in self._conn.execute("SELECT id FROM contexts"):
+            self._contexts[ctx_id] = None
+        LOG.info("Opened graph store %s", self.path)
+
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction=False):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+        self._term_ids = {}
+
+    def destroy(self, configuration=None):
+        """
+        Close the store and remove its file
+        """
+        self.close()
+        path = configuration or self.path
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+            LOG.info("Removed graph store %s", path)
+
+    def commit(self):
+        self._conn.commit()
+        self._pending = 0
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def add(self, triple, context, quoted=False):
+        Store.add(self, triple, context, quoted)
+        (subj, pred, obj) = triple
+        self._conn.execute(
+            "INSERT OR IGNORE INTO quads VALUES (?, ?, ?, ?)", (
+                self._get_term_id(subj), self._get_term_id(pred),
+                self._get_term_id(obj), self._get_context_id(context)))
+        self._pending += 1
+        if self._pending >= COMMIT_ROWS:
+            self.commit()
+
+    def addN(self, quads):
+        for subj, pred, obj, context in quads:
+            self.add((subj, pred, obj), context)
+
+    def remove(self, triple_pattern, context=None):
+        where, params = self._where(triple_pattern, context)
+        if where is None:
+            return
+        for triple, contexts in list(self.triples(triple_pattern, context)):
+            for ctx in list(contexts):
+                Store.remove(self, triple, ctx)
+        self._conn.execute("DELETE FROM quads" + where, params)
+
+    def triples(self, triple_pattern, context=None):
+        """
+        :return: generator of ((s, p, o), generator of contexts)
+        """
+        where, params = self._where(triple_pattern, context)
+        if where is None:
+            return
+        if context is not None or len(self._contexts) <= 1:
+            sql = "SELECT s, p, o, c FROM quads" + where
+        else:  # a triple may be in several contexts, report it once
+            sql = "SELECT s, p, o, group_concat(c) FROM quads" + where + \
+                " GROUP BY s, p, o"
+        cursor = self._conn.cursor()
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(FETCH_ROWS)
+            if not rows:
+                break
+            terms = self._get_terms(
+                {term_id for row in rows for term_id in row[:3]})
+            for (subj, pred, obj, ctx) in rows:
+                yield (terms[subj], terms[pred], terms[obj]), \
+                    self._iter_contexts(ctx)
+
+    def __len__(self, context=None):
+        if context is None:
+            if len(self._contexts) <= 1:
+                sql = "SELECT count(*) FROM quads"
+            else:
+                sql = "SELECT count(*) FROM (SELECT DISTINCT s, p, o FROM quads)"
+            return self._conn.execute(sql).fetchone()[0]
+        ctx_id = self._find_term_id(getattr(context, 'identifier', context))
+        if ctx_id is None:
+            return 0
+        return self._conn.execute(
+            "SELECT count(*) FROM quads WHERE c = ?", (ctx_id,)).fetchone()[0]
+
+    def contexts(self, triple=None):
+        if triple is None:
+            for ctx_id in list(self._contexts):
+                yield self._get_context(ctx_id)
+        else:
+            for (triple, contexts) in self.triples(triple):
+                for ctx in contexts:
+                    yield ctx
+
+    def bind(self, prefix, namespace, override=True):
+        # same bookkeeping as rdflib's Memory store
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = self._prefix.get(namespace)
+        if bound_prefix is None and bound_namespace is not None:
+            bound_prefix = self._prefix.get(bound_namespace)
+        if override:
+            if bound_prefix is not None:
+                del self._namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self._prefix[bound_namespace]
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+        else:
+            if bound_namespace is None:
+                bound_namespace = namespace
+            if bound_prefix is None:
+                bound_prefix = prefix
+            self._prefix[bound_namespace] = bound_prefix
+            self._namespace[bound_prefix] = bound_namespace
+
+    def namespace(self, prefix):
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace):
+        return self._prefix.get(namespace)
+
+    def namespaces(self):
+        for prefix, namespace in list(self._namespace.items()):
+            yield prefix, namespace
+
+    @staticmethod
+    def _encode(term):
+        """
+        One text key per term: a kind letter then the term,
+        literals carry their language and datatype before the lexical form
+        """
+        if isinstance(term, Literal):
+            return 'L{}\x00{}\x00{}'.format(
+                term.language or '', term.datatype or '', str(term))
+        if isinstance(term, BNode):
+            return 'B' + str(term)
+        if isinstance(term, URIRef):
+            return 'U' + str(term)
+        raise TypeError("Cannot store {} {!r}".format(type(term), term))
+
+    @staticmethod
+    def _decode(key):
+        if key[0] == 'U':
+            return URIRef(key[1:])
+        if key[0] == 'B':
+            return BNode(key[1:])
+        language, datatype, lexical = key[1:].split('\x00', 2)
+        return Literal(
+            lexical, lang=language or None, datatype=URIRef(datatype) if datatype else None)
+
+    def _get_term_id(self, term):
+        key = self._encode(term)
+        term_id = self._term_ids.get(key)
+        if term_id is None:
+            self._conn.execute("INSERT OR IGNORE INTO terms (key) VALUES (?)", (key,))
+            term_id = self._conn.execute(
+                "SELECT id FROM terms WHERE key = ?", (key,)).fetchone()[0]
+            if len(self._term_ids) >= TERM_CACHE_SIZE:
+                self._term_ids.clear()
+            self._term_ids[key] = term_id
+        return term_id
+
+    def _find_term_id(self, term):
+        """
+        :return: int id of a term already in the store, or None
+        """
+        key = self._encode(term)
+        term_id = self._term_ids.get(key)
+        if term_id is None:
+            row = self._conn.execute(
+                "SELECT id FROM terms WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                term_id = row[0]
+        return term_id
+
+    def _get_terms(self, term_ids):
+        """
+        :return: dict of term id to rdflib term
+        """
+        terms = {}
+        term_ids = list(term_ids)
+        for start in range(0, len(term_ids), 500):
+            batch = term_ids[start:start + 500]
+            for (term_id, key) in self._conn.execute(
+                    "SELECT id, key FROM terms WHERE id IN ({})".format(
+                        ','.join('?' * len(batch))), batch):
+                terms[term_id] = self._decode(key)
+        return terms
+
+    def _get_context_id(self, context):
+        ctx_id = self._get_term_id(context.identifier)
+        if ctx_id not in self._contexts:
+            self._conn.execute("INSERT OR IGNORE INTO contexts VALUES (?)", (ctx_id,))
+            self._contexts[ctx_id] = context
+        return ctx_id
+
+    def _get_context(self, ctx_id):
+        if self._contexts.get(ctx_id) is None:
+            identifier = self._get_terms([ctx_id])[ctx_id]
+            self._contexts[ctx_id] = Graph(store=self, identifier=identifier)
+        return self._contexts[ctx_id]
+
+    def _iter_contexts(self, ctx_ids):
+        for ctx_id in str(ctx_ids).split(','):
+            yield self._get_context(int(ctx_id))
+
+    def _where(self, triple_pattern, context):
+        """
+        :return: (str WHERE clause, list of ids)
+                 or (None, None) if a bound term is not in the store
+        """
+        clauses = []
+        params = []
+        columns = ('s', 'p', 'o')
+        if context is not None:
+            triple_pattern = tuple(triple_pattern) + (
+                getattr(context, 'identifier', context),)
+            columns += ('c',)
+        for column, term in zip(columns, triple_pattern):
+            if term is None:
+                continue
+            if not isinstance(term, (URIRef, BNode, Literal)):
+                # e.g. a Path; only concrete terms can be looked up, so refuse it
+                raise TypeError("Cannot match {!r} in an sqlite store".format(term))
+            term_id = self._find_term_id(term)
+            if term_id is None:
+                return None, None
+            clauses.append(column + ' = ?')
+            params.append(term_id)
+        if clauses:
+            return ' WHERE ' + ' AND '.join(clauses), params
+        return '', params
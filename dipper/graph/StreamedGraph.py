@@ -1,6 +1,9 @@
 import logging
-import re
+import gzip
+import io
+import sys
 import yaml
+from rdflib import URIRef
 
 from dipper.graph.Graph import Graph as DipperGraph
 from dipper.utils.CurieUtil import CurieUtil
@@ -8,14 +11,32 @@ from dipper import curie_map as curimap
 
 LOG = logging.getLogger(__name__)
 
+BUFFER_LINES = 8192         # triples held before a single write
+NODE_CACHE_SIZE = 2 ** 20   # curies remembered as expanded IRIs
+
+# N-Triples string escapes done in one pass over the literal
+# https://www.w3.org/TR/n-triples/#grammar-production-ECHAR
+LITERAL_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\n': '\\n',
+    '"': '\\"',
+    '\r': '\\r',
+})
+
 
 class StreamedGraph(DipperGraph):
     """
     Stream rdf triples to file or stdout
     Assumes a downstream process will sort then uniquify triples
+    (Source.write() does so with utils.SortUtil)
 
     Theoretically could support both ntriple, rdfxml formats, for now
     just support nt
+
+    Expanded curies are memoized and triples are written out
+    BUFFER_LINES at a time; call close() (or flush()) when done.
+    Given a filename rather than a file handle, the file is only opened
+    (and truncated) once there is something to write to it.
     """
 
     curie_map = curimap.get()
@@ -26,25 +47,31 @@ class StreamedGraph(DipperGraph):
         globaltcid = {v: k for k, v in globaltt.items()}
 
     def __init__(
-            self, are_bnodes_skized=True, identifier=None, file_handle=None, fmt='nt'):
+            self, are_bnodes_skized=True, identifier=None, file_handle=None, fmt='nt',
+            filename=None):
         self.are_bnodes_skized = are_bnodes_skized
         self.fmt = fmt
         self.file_handle = file_handle
+        self.filename = filename
         self.identifier = identifier
+        self._buffer = []
+        self._node_cache = {}
+        self._predicates = set()
 
     def addTriple(
             self, subject_id, predicate_id, obj, object_is_literal=None,
             literal_type=None):
         # trying making infrence on type of object if none is supplied
         if object_is_literal is None:
-            if self.curie_regexp.match(obj) or\
+            if self.curie_regexp.match(obj) is not None or\
                     obj.split(':')[0].lower() in ('http', 'https', 'ftp'):
                 object_is_literal = False
-        else:
-            object_is_literal = True
+            else:
+                object_is_literal = True
 
         subject_iri = self._getnode(subject_id)
         predicate_iri = self._getnode(predicate_id)
+        self._predicates.add(predicate_iri)
         if not object_is_literal:
             obj = self._getnode(obj)
 
@@ -59,55 +86,172 @@ class StreamedGraph(DipperGraph):
         return
 
     def skolemizeBlankNode(self, curie):
-        base_iri = StreamedGraph.curie_map.get_base()
-        curie_id = curie.split(':')[1]
-        skolem_iri = "{0}.wellknown/genid/{1}".format(base_iri, curie_id)
+        # same IRI as RDFGraph.skolemizeBlankNode
+        base_iri = StreamedGraph.curie_util.get_base()
+        curie_id = self._strip_bnode_prefix(curie)
+        skolem_iri = "{0}.well-known/genid/{1}".format(base_iri, curie_id)
         return skolem_iri
 
     def serialize(self, subject_iri, predicate_iri, obj,
                   object_is_literal=False, literal_type=None):
+        """
+        Buffer one triple as a line of N-Triples
+        subject, predicate, resource objects and literal_type are
+        N-Triples terms as returned by _getnode(): "<iri>" or "_:id"
+        """
         if not object_is_literal:
-            triple = "<{}> <{}> <{}> .".format(subject_iri, predicate_iri, obj)
+            triple = '%s %s %s .\n' % (subject_iri, predicate_iri, obj)
         elif literal_type is not None:
-            triple = '<{}> <{}> {}^^<{}> .'.format(
+            triple = '%s %s %s^^%s .\n' % (
                 subject_iri, predicate_iri,
                 self._quote_encode(str(obj)), literal_type)
         else:
             if isinstance(obj, str):
-                triple = '<{}> <{}> {} .'.format(
+                triple = '%s %s %s .\n' % (
                     subject_iri, predicate_iri, self._quote_encode(obj))
             else:
                 lit_type = self._getLiteralXSDType(obj)
-                if type is not None:
-                    triple = '<{}> <{}> "{}"^^<{}> .'.format(
+                if lit_type is not None:
+                    triple = '%s %s "%s"^^%s .\n' % (
                         subject_iri, predicate_iri, obj, lit_type)
                 else:
                     raise TypeError("Cannot determine type of {}".format(obj))
 
-        if self.file_handle is None:
-            print(triple)
-        else:
-            self.file_handle.write("{}\n".format(triple))
+        self._buffer.append(triple)
+        if len(self._buffer) >= BUFFER_LINES:
+            self.flush()
+
+    def flush(self):
+        """
+        Write out the triples buffered so far
+        """
+        if self._buffer:
+            if self.file_handle is None and self.filename is not None:
+                LOG.info("Streaming triples to %s", self.filename)
+                self.file_handle = self.open_file(self.filename)
+            if self.file_handle is None:
+                sys.stdout.write(''.join(self._buffer))
+            else:
+                self.file_handle.write(''.join(self._buffer))
+            self._buffer = []
+
+    def addGraph(self, graph):
+        """
+        Stream every triple of an (rdflib) graph, e.g. property axioms
+        :param graph: RDFGraph
+        """
+        ntriples = graph.serialize(format='nt')
+        if isinstance(ntriples, bytes):
+            ntriples = ntriples.decode('utf-8')
+        for line in ntriples.splitlines():
+            if line.strip() != '':
+                self._buffer.append(line + '\n')
+        self.flush()
+
+    def addFile(self, filename):
+        """
+        Stream every line of an N-Triples file, e.g. one written by another
+        StreamedGraph in a worker process
+        :param filename: str path of an uncompressed N-Triples file
+        """
+        with open(filename, 'r', encoding='utf-8') as reader:
+            for line in reader:
+                self._add_line(line)
+        self.flush()
+
+    def addNTriples(self, ntriples):
+        """
+        Stream N-Triples already formatted elsewhere, e.g. by another
+        StreamedGraph in a worker process
+        :param ntriples: str lines of N-Triples
+        """
+        for line in ntriples.splitlines(True):
+            self._add_line(line)
+
+    def _add_line(self, line):
+        if line.strip() == '':
+            return
+        self._predicates.add(line.split(' ', 2)[1])
+        self._buffer.append(line)
+        if len(self._buffer) >= BUFFER_LINES:
+            self.flush()
+
+    def predicates(self):
+        """
+        Like rdflib's Graph.predicates() with no arguments,
+        every distinct property used so far
+        :return: generator of URIRef
+        """
+        for predicate in self._predicates:
+            yield URIRef(predicate[1:-1])
+
+    def close(self):
+        """
+        Write out what is buffered and close the file (stdout is left open)
+        """
+        self.flush()
+        if self.file_handle is not None:
+            self.file_handle.close()
+            self.file_handle = None
+
+    @staticmethod
+    def open_file(filename):
+        """
+        A text file handle to stream triples into,
+        compressed when filename ends in .gz or .zst
+        :param filename: str path of the output file
+        :return: file object
+        """
+        if filename.endswith('.gz'):
+            return gzip.open(filename, 'wt', encoding='utf-8', compresslevel=6)
+        if filename.endswith('.zst'):
+            try:
+                import zstandard
+            except ImportError:
+                LOG.error(
+                    "Writing %s needs zstandard, see requirements/zstd.txt", filename)
+                raise
+            return io.TextIOWrapper(
+                zstandard.ZstdCompressor(level=3).stream_writer(
+                    open(filename, 'wb')),
+                encoding='utf-8')
+
+        return open(filename, 'w', encoding='utf-8')
+
+    @staticmethod
+    def _strip_bnode_prefix(curie):
+        if curie[:2] == '_:':
+            return curie[2:]
+        return curie[1:]
 
     def _getnode(self, curie):
         """
-        Returns IRI, or blank node curie/iri depending on
-        self.skolemize_blank_node setting
+        Returns N-Triples term for an IRI "<iri>", or blank node "_:id" or
+        skolemized "<iri>" depending on self.are_bnodes_skized setting
 
         :param curie: str id as curie or iri
         :return:
         """
-        if re.match(r'^_:', curie):
-            if self.are_bnodes_skized is True:
-                node = self.skolemizeBlankNode(curie)
+        node = self._node_cache.get(curie)
+        if node is None:
+            if curie[0] == '_':
+                if self.are_bnodes_skized is True:
+                    node = '<' + self.skolemizeBlankNode(curie) + '>'
+                else:
+                    node = '_:' + self._strip_bnode_prefix(curie)
+            elif curie[:4] == 'http' or curie[:3] == 'ftp':
+                node = '<' + curie + '>'
+            elif curie.count(':') == 1:
+                node = StreamedGraph.curie_util.get_uri(curie)
+                if node is not None:
+                    node = '<' + node + '>'
             else:
-                node = curie
-        elif re.match(r'^http|^ftp', curie):
-            node = curie
-        elif len(curie.split(':')) == 2:
-            node = StreamedGraph.curie_util.get_uri(curie)
-        else:
-            raise TypeError("Cannot process curie {}".format(curie))
+                raise TypeError("Cannot process curie {}".format(curie))
+
+            if node is not None:
+                if len(self._node_cache) >= NODE_CACHE_SIZE:
+                    self._node_cache.clear()
+                self._node_cache[curie] = node
         return node
 
     def _getLiteralXSDType(self, literal):
@@ -116,7 +260,7 @@ class StreamedGraph(DipperGraph):
         if a literal is not a str, determine if it's
         a xsd int or double
         :param literal:
-        :return: str - xsd full iri
+        :return: str - xsd full iri as an N-Triples term
         """
         if isinstance(literal, int):
             return self._getnode("xsd:integer")
@@ -126,13 +270,10 @@ class StreamedGraph(DipperGraph):
     @staticmethod
     def _quote_encode(literal):
         """
-        Copy of code in rdflib here:
+        Same escapes as rdflib here:
         https://github.com/RDFLib/rdflib/blob/776b90be/
         rdflib/plugins/serializers/nt.py#L76
         :param literal:
         :return:
         """
-        return '"%s"' % literal.replace('\\', '\\\\')\
-            .replace('\n', '\\n')\
-            .replace('"', '\\"')\
-            .replace('\r', '\\r')
+        return '"%s"' % literal.translate(LITERAL_ESCAPES)
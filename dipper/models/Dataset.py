@@ -186,6 +186,20 @@ class Dataset:
         self.graph.addTriple(
             self.identifier, 'dcat:accessURL', url, is_object_literal)
 
+    def set_file_date_issued(self, url, date_issued):
+        """
+        Date one of the files this dataset is made from,
+        as opposed to the dataset as a whole
+        :param url: the file's access url
+        :param date_issued: str YYYY-MM-DD
+        :return:
+        """
+        self.graph.addTriple(
+            url, 'dcterms:issued', date_issued, object_is_literal=True)
+        LOG.info("setting date of %s to %s", url, date_issued)
+
+        return
+
     def getGraph(self):
         return self.graph
 
@@ -4,6 +4,8 @@ import re
 import time
 import ftplib
 import gzip
+import multiprocessing
+import tempfile
 from datetime import datetime
 from stat import ST_SIZE
 
@@ -16,6 +18,29 @@ from dipper.models.assoc.Association import Assoc
 LOG = logging.getLogger(__name__)
 BGEE_FTP = 'ftp.bgee.org'
 
+CHUNK_ROWS = 10 ** 6    # expression rows read into memory at a time
+GENE_COLUMN = 'Ensembl gene ID'
+ANATOMY_COLUMN = 'anatomical entity ID'
+RANK_COLUMN = 'rank score'
+# only what is used, genes and anatomy repeat so are read as categories
+COLUMN_TYPES = {
+    GENE_COLUMN: 'category',
+    ANATOMY_COLUMN: 'category',
+    RANK_COLUMN: 'float64',
+}
+
+# the Bgee being parsed; forked workers inherit it rather than a pickled copy
+_SHARED_SOURCE = None
+
+
+def _process_species_shard(localfile, limit, shard):
+    """
+    Worker: parse one species' expression file into an N-Triples shard
+    :return: str path of the shard
+    """
+    return _SHARED_SOURCE.run_into_shard(
+        shard, 'process_species_file', localfile, limit)
+
 
 class Bgee(Source):
     """
@@ -77,9 +102,12 @@ class Bgee(Source):
         }
     }
 
-    def __init__(self, graph_type, are_bnodes_skolemized, tax_ids=None, version=None):
+    def __init__(
+            self, graph_type, are_bnodes_skolemized, tax_ids=None, version=None,
+            workers=1):
         """
         :param tax_ids: [str,], List of NCBI taxon  identifiers
+        :param workers: int species files parsed at once (streamed_graph only)
         :return:
         """
         super().__init__(
@@ -106,6 +134,7 @@ class Bgee(Source):
             self.version = 'current'
         else:
             self.version = version
+        self.workers = workers
 
     def fetch(self, is_dl_forced=False):
         """
@@ -166,11 +195,65 @@ class Bgee(Source):
         files_to_download, ftp = self._get_file_list(
             self.files['anat_entity']['path'],
             self.files['anat_entity']['pattern'])
-        for dlname in files_to_download:
-            localfile = '/'.join((self.rawdir, dlname))
-            with gzip.open(localfile, 'rt', encoding='ISO-8859-1') as fh:
-                LOG.info("Processing %s", localfile)
-                self._parse_gene_anatomy(fh, limit)
+        ftp.quit()
+        localfiles = ['/'.join((self.rawdir, dlname)) for dlname in files_to_download]
+
+        if self.workers > 1 and self.graph_type != 'streamed_graph':
+            LOG.warning(
+                "Bgee parses with %i workers only into a streamed_graph", self.workers)
+        if self.workers > 1 and self.graph_type == 'streamed_graph' and \
+                len(localfiles) > 1 and \
+                'fork' in multiprocessing.get_all_start_methods():
+            self.process_species_in_parallel(localfiles, limit)
+        else:
+            for localfile in localfiles:
+                self.process_species_file(localfile, limit)
+        return
+
+    def process_species_in_parallel(self, localfiles, limit=None):
+        """
+        Parse the species files in self.workers forked processes,
+        each into its own N-Triples shard; the shards are then streamed
+        to self.graph in order.
+
+        :param localfiles: list of str paths
+        :param limit: int Limit to top ranked anatomy associations per group
+        :return: None
+        """
+        global _SHARED_SOURCE
+
+        with tempfile.TemporaryDirectory(prefix='bgee_', dir=self.outdir) as sharddir:
+            tasks = [
+                (localfile, limit, os.path.join(
+                    sharddir, os.path.basename(localfile) + '.nt'))
+                for localfile in localfiles]
+            LOG.info(
+                "Processing %i species in %i processes", len(tasks), self.workers)
+
+            _SHARED_SOURCE = self
+            pool = multiprocessing.get_context('fork').Pool(
+                min(self.workers, len(tasks)))
+            try:
+                shards = pool.starmap(_process_species_shard, tasks, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+                _SHARED_SOURCE = None
+
+            for shard in shards:
+                LOG.info("Adding %s", shard)
+                self.graph.addFile(shard)
+        return
+
+    def process_species_file(self, localfile, limit=None):
+        """
+        :param localfile: str path of a gzipped anat_entity file
+        :param limit: int Limit to top ranked anatomy associations per group
+        :return: None
+        """
+        with gzip.open(localfile, 'rt', encoding='ISO-8859-1') as fh:
+            LOG.info("Processing %s", localfile)
+            self._parse_gene_anatomy(fh, limit)
         return
 
     def _parse_gene_anatomy(self, fh, limit):
@@ -179,32 +262,78 @@ class Bgee(Source):
         Ensembl gene ID,gene name, anatomical entity ID,
         anatomical entity name, rank score, XRefs to BTO
 
+        The file is read CHUNK_ROWS at a time and only each gene's best
+        ranked rows are kept from a chunk.
+        Rows are expected grouped by gene (as Bgee writes them) so every gene
+        but the last one of a chunk is complete and its associations are added
+        right away; the last gene's rows are carried into the next chunk.
+
         :param fh: filehandle
         :param limit: int, limit per group
         :return: None
         """
-        dataframe = pd.read_csv(fh, sep='\t')
+        header = fh.readline().rstrip('\n').split('\t')
         col = self.files['anat_entity']['columns']
-        if list(dataframe) != col:
+        if header != col:
             LOG.warning(
-                '\nExpected headers:  %s\nRecived headers:  %s',
-                col, list(dataframe))
-
-        gene_groups = dataframe.sort_values(
-            'rank score', ascending=False).groupby('Ensembl gene ID')
+                '\nExpected headers:  %s\nRecived headers:  %s', col, header)
 
         if limit is None:
             limit = 20
-        gene_groups = gene_groups.head(limit).groupby('Ensembl gene ID')
-
-        for gene, group in gene_groups:
-            for index, row in group.iterrows():
-                self._add_gene_anatomy_association(
-                    row['Ensembl gene ID'].strip(),
-                    row['anatomical entity ID'].strip(),
-                    row['rank score']
-                )
-                # uberon <==> bto equivelance?
+
+        reader = pd.read_csv(
+            fh, sep='\t', header=None, names=header, usecols=list(COLUMN_TYPES),
+            dtype=COLUMN_TYPES, thousands=',', chunksize=CHUNK_ROWS)
+        pending = None          # best rows so far of the gene ending the last chunk
+        finished = set()        # genes whose associations were added
+        for chunk in reader:
+            if chunk.empty:
+                continue
+            last_gene = chunk[GENE_COLUMN].iat[-1]
+            best = self._get_top_ranked(chunk, limit)
+            best = best.astype({GENE_COLUMN: object, ANATOMY_COLUMN: object})
+            if pending is not None:
+                best = self._get_top_ranked(pd.concat([pending, best]), limit)
+
+            is_pending = best[GENE_COLUMN] == last_gene
+            pending = best[is_pending]
+            done = best[~is_pending]
+            regrouped = finished.intersection(done[GENE_COLUMN].unique())
+            if regrouped:
+                LOG.warning(
+                    "%i genes (e.g. %s) are not grouped together in %s, "
+                    "they may have more than %i associations",
+                    len(regrouped), next(iter(regrouped)), getattr(fh, 'name', 'input'),
+                    limit)
+            finished.update(done[GENE_COLUMN].unique())
+            self._add_gene_anatomy_associations(done)
+
+        if pending is not None:
+            self._add_gene_anatomy_associations(pending)
+        return
+
+    @staticmethod
+    def _get_top_ranked(dataframe, limit):
+        """
+        :param dataframe: rows of gene, anatomy and rank score
+        :param limit: int rows kept per gene
+        :return: DataFrame, the highest ranked rows of each gene
+        """
+        return dataframe.sort_values(
+            RANK_COLUMN, ascending=False, kind='stable').groupby(
+                GENE_COLUMN, observed=True, sort=False).head(limit)
+
+    def _add_gene_anatomy_associations(self, dataframe):
+        """
+        :param dataframe: rows of gene, anatomy and rank score
+        :return: None
+        """
+        for (gene_id, anatomy_curie, rank) in zip(
+                dataframe[GENE_COLUMN], dataframe[ANATOMY_COLUMN],
+                dataframe[RANK_COLUMN]):
+            self._add_gene_anatomy_association(
+                gene_id.strip(), anatomy_curie.strip(), rank)
+            # uberon <==> bto equivelance?
         return
 
     def _add_gene_anatomy_association(self, gene_id, anatomy_curie, rank):
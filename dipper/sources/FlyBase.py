@@ -619,8 +619,24 @@ FROM feature WHERE is_analysis = false and is_obsolete = 'f'
             graph = self.graph
         model = Model(graph)
         raw = '/'.join((self.rawdir, 'feature'))
-        LOG.info("building labels for features")
+        test_features = set(
+            self.test_keys['gene'] + self.test_keys['allele'] +
+            self.test_keys['feature'])
+
+        # the organisms used, to look up their NCBITaxon all at once
+        organism_keys = set()
+        with open(raw, 'r') as f:
+            filereader = csv.reader(f, delimiter='\t', quotechar='\"')
+            f.readline()  # read the header row; skip
+            for line in filereader:
+                if self.test_mode and int(line[0]) not in test_features:
+                    continue
+                organism_keys.add(line[2])
+        organism_keys.discard('2')  # computational result
+        self._resolve_organisms(organism_keys)
+        self.checked_organisms.update(organism_keys)
 
+        LOG.info("building labels for features")
         line_counter = 0
         with open(raw, 'r') as f:
             filereader = csv.reader(f, delimiter='\t', quotechar='\"')
@@ -656,8 +672,7 @@ FROM feature WHERE is_analysis = false and is_obsolete = 'f'
                 elif re.search(r'FBt[ip]', feature_id):
                     self.idhash['feature'][feature_key] = feature_id
 
-                if self.test_mode and int(feature_key) not in self.test_keys['gene']+\
-                        self.test_keys['allele'] + self.test_keys['feature']:
+                if self.test_mode and int(feature_key) not in test_features:
                     continue
 
                 # now do something with it!
@@ -1845,18 +1860,36 @@ FROM feature WHERE is_analysis = false and is_obsolete = 'f'
 
             # check to see if NCBITaxon has been resolved; if not fetch it
             if not re.match(r'NCBITaxon', organism_id):
-                # NCBITaxon is not available in the dbxref or cvterm tables.
-                # so we look them up using NCBI eutils services
-                tax_label = self.label_hash[organism_id]
-                # FIXME comment this out to speed things up
-                tax_num = DipperUtil.get_ncbi_taxon_num_by_label(tax_label)
-                if tax_num is not None:
-                    organism_id = ':'.join(('NCBITaxon', tax_num))
-                    self.idhash['organism'][organism_key] = organism_id
-                    self.label_hash[organism_id] = tax_label
+                self._resolve_organisms([organism_key])
+                organism_id = self.idhash['organism'][organism_key]
 
         return organism_id
 
+    def _resolve_organisms(self, organism_keys):
+        """
+        NCBITaxon is not available in the dbxref or cvterm tables,
+        so we look the organisms up by label using NCBI eutils services,
+        as few requests as it takes for all of them
+
+        :param organism_keys: iterable of flybase organism ids
+        :return:
+        """
+        tax_labels = {}
+        for organism_key in organism_keys:
+            organism_id = self.idhash['organism'].get(organism_key)
+            if organism_id is not None and not re.match(r'NCBITaxon', organism_id):
+                tax_labels[organism_key] = self.label_hash[organism_id]
+        if not tax_labels:
+            return
+
+        tax_nums = DipperUtil.get_ncbi_taxon_nums_by_label(tax_labels.values())
+        for organism_key, tax_label in tax_labels.items():
+            tax_num = tax_nums[tax_label]
+            if tax_num is not None:
+                organism_id = ':'.join(('NCBITaxon', tax_num))
+                self.idhash['organism'][organism_key] = organism_id
+                self.label_hash[organism_id] = tax_label
+
     def _process_organism_dbxref(self, limit):
         """
         This is the mapping between the flybase organisms and
@@ -4,12 +4,12 @@ import re
 
 from dipper.sources.Source import Source
 from dipper.utils.DipperUtil import DipperUtil
+from dipper.utils.OntologyUtil import OntologyUtil
 from dipper.models.Model import Model
 from dipper.models.Genotype import Genotype
 from dipper.models.assoc.G2PAssoc import G2PAssoc
 from dipper.models.Reference import Reference
 from dipper.models.GenomicFeature import Feature, makeChromID
-from dipper.graph.RDFGraph import RDFGraph
 
 LOG = logging.getLogger(__name__)
 
@@ -105,17 +105,12 @@ class GWASCatalog(Source):
         """
         raw = '/'.join((self.rawdir, self.files['catalog']['file']))
         LOG.info("Processing Data from %s", raw)
-        efo_ontology = RDFGraph(False, "EFO")
-        LOG.info("Loading EFO ontology in separate rdf graph")
-        efo_ontology.parse(self.files['efo']['url'], format='xml')
-        efo_ontology.bind_all_namespaces()
-        LOG.info("Finished loading EFO ontology")
-
-        so_ontology = RDFGraph(False, "SO")
-        LOG.info("Loading SO ontology in separate rdf graph")
-        so_ontology.parse(self.files['so']['url'], format='xml')
-        so_ontology.bind_all_namespaces()
-        LOG.info("Finished loading SO ontology")
+        LOG.info("Loading EFO and SO ontology indexes")
+        efo_ontology = OntologyUtil(
+            '/'.join((self.rawdir, self.files['efo']['file'])))
+        so_ontology = OntologyUtil(
+            '/'.join((self.rawdir, self.files['so']['file'])))
+        LOG.info("Finished loading ontology indexes")
 
         with open(raw, 'r', encoding="iso-8859-1") as csvfile:
             filereader = csv.reader(csvfile, delimiter='\t')
@@ -287,19 +282,12 @@ class GWASCatalog(Source):
 
             if len(mapped_genes) == len(snp_labels):
                 so_class = self.resolve(context_list[index])
-                # removed the '+' for recursive  one-or-more rdfs:subClassOf  paths
-                # just so it did not return an empty graph
-                so_query = """
-SELECT ?variant_label
-    WHERE {{
-        {0} rdfs:subClassOf {1} ;
-        rdfs:label ?variant_label .
-    }}
-                """.format(so_class, self.globaltt['gene_variant'])
-
-                query_result = so_ontology.query(so_query)
-
-                if len(list(query_result)) == 1:
+                # a labeled, direct (not recursive) subclass of gene_variant
+                is_gene_variant = so_ontology.is_child(
+                    so_class, self.globaltt['gene_variant']) and \
+                    so_ontology.get_label(so_class) is not None
+
+                if is_gene_variant:
                     gene_id = DipperUtil.get_ncbi_id_from_symbol(mapped_genes[index])
 
                     if gene_id is not None:
@@ -452,20 +440,13 @@ SELECT ?variant_label
 
                 trait_curie = trait.replace("http://www.ebi.ac.uk/efo/EFO_", "EFO:")
 
-                phenotype_query = """
-                    SELECT ?trait
-                    WHERE {{
-                        <{0}> rdfs:subClassOf+ <http://www.ebi.ac.uk/efo/EFO_0000651> .
-                        <{0}> rdfs:label ?trait .
-                    }}
-                """.format(trait)
-
-                query_result = efo_ontology.query(phenotype_query)
-                if len(list(query_result)) > 0:
+                # a labeled subclass of phenotype (EFO_0000651)
+                trait_label = efo_ontology.get_label(trait)
+                if trait_label is not None and efo_ontology.is_descendant(
+                        trait, 'http://www.ebi.ac.uk/efo/EFO_0000651'):
                     if re.match(r'^EFO', trait_curie):
                         model.addClassToGraph(
-                            trait_curie, list(query_result)[0][0],
-                            self.globaltt['Phenotype'])
+                            trait_curie, trait_label, self.globaltt['Phenotype'])
 
                 pubmed_curie = 'PMID:' + pubmed_id
 
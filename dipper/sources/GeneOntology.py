@@ -1,12 +1,12 @@
 import csv
 import re
+import sqlite3
 import logging
 import gzip
 import io
-import sys
 import os
-
-import yaml
+import multiprocessing
+import tempfile
 
 from dipper.sources.ZFIN import ZFIN
 from dipper.sources.WormBase import WormBase
@@ -16,7 +16,6 @@ from dipper.models.assoc.G2PAssoc import G2PAssoc
 from dipper.models.Genotype import Genotype
 from dipper.models.Reference import Reference
 from dipper.models.Model import Model
-from dipper.utils.GraphUtils import GraphUtils
 from dipper import config
 
 LOG = logging.getLogger(__name__)
@@ -24,6 +23,24 @@ GOGA = 'http://geneontology.org/gene-associations'
 FTPEBI = 'ftp://ftp.uniprot.org/pub/databases/'     # best for North America
 UPCRKB = 'uniprot/current_release/knowledgebase/'
 
+GAF_BLOCK_ROWS = 10000          # rows a worker takes in turn from a split GAF
+GAF_SPLIT_BYTES = 8 * 2 ** 20   # compressed GAF bytes worth a worker of their own
+
+# the GeneOntology being parsed, with its id_map and eco_map; forked workers
+# inherit it (copy on write) instead of each being sent a pickled copy
+_SHARED_SOURCE = None
+
+
+def _process_gaf_shard(gaffile, limit, part, parts, shard):
+    """
+    Worker: parse one part of a GAF into an N-Triples shard
+    :return: str path of the shard
+    """
+    source = _SHARED_SOURCE
+    return source.run_into_shard(
+        shard, 'process_gaf', gaffile, limit, source.uniprot_entrez_id_map,
+        source.eco_map, part, parts)
+
 
 class GeneOntology(Source):
     """
@@ -98,7 +115,7 @@ class GeneOntology(Source):
         'eco_map': 'http://purl.obolibrary.org/obo/eco/gaf-eco-mapping.txt',
     }
 
-    def __init__(self, graph_type, are_bnodes_skolemized, tax_ids=None):
+    def __init__(self, graph_type, are_bnodes_skolemized, tax_ids=None, workers=1):
         super().__init__(
             graph_type,
             are_bnodes_skolemized,
@@ -112,6 +129,7 @@ class GeneOntology(Source):
 
         # Defaults
         self.tax_ids = tax_ids
+        self.workers = workers
         self.test_ids = list()
         if self.tax_ids is None:
             self.tax_ids = [9606, 10090, 7955]
@@ -141,6 +159,7 @@ class GeneOntology(Source):
         if self.test_only:
             self.test_mode = True
 
+        gaffiles = []
         for txid_num in self.files:
 
             if txid_num in ['go-references', 'id-map']:
@@ -149,14 +168,78 @@ class GeneOntology(Source):
             if not self.test_mode and int(txid_num) not in self.tax_ids:
                 continue
 
-            gaffile = '/'.join((self.rawdir, self.files.get(txid_num)['file']))
-            self.process_gaf(gaffile, limit, self.uniprot_entrez_id_map, self.eco_map)
+            gaffiles.append('/'.join((self.rawdir, self.files.get(txid_num)['file'])))
+
+        if self.workers > 1 and self.graph_type != 'streamed_graph':
+            # merging shards back into an rdflib graph costs what they saved
+            LOG.warning(
+                "GO parses with %i workers only into a streamed_graph", self.workers)
+        if self.workers > 1 and self.graph_type == 'streamed_graph' and \
+                not self.test_mode and \
+                'fork' in multiprocessing.get_all_start_methods():
+            self.process_gafs_in_parallel(gaffiles, limit)
+        else:
+            for gaffile in gaffiles:
+                self.process_gaf(
+                    gaffile, limit, self.uniprot_entrez_id_map, self.eco_map)
 
         LOG.info("Finished parsing.")
 
         return
 
-    def process_gaf(self, file, limit, id_map=None, eco_map=None):
+    def process_gafs_in_parallel(self, gaffiles, limit=None):
+        """
+        Parse the GAFs in self.workers forked processes, the larger ones
+        split into parts of every n-th block of rows, each part into its own
+        N-Triples shard; the shards are then streamed to self.graph in order.
+        With a limit the files are not split, so it stays the first rows of
+        each file as when parsed serially.
+
+        :param gaffiles: list of str paths
+        :param limit: int rows per file
+        """
+        global _SHARED_SOURCE
+
+        with tempfile.TemporaryDirectory(prefix='go_', dir=self.outdir) as sharddir:
+            tasks = []
+            for gaffile in gaffiles:
+                parts = 1
+                if limit is None:
+                    parts = int(max(1, min(
+                        self.workers, os.path.getsize(gaffile) // GAF_SPLIT_BYTES)))
+                for part in range(parts):
+                    shard = os.path.join(sharddir, '{}.{}.nt'.format(
+                        os.path.basename(gaffile), part))
+                    tasks.append((gaffile, limit, part, parts, shard))
+            LOG.info(
+                "Processing %i GAFs as %i parts in %i processes",
+                len(gaffiles), len(tasks), self.workers)
+
+            _SHARED_SOURCE = self
+            pool = multiprocessing.get_context('fork').Pool(
+                min(self.workers, len(tasks)))
+            try:
+                shards = pool.starmap(_process_gaf_shard, tasks, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+                _SHARED_SOURCE = None
+
+            for shard in shards:
+                LOG.info("Adding %s", shard)
+                self.graph.addFile(shard)
+
+        return
+
+    def process_gaf(self, file, limit, id_map=None, eco_map=None, part=0, parts=1):
+        """
+        :param file: str path of a gzipped GAF
+        :param limit: int rows
+        :param id_map: dict of UniProt accession to gene curie
+        :param eco_map: dict of GAF evidence code to ECO curie
+        :param part: int which of the parts of the file to parse
+        :param parts: int the file is split into, a block of rows at a time
+        """
 
         if self.test_mode:
             graph = self.testgraph
@@ -169,14 +252,14 @@ class GeneOntology(Source):
         line_counter = 0
         uniprot_hit = 0
         uniprot_miss = 0
-        if 7955 in self.tax_ids:
-            zfin = ZFIN(self.graph_type, self.are_bnodes_skized)
-        if 6239 in self.tax_ids:
-            wbase = WormBase(self.graph_type, self.are_bnodes_skized)
 
         with gzip.open(file, 'rb') as csvfile:
-            filereader = csv.reader(
-                io.TextIOWrapper(csvfile, newline=""), delimiter='\t', quotechar='\"')
+            lines = io.TextIOWrapper(csvfile, newline="")
+            if parts > 1:
+                lines = (
+                    line for (num, line) in enumerate(lines)
+                    if (num // GAF_BLOCK_ROWS) % parts == part)
+            filereader = csv.reader(lines, delimiter='\t', quotechar='\"')
             for row in filereader:
                 line_counter += 1
                 # comments start with exclamation
@@ -335,7 +418,7 @@ class GeneOntology(Source):
                         # for worms and fish, they might give a RNAi or MORPH
                         # in these cases make a reagent-targeted gene
                         if re.search('MRPHLNO|CRISPR|TALEN', i):
-                            targeted_gene_id = zfin.make_targeted_gene_id(gene_id, i)
+                            targeted_gene_id = ZFIN.make_targeted_gene_id(gene_id, i)
                             geno.addReagentTargetedGene(i, gene_id, targeted_gene_id)
                             # TODO PYLINT why is this needed?
                             # Redefinition of assoc type from
@@ -344,7 +427,7 @@ class GeneOntology(Source):
                             assoc = G2PAssoc(
                                 graph, self.name, targeted_gene_id, phenotypeid)
                         elif re.search(r'WBRNAi', i):
-                            targeted_gene_id = wbase.make_reagent_targeted_gene_id(
+                            targeted_gene_id = WormBase.make_reagent_targeted_gene_id(
                                 gene_id, i)
                             geno.addReagentTargetedGene(i, gene_id, targeted_gene_id)
                             assoc = G2PAssoc(
@@ -378,49 +461,129 @@ class GeneOntology(Source):
         return
 
     def get_uniprot_entrez_id_map(self):
-        taxon_digest = GraphUtils.digest_id(str(self.tax_ids))
-        id_map = {}
-        smallfile = '/'.join((self.rawdir, 'id_map_' + taxon_digest + '.yaml'))
+        """
+        1:1 mappings from UniProt accessions to NCBIGene (else ENSEMBL) genes
+        for self.tax_ids, read from an index of the UniProt id mapping file.
+        The index covers every taxon GO is parsed for, and any asked for
+        before; it is only rebuilt when the id mapping file changes or to add
+        taxa it lacks. Once built, the (5GB) id mapping file itself is not
+        needed until the next update.
+        :return: dict of UniProt accession to gene curie
+        """
+        indexfile = '/'.join((self.rawdir, 'idmapping.sqlite'))
         bigfile = '/'.join((self.rawdir, self.files['id-map']['file']))
-
-        # if processed smallfile exists and is newer use it instesd
-        if os.path.isfile(smallfile) and \
-                os.path.getctime(smallfile) > os.path.getctime(bigfile):
-            LOG.info("Using the cheap mapping file %s", smallfile)
-            with open(smallfile, 'r') as fh:
-                id_map = yaml.safe_load(fh)
-        else:
+        index_taxa = sorted(
+            {int(txid) for txid in self.files if txid.isdigit()} |
+            {int(txid) for txid in self.tax_ids})
+
+        indexed_taxa = self._get_uniprot_index_taxa(indexfile, bigfile)
+        if not indexed_taxa.issuperset(index_taxa):
+            # keep those indexed, so a later run for fewer taxa need not rebuild
+            index_taxa = sorted(indexed_taxa.union(index_taxa))
             LOG.info(
                 "Expensive Mapping from Uniprot ids to Entrez/ENSEMBL gene ids for %s",
-                str(self.tax_ids))
+                str(index_taxa))
             self.fetch_from_url(self.files['id-map']['url'], bigfile)
-            with gzip.open(bigfile, 'rb') as csvfile:
-                csv.field_size_limit(sys.maxsize)
-                filereader = csv.reader(  # warning this file is over 10GB unzipped
-                    io.TextIOWrapper(
-                        csvfile, newline=""), delimiter='\t', quotechar='\"')
-                for row in filereader:
-                    (uniprotkb_ac, uniprotkb_id, geneid, refseq, gi, pdb, go,
-                     uniref100, unifref90, uniref50, uniparc, pir, ncbitaxon, mim,
-                     unigene, pubmed, embl, embl_cds, ensembl, ensembl_trs,
-                     ensembl_pro, other_pubmed) = row
-                    if int(ncbitaxon) not in self.tax_ids:
-                        continue
-                    genid = geneid.strip()
-                    if geneid != '' and ';' not in genid:
-                        id_map[uniprotkb_ac.strip()] = 'NCBIGene:' + genid
-                    elif ensembl.strip() != '' and ';' not in ensembl:
-                        id_map[uniprotkb_ac.strip()] = 'ENSEMBL:' + ensembl.strip()
-
-            LOG.info("Writing id_map out as %s", smallfile)
-            with open(smallfile, 'w') as fh:
-                yaml.dump(id_map, fh)
+            self.build_uniprot_index(bigfile, indexfile, index_taxa)
 
+        LOG.info("Using the UniProt mapping index %s", indexfile)
+        id_map = self.read_uniprot_index(indexfile, self.tax_ids)
         LOG.info(
             "Acquired %i 1:1 uniprot to [entrez|ensembl] mappings", len(id_map.keys()))
 
         return id_map
 
+    @staticmethod
+    def _get_uniprot_index_taxa(indexfile, bigfile):
+        """
+        :return: set of int taxa in the index, empty if there is no index
+                 or it is older than the id mapping file
+        """
+        if not os.path.isfile(indexfile):
+            return set()
+        with sqlite3.connect(indexfile) as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        if os.path.isfile(bigfile) and meta.get('source') != '{}:{}'.format(
+                os.path.getsize(bigfile), int(os.path.getmtime(bigfile))):
+            LOG.info("%s is older than %s", indexfile, bigfile)
+            return set()
+        return {int(txid) for txid in meta.get('taxa', '').split(',') if txid}
+
+    @staticmethod
+    def build_uniprot_index(bigfile, indexfile, taxa):
+        """
+        Index the 1:1 UniProt accession to NCBIGene (else ENSEMBL) gene mappings
+        of the given taxa in the UniProt idmapping_selected.tab.gz file
+        :param bigfile: str path of the id mapping file
+        :param indexfile: str path of the sqlite index to write
+        :param taxa: list of int NCBITaxon numbers
+        :return: int mappings indexed
+        """
+        wanted = {str(txid).encode('ascii') for txid in taxa}
+        partfile = indexfile + '.part'
+        if os.path.exists(partfile):
+            os.remove(partfile)
+        conn = sqlite3.connect(partfile)
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "CREATE TABLE idmap (taxon INTEGER, uniprot TEXT, gene TEXT, "
+            "PRIMARY KEY (taxon, uniprot)) WITHOUT ROWID")
+
+        count = 0
+        batch = []
+        # warning this file is over 10GB unzipped; it is plain tab separated
+        # so splitting bytes is enough, and far quicker than csv
+        with gzip.open(bigfile, 'rb') as reader:
+            for line in reader:
+                row = line.rstrip(b'\n').split(b'\t')
+                # 0 UniProtKB-AC  2 GeneID  12 NCBI-taxon  18 Ensembl
+                if len(row) < 19 or row[12] not in wanted:
+                    continue
+                geneid = row[2].strip()
+                ensembl = row[18].strip()
+                if geneid != b'' and b';' not in geneid:
+                    gene = 'NCBIGene:' + geneid.decode('utf-8')
+                elif ensembl != b'' and b';' not in ensembl:
+                    gene = 'ENSEMBL:' + ensembl.decode('utf-8')
+                else:
+                    continue
+                batch.append((int(row[12]), row[0].strip().decode('utf-8'), gene))
+                if len(batch) >= 100000:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO idmap VALUES (?, ?, ?)", batch)
+                    count += len(batch)
+                    batch = []
+        conn.executemany("INSERT OR REPLACE INTO idmap VALUES (?, ?, ?)", batch)
+        count += len(batch)
+
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", (
+            ('taxa', ','.join(str(txid) for txid in taxa)),
+            ('source', '{}:{}'.format(
+                os.path.getsize(bigfile), int(os.path.getmtime(bigfile))))))
+        conn.commit()
+        conn.close()
+        os.replace(partfile, indexfile)
+        LOG.info("Indexed %i UniProt mappings in %s", count, indexfile)
+
+        return count
+
+    @staticmethod
+    def read_uniprot_index(indexfile, tax_ids):
+        """
+        :param indexfile: str path of an index from build_uniprot_index()
+        :param tax_ids: list of int NCBITaxon numbers
+        :return: dict of UniProt accession to gene curie
+        """
+        id_map = {}
+        with sqlite3.connect(indexfile) as conn:
+            for txid in tax_ids:
+                id_map.update(conn.execute(
+                    "SELECT uniprot, gene FROM idmap WHERE taxon = ?", (int(txid),)))
+
+        return id_map
+
     def getTestSuite(self):
         import unittest
         from tests.test_geneontology import GeneOntologyTestCase
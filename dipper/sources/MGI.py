@@ -133,13 +133,64 @@ class MGI(PostgreSQLSource):
         'test_keys': '../../resources/mgi_test_keys.yaml'
     }
 
+    # the tables in the order parse() processes them, with the hashes
+    # later ones look up (see Source.run_processors)
+    processors = [
+        # the following will provide us the hash-lookups
+        {'method': '_process_prb_strain_acc_view', 'writes': ['idhash.strain']},
+        {'method': '_process_mrk_acc_view', 'limit': False,
+         'writes': ['idhash.marker']},
+        {'method': '_process_all_summary_view',
+         'writes': ['idhash.allele', 'label_hash']},
+        {'method': '_process_bib_acc_view', 'writes': ['idhash.publication']},
+        {'method': '_process_gxd_genotype_summary_view',
+         'writes': ['idhash.genotype']},
+
+        # The following will use the hash populated above
+        # to lookup the ids when filling in the graph
+        {'method': '_process_prb_strain_view',
+         'reads': ['idhash.strain'], 'writes': ['label_hash']},
+        # {'method': '_process_prb_strain_genotype_view'},
+        {'method': '_process_gxd_genotype_view',
+         'writes': [
+             'idhash.genotype', 'idhash.strain', 'label_hash', 'geno_bkgd']},
+        {'method': '_process_mrk_marker_view',
+         'reads': ['idhash.marker'], 'writes': ['markers', 'label_hash']},
+        {'method': '_process_mrk_acc_view_for_equiv',
+         'reads': ['idhash.marker', 'markers']},
+        {'method': '_process_mrk_summary_view',
+         'reads': ['markers'], 'writes': ['idhash.marker']},
+        {'method': '_process_all_allele_view',
+         'reads': ['idhash.allele', 'idhash.marker', 'idhash.strain'],
+         'writes': ['wildtype_alleles', 'label_hash', 'idhash.seqalt']},
+        {'method': '_process_all_allele_mutation_view',
+         'reads': ['idhash.seqalt', 'idhash.allele', 'label_hash']},
+        {'method': '_process_gxd_allele_pair_view',
+         'reads': [
+             'idhash.genotype', 'idhash.allele', 'wildtype_alleles', 'geno_bkgd'],
+         'writes': ['label_hash']},
+        {'method': '_process_voc_annot_view',
+         'reads': ['idhash.genotype', 'idhash.marker', 'idhash.allele'],
+         'writes': ['idhash.annot']},
+        {'method': '_process_evidence_view',
+         'reads': ['idhash.annot'], 'writes': ['idhash.notes']},
+        {'method': '_process_mgi_note_vocevidence_view',
+         'reads': ['idhash.notes', 'idhash.annot']},
+        {'method': '_process_mrk_location_cache',
+         'reads': ['idhash.marker', 'markers']},
+        {'method': 'process_mgi_relationship_transgene_genes',
+         'reads': ['idhash.seqalt']},
+        {'method': 'process_mgi_note_allele_view', 'reads': ['idhash.allele']},
+    ]
+
     # for testing purposes, this is a list of internal db keys
     # to match and select only portions of the source
 
     def __init__(
             self,
             graph_type,
-            are_bnodes_skolemized
+            are_bnodes_skolemized,
+            workers=1
     ):
         super().__init__(
             graph_type,
@@ -171,6 +222,7 @@ class MGI(PostgreSQLSource):
         self.strain_to_genotype_map = {}
 
         self.wildtype_alleles = set()
+        self.workers = workers
 
         # also add the gene ids from the test_ids
         # in order to capture transgenes of the test set
@@ -263,31 +315,9 @@ class MGI(PostgreSQLSource):
         if self.test_only:
             self.test_mode = True
 
-        # the following will provide us the hash-lookups
-        # These must be processed in a specific order
-        self._process_prb_strain_acc_view(limit)
-        self._process_mrk_acc_view()
-        self._process_all_summary_view(limit)
-        self._process_bib_acc_view(limit)
-        self._process_gxd_genotype_summary_view(limit)
-
-        # The following will use the hash populated above
-        # to lookup the ids when filling in the graph
-        self._process_prb_strain_view(limit)
-        # self._process_prb_strain_genotype_view(limit)
-        self._process_gxd_genotype_view(limit)
-        self._process_mrk_marker_view(limit)
-        self._process_mrk_acc_view_for_equiv(limit)
-        self._process_mrk_summary_view(limit)
-        self._process_all_allele_view(limit)
-        self._process_all_allele_mutation_view(limit)
-        self._process_gxd_allele_pair_view(limit)
-        self._process_voc_annot_view(limit)
-        self._process_evidence_view(limit)
-        self._process_mgi_note_vocevidence_view(limit)
-        self._process_mrk_location_cache(limit)
-        self.process_mgi_relationship_transgene_genes(limit)
-        self.process_mgi_note_allele_view(limit)
+        # These must be processed in a specific order,
+        # independent tables at once with workers > 1
+        self.run_processors(self.processors, limit)
 
         LOG.info("Finished parsing.")
 
@@ -209,17 +209,10 @@ class Monochrom(Source):
 
         col = ['chrom', 'start', 'stop', 'band', 'rtype']
         with gzip.open(myfile, 'rb') as reader:
-            for line in reader:
+            # chr13	4500000	10000000	p12	stalk
+            for (chrom, band, rtype) in self.read_tsv(
+                    reader, col, ('chrom', 'band', 'rtype'), taxon):
                 line_counter += 1
-                # skip comments
-                line = line.decode().strip()
-                if line[0] == '#':
-                    continue
-                # chr13	4500000	10000000	p12	stalk
-                row = line.split('\t')
-                chrom = row[col.index('chrom')]
-                band = row[col.index('band')]
-                rtype = row[col.index('rtype')]
                 # NOTE
                 # some less-finished genomes have placed and unplaced scaffolds
                 # * Placed scaffolds:
@@ -331,7 +324,8 @@ class Monochrom(Source):
 
         return
 
-    def make_parent_bands(self, band, child_bands):
+    @staticmethod
+    def make_parent_bands(band, child_bands):
         """
         this will determine the grouping bands that it belongs to, recursively
         13q21.31 ==>  13, 13q, 13q2, 13q21, 13q21.3, 13q21.31
@@ -348,7 +342,7 @@ class Monochrom(Source):
                 p = re.sub(r'\.$', '', p)
                 if p is not None:
                     child_bands.add(p)
-                    self.make_parent_bands(p, child_bands)
+                    Monochrom.make_parent_bands(p, child_bands)
         else:
             child_bands = set()
         return child_bands
@@ -1,6 +1,11 @@
 import re
+import os
 import gzip
+import heapq
 import logging
+from contextlib import closing
+
+import yaml
 
 from dipper.sources.Source import Source
 from dipper.models.Model import Model
@@ -12,6 +17,13 @@ from dipper.utils.DipperUtil import DipperUtil
 
 LOG = logging.getLogger(__name__)
 
+# files cut into one per taxon, e.g. raw/ncbigene/taxon/9606/gene_info.gz
+TAXON_SPLIT_DIR = 'taxon'
+TAXON_SPLIT_FILES = ('gene_info', 'gene_history', 'gene2pubmed')
+TAXON_SPLIT_MANIFEST = 'split_manifest.yaml'
+# rows of a split start with their end offset in the (decompressed) file
+TAXON_SPLIT_FORMAT = 2
+
 
 class NCBIGene(Source):
     """
@@ -40,6 +52,11 @@ class NCBIGene(Source):
     Since we do not know much about the specific link in the gene2pubmed;
     we simply create a "mentions" relationship.
 
+    gene_info, gene_history and gene2pubmed hold every organism, so the
+    rows of the filtered taxa are copied once into a file per taxon
+    (see split_by_taxon()), which is what is parsed. The splits are
+    made again when the file they came from changes.
+
     """
 
     SCIGRAPHBASE = 'https://scigraph-ontology-dev.monarchinitiative.org/scigraph/graph/'
@@ -131,7 +148,7 @@ class NCBIGene(Source):
         if self.tax_ids is None:
             self.tax_ids = [9606, 10090, 7955]
 
-        self.tax_ids = [str(x) for x in self.tax_ids]
+        self.tax_ids = list(dict.fromkeys(str(x) for x in self.tax_ids))
 
         LOG.info("Filtering on the following taxa: %s", tax_ids)
 
@@ -148,6 +165,8 @@ class NCBIGene(Source):
     def fetch(self, is_dl_forced=False):
 
         self.get_files(is_dl_forced)
+        for src_key in TAXON_SPLIT_FILES:
+            self.split_by_taxon(src_key, self.tax_ids)
 
         return
 
@@ -206,21 +225,15 @@ class NCBIGene(Source):
             model.addClassToGraph(tax_id, None)
 
         col = self.files[src_key]['columns']
-        with gzip.open(gene_info, 'rb') as tsv:
-            row = tsv.readline().decode().strip().split('\t')
-            row[0] = row[0][1:]  # strip comment
-            if col != row:
-                LOG.info(
-                    '%s\nExpected Headers:\t%s\nRecived Headers:\t%s\n',
-                    src_key, col, row)
-                LOG.info(set(col) - set(row))
-
-            for line in tsv:
-                line = line.strip()
+        fields = (
+            'tax_id', 'GeneID', 'Symbol', 'Synonyms', 'dbXrefs', 'chromosome',
+            'map_location', 'description', 'type_of_gene',
+            'Full_name_from_nomenclature_authority', 'Other_designations')
+        with closing(self._get_lines(src_key)) as tsv:
+            for (tax_num, gene_num, symbol, synonyms, dbxrefs, chrom, map_loc, desc,
+                 gtype, name, other_designations) in self.read_tsv(
+                     tsv, col, fields, src_key, has_header=True):
                 line_counter += 1
-                if line[0] == '#':  # skip comments
-                    continue
-                row = line.decode().strip().split('\t')
 
                 # ##set filter=None in init if you don't want to have a filter
                 # if self.id_filter is not None:
@@ -231,17 +244,14 @@ class NCBIGene(Source):
                 #         continue
                 # #### end filter
 
-                gene_num = row[col.index('GeneID')]
                 if self.test_mode and int(gene_num) not in self.gene_ids:
                     continue
-                tax_num = row[col.index('tax_id')]
                 if not self.test_mode and tax_num not in self.tax_ids:
                     continue
 
                 gene_id = ':'.join(('NCBIGene', gene_num))
-                gtype = row[col.index('type_of_gene')].strip()
+                gtype = gtype.strip()
                 gene_type_id = self.resolve(gtype)
-                symbol = row[col.index('Symbol')]
                 if symbol == 'NEWENTRY':
                     label = None
                 else:
@@ -255,7 +265,6 @@ class NCBIGene(Source):
                 if not self.test_mode and limit is not None and line_counter > limit:
                     continue
 
-                desc = row[col.index('description')]
                 if self.class_or_indiv[gene_id] == 'C':
                     model.addClassToGraph(gene_id, label, gene_type_id, desc)
                     # NCBI will be the default leader (for non mods),
@@ -264,20 +273,19 @@ class NCBIGene(Source):
                     model.addIndividualToGraph(gene_id, label, gene_type_id, desc)
                     # in this case, they aren't genes.
                     # so we want someone else to be the leader
-                name = row[col.index('Full_name_from_nomenclature_authority')]
                 if name != '-':
                     model.addSynonym(gene_id, name)
-                synonyms = row[col.index('Synonyms')].strip()
+                synonyms = synonyms.strip()
                 if synonyms != '-':
                     for syn in synonyms.split('|'):
                         model.addSynonym(
                             gene_id, syn.strip(), model.globaltt['hasRelatedSynonym'])
-                other_designations = row[col.index('Other_designations')].strip()
+                other_designations = other_designations.strip()
                 if other_designations != '-':
                     for syn in other_designations.split('|'):
                         model.addSynonym(
                             gene_id, syn.strip(), model.globaltt['hasRelatedSynonym'])
-                dbxrefs = row[col.index('dbXrefs')].strip()
+                dbxrefs = dbxrefs.strip()
                 if dbxrefs != '-':
                     self._add_gene_equivalencies(dbxrefs, gene_id, tax_id)
 
@@ -308,7 +316,7 @@ class NCBIGene(Source):
 
                 # FIXME remove the chr mapping below
                 # when we pull in the genomic coords
-                chrom = row[col.index('chromosome')].strip()
+                chrom = chrom.strip()
                 if chrom != '-' and chrom != '':
                     if re.search(r'\|', chrom) and chrom not in ['X|Y', 'X; Y']:
                         # means that there's uncertainty in the mapping.
@@ -334,7 +342,7 @@ class NCBIGene(Source):
                         # temporarily use taxnum for the disambiguating label
                         mychrom_syn = makeChromLabel(chromosome, tax_num)
                         model.addSynonym(mychrom, mychrom_syn)
-                        map_loc = row[col.index('map_location')].strip()
+                        map_loc = map_loc.strip()
                         band_match = re.match(band_regex, map_loc)
                         if band_match is not None and len(band_match.groups()) > 0:
                             # if tax_num != '9606':
@@ -374,6 +382,127 @@ class NCBIGene(Source):
 
         return
 
+    def _get_lines(self, src_key):
+        """
+        The lines of gene_info, gene_history or gene2pubmed of the filtered
+        taxa, header first, read from their files per taxon and merged back
+        into the order of the whole file (so a limit means the same).
+        In test mode genes are filtered on their id instead,
+        so every line of the whole file is read.
+        :param src_key: str key of the file in self.files
+        :return: generator of bytes lines
+        """
+        if self.test_mode:
+            with gzip.open(
+                    '/'.join((self.rawdir, self.files[src_key]['file'])), 'rb') as tsv:
+                yield from tsv
+            return
+
+        splits = self.split_by_taxon(src_key, self.tax_ids)
+        readers = []
+        try:
+            for tax_num in self.tax_ids:
+                readers.append(gzip.open(splits[tax_num], 'rb'))
+                header = readers[-1].readline()
+            if readers:
+                yield header
+            for line in heapq.merge(*readers, key=self._get_split_offset):
+                yield line[line.index(b'\t') + 1:]
+        finally:
+            for reader in readers:
+                reader.close()
+
+    @staticmethod
+    def _get_split_offset(line):
+        return int(line[:line.index(b'\t')])
+
+    def split_by_taxon(self, src_key, tax_nums):
+        """
+        Copy the rows of each taxon out of one of the files of every organism
+        (gene_info, gene_history, gene2pubmed) into a file of its own,
+        for this and other sources to read just the taxa they need.
+        Splits already made from the same version of the file are reused,
+        any missing ones are made in a single pass over it.
+        After the header, each row is preceded by its end offset in the
+        whole (decompressed) file and a tab, see _get_lines().
+
+        :param src_key: str key of the file in self.files
+        :param tax_nums: list of str NCBITaxon numbers
+        :return: dict of tax_num -> str path of its gzipped split
+        """
+        filename = self.files[src_key]['file']
+        localfile = '/'.join((self.rawdir, filename))
+        split_dir = '/'.join((self.rawdir, TAXON_SPLIT_DIR))
+        splits = {
+            tax_num: '/'.join((split_dir, tax_num, filename)) for tax_num in tax_nums}
+
+        manifest = self._load_split_manifest()
+        validator = self._get_validator(filename)
+        entry = manifest.get(filename)
+        if entry is None or entry['validator'] != validator or \
+                entry.get('format') != TAXON_SPLIT_FORMAT:
+            entry = {'validator': validator, 'format': TAXON_SPLIT_FORMAT, 'taxa': []}
+        missing = sorted(
+            tax_num for tax_num in set(tax_nums)
+            if tax_num not in entry['taxa'] or not os.path.exists(splits[tax_num]))
+        if not missing:
+            return splits
+
+        LOG.info("Splitting taxa %s out of %s", missing, localfile)
+        writers = {}
+        try:
+            with gzip.open(localfile, 'rb') as reader:
+                header = reader.readline()
+                for tax_num in missing:
+                    os.makedirs(os.path.dirname(splits[tax_num]), exist_ok=True)
+                    writer = gzip.open(splits[tax_num] + '.part', 'wb', compresslevel=1)
+                    writer.write(header)
+                    writers[(tax_num + '\t').encode()] = writer
+                for line in self.lines_starting_with(reader, writers):
+                    if line[:1] != b'#':
+                        writers[line[:line.index(b'\t') + 1]].write(
+                            b'%d\t%b' % (reader.tell(), line))
+        finally:
+            for writer in writers.values():
+                writer.close()
+        for tax_num in missing:
+            os.replace(splits[tax_num] + '.part', splits[tax_num])
+
+        entry['taxa'] = sorted(set(entry['taxa']) | set(missing))
+        manifest[filename] = entry
+        self._save_split_manifest(manifest)
+
+        return splits
+
+    def _get_validator(self, filename):
+        """
+        What the splits of a file are keyed on: the sha256 in the fetch
+        manifest if it still describes the file, else its size and mtime
+        :param filename: str file in self.rawdir
+        :return: str
+        """
+        fstat = os.stat('/'.join((self.rawdir, filename)))
+        entry = self.load_fetch_manifest().get(filename)
+        if entry is not None and entry.get('size') == fstat.st_size and \
+                entry.get('sha256') is not None:
+            return entry['sha256']
+        return '{}:{}'.format(fstat.st_size, int(fstat.st_mtime))
+
+    def _load_split_manifest(self):
+        manifest_file = '/'.join((self.rawdir, TAXON_SPLIT_DIR, TAXON_SPLIT_MANIFEST))
+        manifest = None
+        if os.path.exists(manifest_file):
+            with open(manifest_file, 'r') as read_yaml:
+                manifest = yaml.safe_load(read_yaml)
+
+        return manifest or {}
+
+    def _save_split_manifest(self, manifest):
+        manifest_file = '/'.join((self.rawdir, TAXON_SPLIT_DIR, TAXON_SPLIT_MANIFEST))
+        with open(manifest_file + '.tmp', 'w') as write_yaml:
+            yaml.safe_dump(manifest, write_yaml, default_flow_style=False)
+        os.replace(manifest_file + '.tmp', manifest_file)
+
     def _add_gene_equivalencies(self, xrefs, gene_id, taxon):
         """
         Add equivalentClass and sameAs relationships
@@ -449,19 +578,10 @@ class NCBIGene(Source):
         myfile = '/'.join((self.rawdir, self.files[src_key]['file']))
         LOG.info("FILE: %s", myfile)
         col = self.files[src_key]['columns']
-        with gzip.open(myfile, 'rb') as tsv:
-            row = tsv.readline().decode().strip().split('\t')
-            row[0] = row[0][1:]  # strip comment
-            if col != row:
-                LOG.info(
-                    '%s\nExpected Headers:\t%s\nRecived Headers:\t %s\n',
-                    src_key, col, row)
-
-            for line in tsv:
-                # skip comments
-                row = line.decode().strip().split('\t')
-                if row[0][0] == '#':
-                    continue
+        fields = ('tax_id', 'GeneID', 'Discontinued_GeneID', 'Discontinued_Symbol')
+        with closing(self._get_lines(src_key)) as tsv:
+            for (tax_num, gene_num, discontinued_num, discontinued_symbol) in \
+                    self.read_tsv(tsv, col, fields, src_key, has_header=True):
                 # (tax_num, gene_num, discontinued_num, discontinued_symbol,
                 # discontinued_date) = line.split('\t')
 
@@ -474,8 +594,8 @@ class NCBIGene(Source):
                 #         continue
                 #  end filter
 
-                gene_num = row[col.index('GeneID')].strip()
-                discontinued_num = row[col.index('Discontinued_GeneID')].strip()
+                gene_num = gene_num.strip()
+                discontinued_num = discontinued_num.strip()
 
                 if gene_num == '-' or discontinued_num == '-':
                     continue
@@ -483,14 +603,14 @@ class NCBIGene(Source):
                 if self.test_mode and int(gene_num) not in self.gene_ids:
                     continue
 
-                tax_num = row[col.index('tax_id')].strip()
+                tax_num = tax_num.strip()
                 if not self.test_mode and tax_num not in self.tax_ids:
                     continue
 
                 line_counter += 1
                 gene_id = ':'.join(('NCBIGene', gene_num))
                 discontinued_gene_id = ':'.join(('NCBIGene', discontinued_num))
-                discontinued_symbol = row[col.index('Discontinued_Symbol')].strip()
+                discontinued_symbol = discontinued_symbol.strip()
                 # add the two genes
                 if self.class_or_indiv.get(gene_id) == 'C':
                     model.addClassToGraph(gene_id, None)
@@ -537,20 +657,10 @@ class NCBIGene(Source):
         LOG.info("FILE: %s", myfile)
         assoc_counter = 0
         col = self.files[src_key]['columns']
-        with gzip.open(myfile, 'rb') as tsv:
-            row = tsv.readline().decode().strip().split('\t')
-            row[0] = row[0][1:]  # strip comment
-            if col != row:
-                LOG.info(
-                    '%s\nExpected Headers:\t%s\nRecived Headers:\t %s\n',
-                    src_key, col, row)
-            for line in tsv:
+        with closing(self._get_lines(src_key)) as tsv:
+            for (tax_num, gene_num, pubmed_num) in self.read_tsv(
+                    tsv, col, col, src_key, has_header=True):
                 line_counter += 1
-                # skip comments
-                row = line.decode().strip().split('\t')
-                if row[0][0] == '#':
-                    continue
-                # (tax_num, gene_num, pubmed_num) = line.split('\t')
 
                 # ## set id_filter=None in init if you don't want to have a filter
                 # if self.id_filter is not None:
@@ -561,15 +671,15 @@ class NCBIGene(Source):
                 #         continue
                 # #### end filter
 
-                gene_num = row[col.index('GeneID')].strip()
+                gene_num = gene_num.strip()
                 if self.test_mode and int(gene_num) not in self.gene_ids:
                     continue
 
-                tax_num = row[col.index('tax_id')].strip()
+                tax_num = tax_num.strip()
                 if not self.test_mode and tax_num not in self.tax_ids:
                     continue
 
-                pubmed_num = row[col.index('PubMed_ID')].strip()
+                pubmed_num = pubmed_num.strip()
                 if gene_num == '-' or pubmed_num == '-':
                     continue
 
@@ -649,20 +759,8 @@ class NCBIGene(Source):
             #    io.TextIOWrapper(tsvfile, newline=""), delimiter='\t', quotechar='\"')
             # row = tsv.readline()
 
-            row = tsv.readline().decode().strip().split('\t')
-            row[0] = row[0][1:]  # strip octothorp
-            if col != row:
-                LOG.info(
-                    '%s\nExpected Headers:\t%s\nRecived Headers:\t %s\n',
-                    src_key, col, row)
-            for row in tsv:
-                row = row.decode().strip().split('\t')
-                tax_a = row[col.index('tax_id')]
-                gene_a = row[col.index('GeneID')]
-                rel = row[col.index('relationship')]
-                tax_b = row[col.index('Other_tax_id')]
-                gene_b = row[col.index('Other_GeneID')]
-
+            for (tax_a, gene_a, rel, tax_b, gene_b) in self.read_tsv(
+                    tsv, col, col, src_key, has_header=True):
                 if rel != 'Ortholog':
                     continue
 
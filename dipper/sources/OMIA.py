@@ -146,6 +146,7 @@ class OMIA(Source):
         gene_group = ncbi.files['gene_group']
         self.fetch_from_url(
             gene_group['url'], '/'.join((ncbi.rawdir, gene_group['file'])), False)
+        ncbi.close()
 
         # load and tag a list of OMIM IDs with types
         # side effect of populating omim replaced
@@ -189,7 +190,10 @@ class OMIA(Source):
         # process the vertebrate orthology for genes
         # that are annotated with phenotypes
         ncbi = NCBIGene(self.graph_type, self.are_bnodes_skized)
-        ncbi.add_orthologs_by_gene_group(self.graph, self.annotated_genes)
+        try:
+            ncbi.add_orthologs_by_gene_group(self.graph, self.annotated_genes)
+        finally:
+            ncbi.close()
 
         LOG.info("Done parsing.")
 
@@ -1,7 +1,11 @@
+import asyncio
 import logging
 import re
 import json
+import sqlite3
+import time
 import urllib
+from concurrent.futures import ThreadPoolExecutor
 from urllib.error import HTTPError
 
 from dipper.sources.Source import Source, USER_AGENT
@@ -11,6 +15,7 @@ from dipper.models.Genotype import Genotype
 from dipper.models.GenomicFeature import Feature, makeChromID
 from dipper.models.Reference import Reference
 from dipper import config
+from dipper.utils.DipperUtil import RateLimiter
 from dipper.utils.romanplus import romanNumeralPattern, fromRoman, toRoman
 
 LOG = logging.getLogger(__name__)
@@ -26,13 +31,21 @@ OMIMFTP = OMIMURL + config.get_config()['keys']['omim']
 OMIMAPI = 'https://api.omim.org/api/entry?format=json&apiKey=' + \
     config.get_config()['keys']['omim'] + '&'
 
+OMIM_GROUP = 20                         # mimNumbers per API request
+OMIM_IN_FLIGHT = 4                      # API requests awaiting a response at once
+OMIM_RATE = 4                           # API requests started per second
+OMIM_CACHE_TTL = 7 * 24 * 60 * 60       # seconds a fetched entry is reused
+
 
 class OMIM(Source):
     """
     The only anonymously obtainable data from the ftp site is mim2gene.
     However, more detailed information is available via their API.
     So, we pull the omim identifiers from their ftp site,
-    then query their API in batchs of 20.
+    then query their API in batchs of 20,
+    a few requests at a time and no more than OMIM_RATE a second.
+    Each entry fetched is kept (per set of included fields) in
+    raw/omim/entries.sqlite and only fetched again once OMIM_CACHE_TTL old.
     Their prescribed rate limits have been mecurial
      one per two seconds or  four per second,
      in  2017 November all mention of api rate limits have vanished
@@ -244,8 +257,10 @@ class OMIM(Source):
         omimparams = {}
 
         # add the included_fields as parameters
+        include = ''
         if included_fields is not None and len(included_fields) > 0:
-            omimparams['include'] = ','.join(included_fields)
+            include = ','.join(sorted(included_fields))
+            omimparams['include'] = include
 
         processed_entries = list()
 
@@ -265,14 +280,11 @@ class OMIM(Source):
         else:
             cleanomimids = list()
 
-        it = 0  # for counting
-
         # note that you can only do request batches of 20
         # see info about "Limits" at http://omim.org/help/api
         # TODO 2017 May seems a majority of many groups of 20
         # are producing python None for RDF triple Objects
 
-        groupsize = 20
         if not self.test_mode and limit is not None:
             # just in case the limit is larger than the number of records,
             maxit = limit
@@ -280,58 +292,152 @@ class OMIM(Source):
                 maxit = len(omimids)
         else:
             maxit = len(omimids)
+        omimids = omimids[:maxit]
 
-        while it < maxit:
-            end = min((maxit, it + groupsize))
-            # iterate through the omim ids list,
-            # and fetch from the OMIM api in batches of 20
-
-            if self.test_mode:
-                intersect = list(
-                    set([str(i) for i in self.test_ids]) & set(omimids[it:end]))
-                # some of the test ids are in the omimids
-                if len(intersect) > 0:
-                    LOG.info("found test ids: %s", intersect)
-                    omimparams.update({'mimNumber': ','.join(intersect)})
-                else:
-                    it += groupsize
-                    continue
-            else:
-                omimparams.update({'mimNumber': ','.join(omimids[it:end])})
-
-            url = OMIMAPI + urllib.parse.urlencode(omimparams)
-            LOG.info('fetching: %s', url)
-
-            try:
-                req = urllib.request.urlopen(url)
-            except HTTPError as e:  # URLError?
-                error_msg = e.read()
-                if re.search(r'The API key: .* is invalid', str(error_msg)):
-                    msg = "API Key not valid"
-                    raise HTTPError(url, e.code, msg, e.hdrs, e.fp)
-                else:
-                    LOG.warning("url %s returned 404, skipping", url)
-                    break
-
-            resp = req.read().decode()
-            it += groupsize
-
-            myjson = json.loads(resp)
-            # snag a copy, hopefully we will get the ftp dl soon
-            with open('./raw/omim/_' + str(it) + '.json', 'w') as fp:
-                json.dump(myjson, fp)
+        if self.test_mode:
+            # some of the test ids are in the omimids
+            test_ids = set(str(i) for i in self.test_ids)
+            omimids = [omimid for omimid in omimids if omimid in test_ids]
+            LOG.info("found test ids: %s", omimids)
 
-            entries = myjson['omim']['entryList']
+        cache = self._open_entry_cache()
 
+        def process_batch(entries):
             for e in entries:
                 # apply the data transformation, and save it to the graph
                 processed_entry = transform(e, graph, globaltt)
                 if processed_entry is not None:
                     processed_entries.append(processed_entry)
 
-                # ### end iterating over batch of entries
+        cached = self._get_cached_entries(cache, omimids, include)
+        LOG.info(
+            "Have %i of %i OMIM entries cached", len(cached), len(omimids))
+
+        # cached and fetched entries are transformed in the order of omimids,
+        # each group of fetched ones with the cached ones up to its last id
+        tofetch = [num for (num, omimid) in enumerate(omimids) if omimid not in cached]
+        starts = range(0, len(tofetch), OMIM_GROUP)
+        groups = [
+            [omimids[num] for num in tofetch[it:it + OMIM_GROUP]] for it in starts]
+        stops = iter([tofetch[it:it + OMIM_GROUP][-1] + 1 for it in starts])
+        done = 0
+
+        def process_upto(stop, entries):
+            nonlocal done
+            fetched = {str(e['entry']['mimNumber']): e for e in entries}
+            for omimid in omimids[done:stop]:
+                if omimid in cached:
+                    process_batch([cached[omimid]])
+                elif omimid in fetched:
+                    process_batch([fetched.pop(omimid)])
+            done = stop
+            # any the API returned under a number not asked for
+            process_batch([
+                e for e in entries if str(e['entry']['mimNumber']) in fetched])
+
+        def process_fetched(entries):
+            self._cache_entries(cache, entries, include)
+            process_upto(next(stops), entries)
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(
+                self._fetch_entry_groups(groups, omimparams, process_fetched))
+            process_upto(len(omimids), [])
+        finally:
+            loop.close()
+            cache.close()
+
         return processed_entries
 
+    async def _fetch_entry_groups(self, groups, omimparams, process_entries):
+        """
+        Request each group of omim ids from the API, up to OMIM_IN_FLIGHT
+        requests at once (one per thread) and OMIM_RATE a second, handing the
+        entries of each group, in order, to process_entries()
+
+        :param groups: list of lists of omim ids
+        :param omimparams: dict of API parameters besides mimNumber
+        :param process_entries: function of a list of API entries
+        :return: None
+        """
+        loop = asyncio.get_event_loop()
+        limiter = RateLimiter(OMIM_RATE)
+
+        with ThreadPoolExecutor(OMIM_IN_FLIGHT) as executor:
+            tasks = [
+                loop.run_in_executor(
+                    executor, self._fetch_entry_group, group, omimparams, limiter)
+                for group in groups]
+            try:
+                for task in tasks:
+                    process_entries(await task)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _fetch_entry_group(group, omimparams, limiter):
+        """
+        Blocking request of one group of entries (run in a worker thread)
+        :return: list of API entries, empty if the request failed
+        """
+        url = OMIMAPI + urllib.parse.urlencode(
+            dict(omimparams, mimNumber=','.join(group)))
+        limiter.wait()
+        LOG.info('fetching: %s', url)
+
+        try:
+            req = urllib.request.urlopen(url)
+        except HTTPError as e:  # URLError?
+            error_msg = e.read()
+            if re.search(r'The API key: .* is invalid', str(error_msg)):
+                msg = "API Key not valid"
+                raise HTTPError(url, e.code, msg, e.hdrs, e.fp)
+            LOG.warning("url %s returned %i, skipping", url, e.code)
+            return []
+
+        resp = req.read().decode()
+        return json.loads(resp)['omim']['entryList']
+
+    def _open_entry_cache(self):
+        """
+        :return: sqlite3 connection to the cache of fetched entries
+        """
+        cache = sqlite3.connect('/'.join((self.rawdir, 'entries.sqlite')))
+        cache.execute(
+            "CREATE TABLE IF NOT EXISTS entry ("
+            " mimnumber TEXT, include TEXT, fetched REAL, body TEXT,"
+            " PRIMARY KEY (mimnumber, include))")
+        return cache
+
+    @staticmethod
+    def _get_cached_entries(cache, omimids, include):
+        """
+        :return: dict of omim id to API entry, for those fetched recently enough
+        """
+        cached = {}
+        fresh = time.time() - OMIM_CACHE_TTL
+        for start in range(0, len(omimids), 500):
+            batch = omimids[start:start + 500]
+            for (omimid, body) in cache.execute(
+                    "SELECT mimnumber, body FROM entry WHERE include = ? AND "
+                    "fetched >= ? AND mimnumber IN ({})".format(
+                        ','.join('?' * len(batch))),
+                    [include, fresh] + batch):
+                cached[omimid] = json.loads(body)
+        return cached
+
+    @staticmethod
+    def _cache_entries(cache, entries, include):
+        fetched = time.time()
+        cache.executemany(
+            "INSERT OR REPLACE INTO entry VALUES (?, ?, ?, ?)", [
+                (str(e['entry']['mimNumber']), include, fetched, json.dumps(e))
+                for e in entries])
+        cache.commit()
+
     def _process_all(self, limit):
         """
         This takes the list of omim identifiers from the omim.txt.Z file,
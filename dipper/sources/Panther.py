@@ -165,6 +165,9 @@ class Panther(Source):
             LOG.info("Parsing %s", fname.name)
             line_counter = 0
             with mytar.extractfile(fname) as csvfile:
+                if self.tax_ids is not None:
+                    # skip pairs of other species before decoding them
+                    csvfile = filter(self._get_species_pattern().match, csvfile)
                 for line in csvfile:
                     # skip comment lines
                     if re.match(r'^#', line.decode()):
@@ -282,6 +285,24 @@ class Panther(Source):
 
         return
 
+    def _get_species_pattern(self):
+        """
+        A pattern matching the (undecoded) rows where either gene is of one
+        of the filtered taxa, from the species abbreviations
+        in the local translation table
+        :return: compiled bytes regex, to match() rows with
+        """
+        species = []
+        for abbrev in self.localtt:
+            taxon = self.resolve(abbrev, mandatory=False)
+            if taxon[:10] == 'NCBITaxon:' and taxon[10:].strip() in self.tax_ids:
+                species.append(re.escape(abbrev.encode()))
+        if not species:
+            LOG.warning("No species abbreviations for taxa %s", self.tax_ids)
+            species = [b'(?!)']   # matches no row
+        # HUMAN|Ensembl=ENSG00000184730|UniProtKB=Q0VD83\tMOUSE|MGI=MGI=2176230|...
+        return re.compile(rb'(?:[^\t]*\t)?(?:' + rb'|'.join(species) + rb')\|')
+
     @staticmethod
     def _clean_up_gene_id(geneid, sp, curie_map):
         """
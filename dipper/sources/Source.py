@@ -3,24 +3,52 @@ import hashlib
 import os
 import time
 import logging
+import multiprocessing
+import multiprocessing.connection
+import operator
+import tempfile
+import traceback
 import urllib
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from stat import ST_CTIME, ST_SIZE
 
 import yaml
 from dipper.graph.RDFGraph import RDFGraph
 from dipper.graph.StreamedGraph import StreamedGraph
+from dipper.graph.SQLiteStore import SQLiteStore
 from dipper.utils.GraphUtils import GraphUtils
+from dipper.utils.FetchUtil import FetchUtil
+from dipper.utils.SortUtil import SortUtil
 from dipper.models.Model import Model
 from dipper.models.Dataset import Dataset
+from dipper import config
 
 LOG = logging.getLogger(__name__)
-CHUNK = 16 * 1024  # read remote urls of unkown size in 16k chunks
+CHUNK = 1024 * 1024  # read remote urls of unkown size in 1M chunks
+FETCH_WORKERS = 6  # files of a source fetched at once, should be polite per host
+FETCH_MANIFEST = 'fetch_manifest.yaml'  # what was fetched, kept in each rawdir
 USER_AGENT = "The Monarch Initiative (https://monarchinitiative.org/; " \
              "info@monarchinitiative.org)"
 
 
+def _run_processor_shard(source, processor, limit, shard, conn):
+    """
+    Worker (forked): run one of a source's table processors into an
+    N-Triples shard, then send back the hashes it wrote
+    """
+    try:
+        source.run_into_shard(shard, 'run_processor', processor, limit)
+        conn.send(('done', {
+            name: source.get_shared_hash(name)
+            for name in processor.get('writes', ())}))
+    except Exception:
+        conn.send(('failed', traceback.format_exc()))
+    finally:
+        conn.close()
+
+
 class Source:
     """
     Abstract class for any data sources that we'll import and process.
@@ -71,11 +99,18 @@ class Source:
         self.triple_count = 0
         self.outdir = 'out'
         self.testdir = 'tests'
+        # processes a parse may use, in sources able to
+        self.workers = 1
+        # in a forked worker, the graph of the parent (see run_into_shard())
+        self.inherited_graph = None
         self.rawdir = 'raw'
         self.rawdir = '/'.join((self.rawdir, self.name))
         self.testname = name + "_test"
         self.testfile = '/'.join((self.outdir, self.testname + ".ttl"))
         self.datasetfile = None
+        self.outfile = None
+        # ETag, Last-Modified & Content-Length seen per `files` key when fetched
+        self.remote_validators = {}
 
         # still need to pull in file suffix  -- this ia a curie not a url
         self.archive_url = 'MonarchArchive:' + 'ttl/' + self.name + '.ttl'
@@ -101,12 +136,26 @@ class Source:
                 datetime.now().isoformat(' ').split()[0]
 
             LOG.info("Creating graph  %s", graph_id)
-            self.graph = RDFGraph(are_bnodes_skized, graph_id)
+            # 'graph_store: sqlite' in conf.yaml (or dipper-etl --graph_store)
+            # keeps the graph on disk, in a file of its own in the raw directory
+            # (removed by close())
+            store = 'IOMemory'
+            if config.get_config().get('graph_store', 'memory') == 'sqlite':
+                (handle, store_file) = tempfile.mkstemp(
+                    prefix='graph_', suffix='.sqlite', dir=self.rawdir)
+                os.close(handle)
+                store = SQLiteStore(store_file)
+            self.graph = RDFGraph(are_bnodes_skized, graph_id, store)
 
         elif graph_type == 'streamed_graph':
             # need to expand on export formats
-            dest_file = open(pth + '/' + name + '.nt', 'w')    # where is the close?
-            self.graph = StreamedGraph(are_bnodes_skized, dest_file)
+            # opened on first write, closed by write()
+            dest_file = '/'.join((self.outdir, self.name + '.nt'))
+            graph_id = ':MONARCH_' + str(self.name) + "_" + \
+                datetime.now().isoformat(' ').split()[0]
+            LOG.info("Creating streamed graph %s to %s", graph_id, dest_file)
+            self.graph = StreamedGraph(
+                are_bnodes_skized, graph_id, filename=dest_file)
             # leave test files as turtle (better human readibility)
         else:
             LOG.error(
@@ -125,6 +174,7 @@ class Source:
         self.test_mode = False
 
         # this may eventually support Bagits
+        # the dataset description is small and always written as turtle
         self.dataset = Dataset(
             self.archive_url,
             self.ingest_title,
@@ -132,7 +182,7 @@ class Source:
             None,    # description
             license_url,
             data_rights,
-            graph_type,
+            'rdf_graph',
             file_handle
         )
 
@@ -170,6 +220,10 @@ class Source:
 
         In addition, if the version number isn't yet set in the dataset,
         it will be set to the date on file.
+
+        A streamed graph has already been written as it was parsed
+        (always as nt); here its file is closed and then sorted with
+        duplicate triples removed.
         :return: None
 
         """
@@ -190,6 +244,7 @@ class Source:
             else:
                 dest = '.'.join((dest, fmt))
             LOG.info("Setting outfile to %s", dest)
+            self.outfile = dest
 
             # make the dataset_file name, always format as turtle
             self.datasetfile = '/'.join(
@@ -223,9 +278,32 @@ class Source:
             LOG.error("I don't understand our stream.")
             return
 
+        if self.graph_type == 'streamed_graph':
+            self.graph.close()
+            if fmt != 'nt':
+                LOG.warning("Streamed graphs are only written as nt, not %s", fmt)
+            if self.graph.filename is not None and \
+                    os.path.exists(self.graph.filename):
+                self.sort_unique_ntriples(self.graph.filename)
+            return
+
         gu.write(self.graph, fmt, filename=outfile)
         return
 
+    @staticmethod
+    def sort_unique_ntriples(filename):
+        """
+        Sort a file of ntriples in place, dropping duplicate lines,
+        with bounded memory (see SortUtil).
+        Byte order (LC_ALL=C) keeps the result reproducible across machines.
+        :param filename: str path of the nt file
+        :return: None
+        """
+        LOG.info("Sorting unique triples in %s", filename)
+        SortUtil.sort_unique([filename], filename)
+
+        return
+
     def whoami(self):
         '''
             pointless convieniance
@@ -303,6 +381,17 @@ class Source:
         else:
             size = 0
 
+        return self._is_remote_newer(local, size, last_modified)
+
+    @staticmethod
+    def _is_remote_newer(local, size, last_modified):
+        """
+        Compare what a server says about a remote file with an existing local file
+        :param local: pathname of the local file
+        :param size: int remote Content-Length (0 if unknown)
+        :param last_modified: str remote Last-Modified or None
+        :return: True if the remote file is newer and should be downloaded
+        """
         fstat = os.stat(local)
         LOG.info(
             "Local File date: %s",
@@ -337,38 +426,207 @@ class Source:
         Given a set of files for this source, it will go fetch them, and
         set a default version by date.  If you need to set the version number
         by another method, then it can be set again.
+        Files are fetched concurrently, http(s) ones over a shared
+        pool of keep-alive connections.
+        What was fetched (ETag, Last-Modified, size, sha256, when) is kept in
+        a manifest beside the files, so an unchanged remote file is not
+        sent again and each file's date is attached to the dataset.
         :param is_dl_forced - boolean
         :param files dict - override instance files dict
         :return: None
         """
 
-        fstat = None
         if files is None:
             files = self.files
-        for fname in files.keys():
-            LOG.info("Getting %s", fname)
-            filesource = files.get(fname)
-            self.fetch_from_url(
-                filesource['url'], '/'.join((self.rawdir, filesource['file'])),
-                is_dl_forced, filesource.get('headers'))
-            # if the key 'clean' exists in the sources `files` dict
-            # expose that instead of the longer url
-            if 'clean' in filesource and filesource['clean'] is not None:
-                self.dataset.setFileAccessUrl(filesource['clean'])
-            else:
-                self.dataset.setFileAccessUrl(filesource['url'])
+        manifest = self.load_fetch_manifest()
+        fetcher = FetchUtil(max_connections=FETCH_WORKERS)
+        file_dates = []
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            pending = {}
+            for fname in files.keys():
+                LOG.info("Getting %s", fname)
+                filesource = files.get(fname)
+                pending[fname] = pool.submit(
+                    self._fetch_file, fetcher, filesource['url'],
+                    '/'.join((self.rawdir, filesource['file'])), is_dl_forced,
+                    filesource.get('headers'), manifest.get(filesource['file']),
+                    filesource.get('segments', 1))
+
+            # collect in the order given so the dataset graph is deterministic
+            for fname in files.keys():
+                filesource = files.get(fname)
+                entry = pending[fname].result()
+                manifest[filesource['file']] = entry
+                self.remote_validators[fname] = entry
+                # if the key 'clean' exists in the sources `files` dict
+                # expose that instead of the longer url
+                if 'clean' in filesource and filesource['clean'] is not None:
+                    file_url = filesource['clean']
+                else:
+                    file_url = filesource['url']
+                self.dataset.setFileAccessUrl(file_url)
+
+                filedate = self._get_file_date(
+                    '/'.join((self.rawdir, filesource['file'])), entry)
+                self.dataset.set_file_date_issued(file_url, filedate)
+                file_dates.append(filedate)
+
+        self.save_fetch_manifest(manifest)
 
-            fstat = os.stat('/'.join((self.rawdir, filesource['file'])))
+        # the dataset is as new as its newest file
+        self.dataset.set_date_issued(max(file_dates))
 
-        # only keeping the date from the last file
-        filedate = datetime.utcfromtimestamp(fstat[ST_CTIME]).strftime("%Y-%m-%d")
+        return
+
+    def _fetch_file(
+            self, fetcher, remotefile, localfile, is_dl_forced, headers, entry,
+            segments=1):
+        """
+        Fetch one file (in a worker thread) and describe it for the manifest
+        :param fetcher: FetchUtil holding the connection pool
+        :param entry: dict of the manifest entry from the previous fetch or None
+        :param segments: int byte ranges to fetch at once (http only)
+        :return: dict manifest entry for the local file
+        """
+        if FetchUtil.is_supported(remotefile):
+            record = self.fetch_with_session(
+                fetcher, remotefile, localfile, is_dl_forced, headers, entry,
+                segments)
+            if record is entry:
+                return entry
+        else:
+            response = self.fetch_from_url(
+                remotefile, localfile, is_dl_forced, headers)
+            if response is None and entry is not None and \
+                    entry.get('url') == remotefile and \
+                    entry.get('size') == self.get_local_file_size(localfile):
+                return entry
+            record = {'etag': None, 'last_modified': None}
+            if response is not None:
+                record['last_modified'] = response.info().get('Last-Modified')
+                record['sha256'] = FetchUtil.get_file_sha256(localfile)
+
+        fetched = datetime.utcnow()
+        if 'sha256' not in record:
+            # a local file we did not just download, account for it once
+            record['sha256'] = FetchUtil.get_file_sha256(localfile)
+            fetched = datetime.utcfromtimestamp(os.stat(localfile).st_mtime)
+
+        return {
+            'url': remotefile,
+            'etag': record['etag'],
+            'last_modified': record['last_modified'],
+            'size': self.get_local_file_size(localfile),
+            'sha256': record['sha256'],
+            'fetched': fetched.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+
+    @staticmethod
+    def _get_file_date(localfile, entry):
+        """
+        :return: str YYYY-MM-DD of the remote Last-Modified, else the local ctime
+        """
+        if entry.get('last_modified') is not None:
+            try:
+                return datetime.strptime(
+                    entry['last_modified'],
+                    "%a, %d %b %Y %H:%M:%S %Z").strftime("%Y-%m-%d")
+            except ValueError:
+                LOG.warning(
+                    "Can not read Last-Modified: %s", entry['last_modified'])
+
+        fstat = os.stat(localfile)
+        return datetime.utcfromtimestamp(fstat[ST_CTIME]).strftime("%Y-%m-%d")
+
+    def load_fetch_manifest(self):
+        """
+        :return: dict of local filename -> what was fetched into it
+        """
+        manifest_file = '/'.join((self.rawdir, FETCH_MANIFEST))
+        manifest = None
+        if os.path.exists(manifest_file):
+            with open(manifest_file, 'r') as read_yaml:
+                manifest = yaml.safe_load(read_yaml)
+
+        return manifest or {}
 
-        # FIXME
-        # change this so the date is attached only to each file, not the entire dataset
-        self.dataset.set_date_issued(filedate)
+    def save_fetch_manifest(self, manifest):
+        manifest_file = '/'.join((self.rawdir, FETCH_MANIFEST))
+        with open(manifest_file + '.tmp', 'w') as write_yaml:
+            yaml.safe_dump(manifest, write_yaml, default_flow_style=False)
+        os.replace(manifest_file + '.tmp', manifest_file)
 
         return
 
+    def verify_fetched_files(self, files=None):
+        """
+        Hold the files on disk against the sha256 recorded
+        in the fetch manifest when they were downloaded
+        :param files dict - override instance files dict
+        :return: True or False
+        """
+        is_match = True
+        if files is None:
+            files = self.files
+        manifest = self.load_fetch_manifest()
+        for fname in files.keys():
+            filename = files[fname]['file']
+            localfile = '/'.join((self.rawdir, filename))
+            if filename not in manifest or not os.path.exists(localfile):
+                LOG.warning('%s has not been fetched', localfile)
+                is_match = False
+            elif FetchUtil.get_file_sha256(localfile) != manifest[filename]['sha256']:
+                LOG.warning('%s does not match its recorded checksum', localfile)
+                is_match = False
+
+        return is_match
+
+    def fetch_with_session(
+            self, fetcher, remotefile, localfile, is_dl_forced=False, headers=None,
+            entry=None, segments=1):
+        """
+        Like fetch_from_url() for http(s), but asking the server once
+        whether the remote file is newer and at most once more for its content.
+        With a manifest entry for the local file the question is a
+        conditional GET, otherwise a HEAD.
+        :param fetcher: FetchUtil holding the connection pool
+        :param remotefile: URL of remote file to fetch
+        :param localfile: pathname of file to save locally
+        :param entry: dict manifest entry from the previous fetch or None
+        :param segments: int byte ranges to fetch at once if the file is large
+        :return: dict of the validators the server sent,
+                 or the manifest entry itself when it is still current
+        """
+        if headers is None:
+            headers = self._get_default_request_headers()
+
+        if is_dl_forced is True or not os.path.exists(localfile):
+            return fetcher.download(
+                remotefile, localfile, headers, segments=segments)
+
+        if entry is not None and entry.get('url') == remotefile and \
+                entry.get('size') == self.get_local_file_size(localfile) and \
+                (entry.get('etag') is not None or
+                 entry.get('last_modified') is not None):
+            validators = fetcher.download(
+                remotefile, localfile, headers, entry, segments)
+            if validators is None:
+                LOG.info("Using existing file %s", localfile)
+                return entry
+            return validators
+
+        LOG.info(
+            "Checking if remote file \n(%s)\n is newer than local \n(%s)",
+            remotefile, localfile)
+        validators = fetcher.head(remotefile, headers)
+        if validators is None or self._is_remote_newer(
+                localfile, validators['size'] or 0, validators['last_modified']):
+            return fetcher.download(
+                remotefile, localfile, headers, segments=segments)
+
+        LOG.info("Using existing file %s", localfile)
+        return validators
+
     def fetch_from_url(
             self, remotefile, localfile=None, is_dl_forced=False, headers=None):
         """
@@ -396,19 +654,22 @@ class Source:
             response = urllib.request.urlopen(request)
 
             if localfile is not None:
-                with open(localfile, 'wb') as binwrite:
+                # a dropped connection must not leave a truncated localfile
+                with open(localfile + '.part', 'wb') as binwrite:
                     while True:
                         chunk = response.read(CHUNK)
                         if not chunk:
                             break
                         binwrite.write(chunk)
 
-                LOG.info("Finished.  Wrote file to %s", localfile)
-                if self.compare_local_remote_bytes(remotefile, localfile, headers):
+                if self.compare_local_remote_bytes(
+                        remotefile, localfile + '.part', headers):
                     LOG.debug("local file is same size as remote after download")
                 else:
                     raise Exception(
                         "Error downloading file: local file size  != remote file size")
+                os.replace(localfile + '.part', localfile)
+                LOG.info("Finished.  Wrote file to %s", localfile)
 
                 fstat = os.stat(localfile)
                 LOG.info("file size: %s", fstat[ST_SIZE])
@@ -422,6 +683,164 @@ class Source:
 
         return response
 
+    def close(self):
+        """
+        Remove what the source only needs while it runs, an on disk graph
+        store, so write() the graph first. Safe to call more than once.
+        """
+        if isinstance(self.graph, RDFGraph) and \
+                isinstance(self.graph.store, SQLiteStore):
+            self.graph.destroy(None)
+
+    def run_processors(self, processors, limit=None):
+        """
+        Run a source's table processors, each given as a dict of
+            'method': str name of the method, called with limit
+            'args': list of arguments to pass before limit (optional)
+            'limit': False for a method not taking a limit (optional)
+            'reads': list of the hashes it reads (optional)
+            'writes': list of the hashes it writes (optional)
+        where a hash is an attribute of the source shared between processors,
+        or 'attribute.key' for one entry of a dict attribute.
+        A processor depends on every earlier one writing a hash
+        it reads or writes.
+
+        With self.workers > 1 and a streamed_graph, processors whose
+        dependencies are done run at the same time, each in a process forked
+        then and streaming to its own N-Triples shard. The hashes a processor
+        wrote are sent back before those depending on it start.
+        Shards are added to the graph in the order of the processors,
+        so the output is the same as running them one after another,
+        which is what is done otherwise.
+
+        :param processors: list of dict, in the order to run them one by one
+        :param limit: int rows of each table
+        :return: None
+        """
+        if self.workers <= 1 or self.test_mode or \
+                not isinstance(self.graph, StreamedGraph) or \
+                'fork' not in multiprocessing.get_all_start_methods():
+            for processor in processors:
+                self.run_processor(processor, limit)
+            return
+
+        depends = []
+        for num, processor in enumerate(processors):
+            shared = processor.get('reads', []) + processor.get('writes', [])
+            depends.append({
+                earlier for earlier in range(num)
+                if any(
+                    self._is_same_hash(name, written) for name in shared
+                    for written in processors[earlier].get('writes', []))})
+
+        context = multiprocessing.get_context('fork')
+        with tempfile.TemporaryDirectory(
+                prefix=self.name + '_', dir=self.outdir) as sharddir:
+            shards = [
+                os.path.join(sharddir, '{}.nt'.format(num))
+                for num in range(len(processors))]
+            waiting = list(range(len(processors)))
+            running = {}    # connection -> (processor number, process)
+            done = set()
+            added = 0
+            try:
+                while waiting or running:
+                    for num in [num for num in waiting if depends[num] <= done]:
+                        if len(running) >= self.workers:
+                            break
+                        waiting.remove(num)
+                        LOG.info("Starting %s", processors[num]['method'])
+                        reader, writer = context.Pipe(duplex=False)
+                        process = context.Process(
+                            target=_run_processor_shard,
+                            args=(self, processors[num], limit, shards[num], writer))
+                        process.start()
+                        writer.close()
+                        running[reader] = (num, process)
+
+                    for reader in multiprocessing.connection.wait(list(running)):
+                        num, process = running.pop(reader)
+                        try:
+                            (status, result) = reader.recv()
+                        except EOFError:
+                            (status, result) = ('failed', 'the process died')
+                        reader.close()
+                        process.join()
+                        if status != 'done':
+                            raise RuntimeError("{} failed: {}".format(
+                                processors[num]['method'], result))
+                        for name, value in result.items():
+                            self.set_shared_hash(name, value)
+                        done.add(num)
+
+                    # as the processors would have, one after another
+                    while added in done:
+                        if os.path.exists(shards[added]):
+                            self.graph.addFile(shards[added])
+                            os.remove(shards[added])
+                        added += 1
+            finally:
+                for (num, process) in running.values():
+                    process.terminate()
+                    process.join()
+
+    def run_processor(self, processor, limit=None):
+        """
+        :param processor: dict, see run_processors()
+        :param limit: int rows of the table
+        """
+        method = getattr(self, processor['method'])
+        if processor.get('limit', True):
+            method(*processor.get('args', []), limit=limit)
+        else:
+            method(*processor.get('args', []))
+
+    def run_into_shard(self, shard, method, *args):
+        """
+        In a forked worker: call a method of the source with self.graph
+        streaming to an N-Triples shard of its own.
+        The graph inherited from the parent is held on to for the life of the
+        worker, as freeing it would flush (or close) the worker's copy
+        of the file the parent streams to.
+
+        :param shard: str path of the N-Triples file to write
+        :param method: str name of the method
+        :param args: its arguments
+        :return: str path of the shard
+        """
+        if self.inherited_graph is None:
+            self.inherited_graph = self.graph
+        self.graph = StreamedGraph(
+            self.are_bnodes_skized, self.inherited_graph.identifier, filename=shard)
+        getattr(self, method)(*args)
+        self.graph.close()
+
+        return shard
+
+    def get_shared_hash(self, name):
+        """
+        :param name: str attribute, or 'attribute.key' of a dict attribute
+        """
+        (attribute, _, key) = name.partition('.')
+        if key:
+            return getattr(self, attribute)[key]
+        return getattr(self, attribute)
+
+    def set_shared_hash(self, name, value):
+        (attribute, _, key) = name.partition('.')
+        if key:
+            getattr(self, attribute)[key] = value
+        else:
+            setattr(self, attribute, value)
+
+    @staticmethod
+    def _is_same_hash(name, other):
+        """
+        :return: bool one names the other or a part of it ('idhash', 'idhash.allele')
+        """
+        return name == other or name.startswith(other + '.') or \
+            other.startswith(name + '.')
+
     # TODO: rephrase as mysql-dump-xml specific format
     def process_xml_table(self, elem, table_name, processing_function, limit):
         """
@@ -474,6 +893,80 @@ class Source:
 
         return
 
+    @staticmethod
+    def lines_starting_with(lines, prefixes, comment=b'#'):
+        """
+        Just the lines beginning with one of the prefixes (or a comment),
+        compared before they are decoded and split,
+        e.g. the rows of a few taxa from a file of every organism.
+
+        :param lines: iterable of bytes lines, e.g. an open (gzip) file
+        :param prefixes: iterable of bytes, e.g. b'9606\t'
+        :param comment: bytes marking header and comment lines, kept
+        :return: iterator of bytes lines
+        """
+        return filter(
+            operator.methodcaller('startswith', tuple(prefixes) + (comment,)), lines)
+
+    @staticmethod
+    def read_tsv(lines, columns, fields, src_key=None, has_header=False, comment='#'):
+        """
+        Rows of a tab separated file as tuples of just the wanted fields.
+
+        Where each field is in a row is worked out once, from the header
+        when the file has one (and checked against the expected columns),
+        instead of looking each field's name up in every row.
+        Blank lines and comments are skipped, as are rows too short to
+        have all the wanted fields.
+
+        :param lines: iterable of str or bytes lines, e.g. an open (gzip) file
+        :param columns: list of the expected column names, in order
+        :param fields: list of the names of the columns wanted, in order
+        :param src_key: str key of the file in self.files, for messages
+        :param has_header: bool the first line names the columns
+                           (perhaps after a comment character)
+        :param comment: str marking lines to skip
+        :return: generator of tuples of str
+        """
+        lines = iter(lines)
+        positions = columns
+        if has_header:
+            header = next(lines, '')
+            if isinstance(header, bytes):
+                header = header.decode()
+            header = header.rstrip('\r\n').lstrip(comment).split('\t')
+            if header != columns:
+                LOG.info(
+                    '%s\nExpected Headers:\t%s\nRecived Headers:\t%s\n',
+                    src_key, columns, header)
+            if set(fields) <= set(header):
+                positions = header
+            else:
+                LOG.warning(
+                    '%s header lacks %s, assuming the expected columns',
+                    src_key, set(fields) - set(header))
+
+        indexes = [positions.index(field) for field in fields]
+        width = max(indexes) + 1
+        if len(indexes) == 1:
+            index = indexes[0]
+
+            def get_fields(row):
+                return (row[index],)
+        else:
+            get_fields = operator.itemgetter(*indexes)
+
+        for line in lines:
+            if isinstance(line, bytes):
+                line = line.decode()
+            if line[:1] == comment or line == '' or line.isspace():
+                continue
+            row = line.rstrip('\r\n').split('\t')
+            if len(row) < width:
+                LOG.warning('%s row has %i of %i columns', src_key, len(row), width)
+                continue
+            yield get_fields(row)
+
     @staticmethod
     def get_file_md5(directory, filename, blocksize=2**20):
         # reference:
@@ -1,5 +1,4 @@
 import logging
-import gzip
 
 import pandas as pd
 from dipper.sources.Source import Source
@@ -9,6 +8,8 @@ LOG = logging.getLogger(__name__)
 
 STRING_BASE = "http://string-db.org/download/"
 DEFAULT_TAXA = ['9606', '10090', '7955', '7227', '6239']
+LINK_CHUNK_ROWS = 10 ** 6   # protein links read (and held) at a time
+LINK_COLUMNS = {'protein1': str, 'protein2': str, 'combined_score': 'int32'}
 
 
 class StringDB(Source):
@@ -120,9 +121,6 @@ class StringDB(Source):
             string_file_path = '/'.join((
                 self.rawdir, protein_paths[taxon]['file']))
 
-            fh = gzip.open(string_file_path, 'rb')
-            dataframe = pd.read_csv(fh, sep='\s+')
-            fh.close()
             p2gene_map = dict()
 
             if taxon in self.id_map_files:
@@ -151,6 +149,7 @@ class StringDB(Source):
                     if key not in p2gene_map:
                         p2gene_map[key] = "ENSEMBL:{}".format(temp_map[key])
 
+            ensembl.close()
             LOG.info(
                 "Finished fetching ENSP ID mappings, fetched %i proteins",
                 len(p2gene_map))
@@ -158,42 +157,55 @@ class StringDB(Source):
             LOG.info(
                 "Fetching protein protein interactions for taxon %s", taxon)
 
-            self._process_protein_links(dataframe, p2gene_map, taxon, limit)
+            # only the columns used, a chunk of rows at a time
+            nrows = None
+            if limit is not None:
+                nrows = limit + 1
+            filtered_out_count = 0
+            for dataframe in pd.read_csv(
+                    string_file_path, sep=r'\s+', compression='gzip',
+                    usecols=list(LINK_COLUMNS), dtype=LINK_COLUMNS,
+                    chunksize=LINK_CHUNK_ROWS, nrows=nrows):
+                filtered_out_count += self._process_protein_links(
+                    dataframe, p2gene_map, taxon, limit)
+
+            LOG.info(
+                "Finished parsing p-p interactions for %s, " +
+                "%i rows filtered out based on checking ensembl proteins",
+                taxon, filtered_out_count)
 
     def _process_protein_links(self, dataframe, p2gene_map, taxon,
                                limit=None, rank_min=700):
+        """
+        Add the interactions of one chunk of protein links,
+        stripping and mapping the protein ids a column at a time
+        Args:
+            :param dataframe (DataFrame) protein1, protein2, combined_score
+            :param p2gene_map (dict) protein id (without taxon) to gene curie
+            :param taxon (str) NCBI taxon number
+            :param limit (int, optional) last row (index) to process
+            :param rank_min (int) combined_score to exceed
+        Returns:
+            :return int rows filtered out for lack of a gene for either protein
+        """
         filtered_df = dataframe[dataframe['combined_score'] > rank_min]
-        filtered_out_count = 0
-        for index, row in filtered_df.iterrows():
-            # Check if proteins are in same species
-            protein1 = row['protein1'].replace('{}.'.format(taxon), '')
-            protein2 = row['protein2'].replace('{}.'.format(taxon), '')
-
-            gene1_curie = None
-            gene2_curie = None
-
-            try:
-                # Keep orientation the same since RO!"interacts with" is symmetric
-                if protein1 > protein1:
-                    gene1_curie = p2gene_map[protein1]
-                    gene2_curie = p2gene_map[protein2]
-                else:
-                    gene1_curie = p2gene_map[protein2]
-                    gene2_curie = p2gene_map[protein1]
-            except KeyError:
-                filtered_out_count += 1
-
-            if gene1_curie is not None and gene2_curie is not None:
-                self.graph.addTriple(
-                    gene1_curie, self.globaltt['interacts with'], gene2_curie)
-                if limit is not None and index >= limit:
-                    break
-
-        LOG.info(
-            "Finished parsing p-p interactions for %s, " +
-            "%i rows filtered out based on checking ensembl proteins",
-            taxon, filtered_out_count)
-        return
+        if limit is not None:
+            filtered_df = filtered_df[filtered_df.index <= limit]
+        prefix = '{}.'.format(taxon)
+        protein1 = filtered_df['protein1'].str.replace(prefix, '', regex=False)
+        protein2 = filtered_df['protein2'].str.replace(prefix, '', regex=False)
+
+        # RO:"interacts with" is symmetric, the orientation is as it always was
+        gene1_curies = protein2.map(p2gene_map)
+        gene2_curies = protein1.map(p2gene_map)
+        is_mapped = gene1_curies.notna() & gene2_curies.notna()
+
+        interacts_with = self.globaltt['interacts with']
+        for gene1_curie, gene2_curie in zip(
+                gene1_curies[is_mapped], gene2_curies[is_mapped]):
+            self.graph.addTriple(gene1_curie, interacts_with, gene2_curie)
+
+        return int((~is_mapped).sum())
 
     def _get_file_paths(self, tax_ids, file_type):
         """
@@ -219,7 +219,6 @@ class UCSCBands(Source):
         myfile = '/'.join((self.rawdir, self.files[taxon]['file']))
         LOG.info("Processing Chr bands from FILE: %s", myfile)
         geno = Genotype(self.graph)
-        monochrom = Monochrom(self.graph_type, self.are_bnodes_skized)
 
         # used to hold band definitions for a chr
         # in order to compute extent of encompasing bands
@@ -243,19 +242,13 @@ class UCSCBands(Source):
         # process the bands
         col = ['scaffold', 'start', 'stop', 'band_num', 'rtype']
         with gzip.open(myfile, 'rb') as f:
-            for line in f:
+            # chr13	4500000	10000000	p12	stalk
+            for (scaffold, start, stop, band_num, rtype) in self.read_tsv(
+                    f, col, col, taxon):
                 line_counter += 1
-                # skip comments
-                line = line.decode().strip()
-                if line[0] == '#' or line_counter > limit:
-                    continue
-                # chr13	4500000	10000000	p12	stalk
-                row = line.split('\t')
-                scaffold = row[col.index('scaffold')]
-                start = row[col.index('start')]
-                stop = row[col.index('stop')]
-                band_num = row[col.index('band_num')].strip()
-                rtype = row[col.index('rtype')]
+                if line_counter > limit:
+                    break
+                band_num = band_num.strip()
 
                 # NOTE some less-finished genomes have
                 # placed and unplaced scaffolds
@@ -359,7 +352,7 @@ class UCSCBands(Source):
 
                     # get the parent bands, and make them unique
                     parents = list(
-                        monochrom.make_parent_bands(band_num, set()))
+                        Monochrom.make_parent_bands(band_num, set()))
                     # alphabetical sort will put them in smallest to biggest,
                     # so we reverse
                     parents.sort(reverse=True)
@@ -1,5 +1,8 @@
 import csv
+import os
+import pickle
 import re
+import sys
 import logging
 
 from intermine.webservice import Service
@@ -17,6 +20,7 @@ from dipper.models.Model import Model
 
 LOG = logging.getLogger(__name__)
 ZFDL = 'http://zfin.org/downloads'
+ZP_INDEX_FORMAT = 1     # bump when the cached ZP mapping layout changes
 
 
 class ZFIN(Source):
@@ -261,7 +265,67 @@ class ZFIN(Source):
             "ZDB-FISH-150901-1409"]
     }
 
-    def __init__(self, graph_type, are_bnodes_skolemized):
+    # the tables in the order parse() processes them, with the hashes
+    # later ones look up (see Source.run_processors)
+    processors = [
+        # basic information on classes and instances
+        {'method': '_process_genes', 'writes': ['id_label_map']},
+        {'method': '_process_stages'},
+        {'method': '_process_pubinfo'},
+        {'method': '_process_pub2pubmed'},
+
+        # The knockdown reagents
+        {'method': '_process_targeting_reagents', 'args': ['morph'],
+         'writes': ['id_label_map', 'variant_loci_genes']},
+        {'method': '_process_targeting_reagents', 'args': ['crispr'],
+         'writes': ['id_label_map', 'variant_loci_genes']},
+        {'method': '_process_targeting_reagents', 'args': ['talen'],
+         'writes': ['id_label_map', 'variant_loci_genes']},
+
+        {'method': '_process_gene_marker_relationships',
+         'writes': ['id_label_map', 'transgenic_parts']},
+        {'method': '_process_features', 'writes': ['id_label_map']},
+        {'method': '_process_feature_affected_genes',
+         'writes': ['id_label_map', 'variant_loci_genes']},
+        # only adds features on chromosomes, not positions
+        {'method': '_process_mappings'},
+
+        # These must be processed before G2P and expression
+        {'method': '_process_wildtypes',
+         'writes': ['id_label_map', 'wildtype_genotypes']},
+        {'method': '_process_genotype_backgrounds',
+         'writes': ['genotype_backgrounds']},
+        # REVIEWED - NEED TO REVIEW LABELS ON Deficiencies
+        {'method': '_process_genotype_features',
+         'reads': ['genotype_backgrounds'],
+         'writes': ['geno_alleles', 'id_label_map', 'variant_loci_genes']},
+
+        {'method': 'process_fish',
+         'reads': [
+             'geno_alleles', 'transgenic_parts', 'variant_loci_genes',
+             'wildtype_genotypes'],
+         'writes': ['fish_parts', 'id_label_map']},
+        # Must be processed after morpholinos/talens/crisprs id/label
+        # {'method': '_process_pheno_enviro'},  # TODO waiting on issue #385
+
+        # once the genotypes and environments are processed,
+        # we can associate these with the phenotypes
+        {'method': '_process_g2p'},
+        {'method': 'process_fish_disease_models', 'reads': ['id_label_map']},
+
+        # zfin-curated orthology calls to human genes
+        {'method': '_process_human_orthos'},
+        {'method': 'process_orthology_evidence'},
+
+        # coordinates of all genes - from ensembl
+        {'method': '_process_gene_coordinates'},
+
+        # FOR THE FUTURE - needs verification
+        # {'method': '_process_wildtype_expression'},
+        # {'method': '_process_uniprot_ids'},
+    ]
+
+    def __init__(self, graph_type, are_bnodes_skolemized, workers=1):
         super().__init__(
             graph_type,
             are_bnodes_skolemized,
@@ -275,6 +339,7 @@ class ZFIN(Source):
 
         self.dataset.set_citation(
             'https://wiki.zfin.org/display/general/ZFIN+db+information')
+        self.workers = workers
 
         self.fish_parts = {}
         self.geno_alleles = {}
@@ -349,47 +414,8 @@ class ZFIN(Source):
         # else:
         #    graph = self.graph
 
-        # basic information on classes and instances
-        self._process_genes(limit)
-        self._process_stages(limit)
-        self._process_pubinfo(limit)
-        self._process_pub2pubmed(limit)
-
-        # The knockdown reagents
-        for t in ['morph', 'crispr', 'talen']:
-            self._process_targeting_reagents(t, limit)
-
-        self._process_gene_marker_relationships(limit)
-        self._process_features(limit)
-        self._process_feature_affected_genes(limit)
-        # only adds features on chromosomes, not positions
-        self._process_mappings(limit)
-
-        # These must be processed before G2P and expression
-        self._process_wildtypes(limit)
-        self._process_genotype_backgrounds(limit)
-        # REVIEWED - NEED TO REVIEW LABELS ON Deficiencies
-        self._process_genotype_features(limit)
-
-        self.process_fish(limit)
-        # Must be processed after morpholinos/talens/crisprs id/label
-        # self._process_pheno_enviro(limit)  # TODO waiting on issue #385
-
-        # once the genotypes and environments are processed,
-        # we can associate these with the phenotypes
-        self._process_g2p(limit)
-        self.process_fish_disease_models(limit)
-
-        # zfin-curated orthology calls to human genes
-        self._process_human_orthos(limit)
-        self.process_orthology_evidence(limit)
-
-        # coordinates of all genes - from ensembl
-        self._process_gene_coordinates(limit)
-
-        # FOR THE FUTURE - needs verification
-        # self._process_wildtype_expression(limit)
-        # self._process_uniprot_ids(limit)
+        # independent tables at once with workers > 1
+        self.run_processors(self.processors, limit)
 
         LOG.info("Finished parsing.")
         return
@@ -2510,8 +2536,6 @@ class ZFIN(Source):
         :param modifier:
         :return: ZP id
         """
-        zp_id = None
-
         # zfin uses free-text modifiers,
         # but we need to convert them to proper PATO classes for the mapping
         mod_id = self.resolve(modifier, False)
@@ -2519,12 +2543,11 @@ class ZFIN(Source):
         if modifier == mod_id:
             LOG.warning("no mapping for pato modifier " + modifier)
 
-        key = self._make_zpkey(
+        zp_id = self.zp_map.get(self._make_zpkey(
             superterm1_id, subterm1_id, quality_id,
-            superterm2_id, subterm2_id, mod_id)
-        mapping = self.zp_map.get(key)
+            superterm2_id, subterm2_id, mod_id))
 
-        if mapping is None:
+        if zp_id is None:
             if modifier == 'normal':
                 pass
                 # LOG.info("Normal phenotypes not yet supported")
@@ -2534,8 +2557,6 @@ class ZFIN(Source):
                     .join((
                         superterm1_id, subterm1_id, quality_id,
                         superterm2_id, subterm2_id, mod_id)), modifier)
-        else:
-            zp_id = mapping['zp_id']
 
         return zp_id
 
@@ -2543,11 +2564,25 @@ class ZFIN(Source):
         """
         Given a file that defines the mapping between
         ZFIN-specific EQ definitions and the automatically derived ZP ids,
-        create a mapping here.
+        create a mapping here, from the six EQ terms to the ZP id.
+        The mapping is saved beside the file ("<file>.index") and read from
+        there until the file changes.
         This may be deprecated in the future
-        :return:
+        :return: dict of (superterm1, subterm1, quality, superterm2, subterm2,
+                 modifier) ids -> ZP id
 
         """
+        fstat = os.stat(file)
+        version = (fstat.st_size, fstat.st_mtime_ns)
+        index_file = file + '.index'
+        if os.path.exists(index_file):
+            with open(index_file, 'rb') as reader:
+                index = pickle.load(reader)
+            if index.get('format') == ZP_INDEX_FORMAT and \
+                    index.get('version') == version:
+                LOG.info("Loaded %s zp terms from %s", len(index['zp_map']), index_file)
+                return index['zp_map']
+
         zp_map = {}
         LOG.info("Loading ZP-to-EQ mappings")
         line_counter = 0
@@ -2560,28 +2595,26 @@ class ZFIN(Source):
                 key = self._make_zpkey(
                     superterm1_id, subterm1_id, quality_id,
                     superterm2_id, subterm2_id, modifier)
-                zp_map[key] = {
-                    'zp_id': zp_id,
-                    'label': zp_label,
-                    'superterm1_id': superterm1_id,
-                    'subterm1_id': subterm1_id,
-                    'quality_id': quality_id,
-                    'modifier': modifier,
-                    'superterm2_id': superterm2_id,
-                    'subterm2_id': subterm2_id,
-                }
+                # the same few thousand terms make up every key
+                zp_map[tuple(sys.intern(term) for term in key)] = zp_id
         LOG.info("Loaded %s zp terms", zp_map.__len__())
 
+        partfile = index_file + '.part'
+        with open(partfile, 'wb') as writer:
+            pickle.dump(
+                {'format': ZP_INDEX_FORMAT, 'version': version, 'zp_map': zp_map},
+                writer, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partfile, index_file)
+
         return zp_map
 
+    @staticmethod
     def _make_zpkey(
-            self,
             superterm1_id, subterm1_id, quality_id,
             superterm2_id, subterm2_id, modifier):
-        key = self.make_id('_'.join((
+        return (
             superterm1_id, subterm1_id, quality_id,
-            superterm2_id, subterm2_id, modifier)))
-        return key
+            superterm2_id, subterm2_id, modifier)
 
     @staticmethod
     def _get_other_allele_by_zygosity(allele_id, zygosity):
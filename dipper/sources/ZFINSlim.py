@@ -52,6 +52,8 @@ class ZFINSlim(Source):
         zp_file = '/'.join((self.rawdir, self.files['zpmap']['file']))
         g2p_file = '/'.join((self.rawdir, self.files['g2p_clean']['file']))
         zfin_parser.zp_map = zfin_parser._load_zp_mappings(zp_file)
+        # only its zp mapping is needed, not a graph
+        zfin_parser.close()
 
         with open(g2p_file, 'r', encoding="utf8") as csvfile:
             filereader = csv.reader(csvfile, delimiter='\t', quotechar='\"')
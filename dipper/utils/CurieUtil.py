@@ -1,14 +1,20 @@
-
 import logging
+from functools import lru_cache
 
 __author__ = 'condit@sdsc.edu'
 
 LOG = logging.getLogger(__name__)
 
+URI_CACHE_SIZE = 2 ** 17    # curies remembered by get_uri()
+
 
 class CurieUtil(object):
     '''
     Create compact URI
+
+    get_uri() is memoized (LRU) since the same curies are expanded
+    over and over while building a graph, and get_curie_prefix() looks up
+    IRI prefixes by length, longest first, rather than scanning every one.
     '''
     def __init__(self, curie_map):
         '''
@@ -17,15 +23,20 @@ class CurieUtil(object):
 
         '''
         self.curie_map = curie_map
+        self.uri_map = {}
+        self.uri_prefix_lengths = []
         if curie_map is not None:  # inverse the map
             if len(set(curie_map.keys())) != len(set(curie_map.values())):
                 LOG.warning("Curie map is NOT one to one!")
                 LOG.warning(
                     "`get_curie_prefix(IRI)` "
                     "may return the same prefix for different base IRI")
-            self.uri_map = {}
             for key, value in curie_map.items():
                 self.uri_map[value] = key
+            # longest first, so the most specific IRI prefix wins
+            self.uri_prefix_lengths = sorted(
+                {len(value) for value in self.uri_map if value}, reverse=True)
+        self._cached_get_uri = lru_cache(maxsize=URI_CACHE_SIZE)(self._get_uri)
         return
 
     def get_curie(self, uri):
@@ -37,25 +48,33 @@ class CurieUtil(object):
         return None
 
     def get_curie_prefix(self, uri):
-        ''' Return the CURIE's prefix:'''
-        for key, value in self.uri_map.items():
-            if uri.startswith(key):
-                return value
+        ''' Return the CURIE's prefix (of the longest matching IRI prefix):'''
+        for length in self.uri_prefix_lengths:
+            prefix = self.uri_map.get(uri[:length])
+            if prefix is not None:
+                return prefix
         return None
 
     def get_uri(self, curie):
         ''' Get a URI from a CURIE '''
+        return self._cached_get_uri(curie)
+
+    def cache_clear(self):
+        ''' Forget expanded curies, needed if curie_map is changed in place '''
+        self._cached_get_uri.cache_clear()
+        return
+
+    def _get_uri(self, curie):
         if curie is None:
             return None
-        parts = curie.split(':')
-        if len(parts) == 1:
+        prefix, colon, reference = curie.partition(':')
+        if colon == '':
             if curie != '':
                 LOG.error("Not a properly formed curie: \"%s\"", curie)
             return None
-        prefix = parts[0]
-        if prefix in self.curie_map:
-            return '%s%s' % (self.curie_map.get(prefix),
-                             curie[(curie.index(':') + 1):])
+        base = self.curie_map.get(prefix)
+        if base is not None:
+            return base + reference
         LOG.error("Curie prefix not defined for %s", curie)
         return None
 
@@ -1,7 +1,14 @@
+import json
 import logging
+import os
+import sqlite3
+import threading
+import time
 import unicodedata
 import requests
 
+from dipper import config
+
 __author__ = 'nlw'
 LOG = logging.getLogger(__name__)
 
@@ -15,6 +22,128 @@ ESEARCH = EUTIL + '/esearch.fcgi'
 ESUMMARY = EUTIL + '/esummary.fcgi'
 EREQ = {'email': 'info@monarchinitiative.org', 'tool': 'Dipper'}
 
+EUTILS_CACHE = 'raw/eutils.sqlite'      # responses shared by every source and run
+EUTILS_TTL = 30 * 24 * 60 * 60          # seconds a cached response is reused
+EUTILS_RATE = 3                         # requests per second, 10 with an api key
+EUTILS_KEY_RATE = 10
+EUTILS_BATCH = 200                      # labels or ids asked for in one request
+
+
+class RateLimiter:
+    """
+    Token bucket: up to `rate` calls in any second, then one every 1/rate s.
+    Shared by the threads of a process.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """
+        Block until a call may be made
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                time.sleep((1 - self.tokens) / self.rate)
+                self.updated = time.monotonic()
+                self.tokens = 0.0
+            else:
+                self.tokens -= 1
+
+
+class EutilsCache:
+    """
+    NCBI eutils JSON responses in a SQLite file, keyed on the endpoint and
+    its parameters, reused for `ttl` seconds.
+    """
+
+    def __init__(self, cache_file=EUTILS_CACHE, ttl=EUTILS_TTL):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        cache_dir = os.path.dirname(cache_file)
+        if cache_dir != '':
+            os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(cache_file, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS response ("
+            " request TEXT PRIMARY KEY, fetched REAL, body TEXT)")
+        self.conn.execute(
+            "DELETE FROM response WHERE fetched < ?", (time.time() - ttl,))
+        self.conn.commit()
+
+    @staticmethod
+    def get_key(url, params):
+        return url + '?' + json.dumps(
+            {key: val for key, val in params.items() if key not in EREQ and
+             key != 'api_key'}, sort_keys=True)
+
+    def get(self, url, params):
+        """
+        :return: the decoded response or None if not cached (or expired)
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT fetched, body FROM response WHERE request = ?",
+                (self.get_key(url, params),)).fetchone()
+        if row is None or row[0] < time.time() - self.ttl:
+            return None
+        return json.loads(row[1])
+
+    def put(self, url, params, result):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO response VALUES (?, ?, ?)",
+                (self.get_key(url, params), time.time(), json.dumps(result)))
+            self.conn.commit()
+
+
+class EutilsClient:
+    """
+    Rate limited, cached requests to NCBI eutils (ESearch, ESummary) through
+    the retrying SESSION. With keys: ncbi: <api key> in conf.yaml the key is
+    sent and the higher rate is allowed.
+    """
+
+    def __init__(self, cache_file=EUTILS_CACHE, ttl=EUTILS_TTL):
+        self.api_key = config.get_config().get('keys', {}).get('ncbi')
+        self.limiter = RateLimiter(EUTILS_KEY_RATE if self.api_key else EUTILS_RATE)
+        self.cache = EutilsCache(cache_file, ttl)
+
+    def get(self, url, params):
+        """
+        :param url: str ESEARCH or ESUMMARY
+        :param params: dict eutils parameters, json is asked for
+        :return: dict decoded response
+        """
+        params = dict(params, retmode='json')
+        result = self.cache.get(url, params)
+        if result is not None:
+            return result
+
+        req = dict(params, **EREQ)
+        if self.api_key:
+            req['api_key'] = self.api_key
+        for attempt in range(2):
+            self.limiter.wait()
+            request = SESSION.post(url, data=req)
+            LOG.info('fetching: %s %s', url, self.cache.get_key(url, params))
+            request.raise_for_status()
+            result = request.json()
+            # Occasionally eutils returns the json blob
+            # {'ERROR': 'Invalid db name specified: taxonomy'}
+            if 'ERROR' not in result.get('esearchresult', result):
+                self.cache.put(url, params, result)
+                break
+        return result
+
 
 class DipperUtil:
     """
@@ -29,8 +158,20 @@ class DipperUtil:
 
     restructuring to make bulk queries
     is less likely to result in another ban for peppering them with one offs
+    so eutils requests go through an EutilsClient which asks about up to
+    EUTILS_BATCH labels or ids at once, keeps to the rate limit and
+    caches what it is told in EUTILS_CACHE.
 
     """
+
+    eutils = None   # EutilsClient, made when first needed
+
+    @staticmethod
+    def get_eutils():
+        if DipperUtil.eutils is None:
+            DipperUtil.eutils = EutilsClient()
+        return DipperUtil.eutils
+
     @staticmethod
     def remove_control_characters(string):
         '''
@@ -52,21 +193,8 @@ class DipperUtil:
         :return:
 
         """
-        req = {'db': 'taxonomy', 'retmode': 'json', 'term': label}
-        req.update(EREQ)
-
-        request = SESSION.get(ESEARCH, params=req)
-        LOG.info('fetching: %s', request.url)
-        request.raise_for_status()
-        result = request.json()['esearchresult']
-
-        # Occasionally eutils returns the json blob
-        # {'ERROR': 'Invalid db name specified: taxonomy'}
-        if 'ERROR' in result:
-            request = SESSION.get(ESEARCH, params=req)
-            LOG.info('fetching: %s', request.url)
-            request.raise_for_status()
-            result = request.json()['esearchresult']
+        result = DipperUtil.get_eutils().get(
+            ESEARCH, {'db': 'taxonomy', 'term': label})['esearchresult']
 
         tax_num = None
         if 'count' in result and str(result['count']) == '1':
@@ -77,35 +205,73 @@ class DipperUtil:
 
         return tax_num
 
+    @staticmethod
+    def get_ncbi_taxon_nums_by_label(labels):
+        """
+        Look up many taxon labels, EUTILS_BATCH to a request:
+        one ESearch for all of their scientific names and one ESummary
+        of the taxa found; labels not matched that way are looked up
+        one at a time as by get_ncbi_taxon_num_by_label().
+
+        :param labels: iterable of str
+        :return: dict of label to NCBI Taxon number (str) or None
+        """
+        eutils = DipperUtil.get_eutils()
+        labels = list(dict.fromkeys(labels))
+        tax_nums = {}
+        for start in range(0, len(labels), EUTILS_BATCH):
+            batch = labels[start:start + EUTILS_BATCH]
+            term = ' OR '.join(
+                '"{}"[Scientific Name]'.format(label.replace('"', ''))
+                for label in batch)
+            idlist = eutils.get(ESEARCH, {
+                'db': 'taxonomy', 'term': term, 'retmax': len(batch) * 2,
+            })['esearchresult'].get('idlist', [])
+            matches = {}
+            for record in DipperUtil._get_summaries(eutils, 'taxonomy', idlist):
+                name = record.get('scientificname', '').lower()
+                matches.setdefault(name, set()).add(str(record['uid']))
+            for label in batch:
+                found = matches.get(label.lower(), set())
+                if len(found) == 1:
+                    tax_nums[label] = found.pop()
+
+        for label in labels:
+            if label not in tax_nums:
+                tax_nums[label] = DipperUtil.get_ncbi_taxon_num_by_label(label)
+
+        return tax_nums
+
     @staticmethod
     def get_homologene_by_gene_num(gene_num):
+        """
+        :param gene_num: NCBI Gene number
+        :return: dict ESummary record of the gene's HomoloGene group,
+                 None when the gene is in no, or several, HomoloGene groups
+        """
+        eutils = DipperUtil.get_eutils()
         # first, get the homologene id from the gene id
         # gene_id = '1264'  for testing
-        req = {
-            'db': 'homologene',
-            'retmode': 'json',
-            'term': str(gene_num) + "[Gene ID]",
-            # 'usehistory': None  # y/n
-            # 'rettype':  [uilist|count]
-        }
-        req.update(EREQ)
-        ereq = requests.get(ESEARCH, params=req)
-        homologene_ids = ereq.json()['esearchresult']['idlist']
+        homologene_ids = eutils.get(ESEARCH, {
+            'db': 'homologene', 'term': str(gene_num) + '[Gene ID]',
+        })['esearchresult'].get('idlist', [])
         if len(homologene_ids) != 1:
-            return
-        hid = homologene_ids[0]
+            return None
         # now, fetch the homologene record
-        req = {'db': 'homologene', 'id': hid, 'retmode': 'json'}
-        req.update(EREQ)
-        request = SESSION.get(ESUMMARY, params=req)
-        data = request.json()
-
-        if 'result' in data and hid in data['result']:
-            homologs = data['result'][hid]
-        else:
-            homologs = None
+        return next(
+            DipperUtil._get_summaries(eutils, 'homologene', homologene_ids), None)
 
-        return homologs
+    @staticmethod
+    def _get_summaries(eutils, database, ids):
+        """
+        :return: generator of ESummary records (dicts) of the ids
+        """
+        for start in range(0, len(ids), EUTILS_BATCH):
+            batch = ids[start:start + EUTILS_BATCH]
+            result = eutils.get(
+                ESUMMARY, {'db': database, 'id': ','.join(batch)}).get('result', {})
+            for uid in result.get('uids', []):
+                yield result[uid]
 
     @staticmethod
     def is_omim_disease(gene_id):
@@ -0,0 +1,344 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.packages.urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+LOG = logging.getLogger(__name__)
+
+MIN_CHUNK = 64 * 1024              # bytes per read, grows while reads come fast
+MAX_CHUNK = 8 * 1024 * 1024
+SEGMENT_MIN = 64 * 1024 * 1024     # smaller files are not worth splitting up
+RETRIES = 5                        # times one download may resume after a drop
+TIMEOUT = (30, 300)                # seconds to (connect, read) before giving up
+
+# what a dropped or stalled connection looks like mid download
+INTERRUPTED = (
+    requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout, ProtocolError, ReadTimeoutError)
+
+
+class FetchUtil:
+    """
+    Fetch remote files over a shared pool of keep-alive connections.
+
+    A single HEAD per file tells the caller whether a download is needed,
+    a download reuses a pooled connection and the validators the server sent
+    (ETag, Last-Modified, Content-Length) are handed back so they need not
+    be asked for again; kept from one run to the next they make the
+    download a conditional GET.
+
+    Downloads land in "<file>.part" and are renamed into place once complete,
+    an interrupted download is resumed with a Range request (guarded by If-Range)
+    within the run or by the next run; a large file may instead be fetched
+    as several ranges at once.
+
+    The underlying requests.Session is safe to share between the threads
+    of a concurrent.futures pool for this usage.
+    Only http(s) is handled here, ftp is still fetched with urllib.
+
+    """
+
+    def __init__(self, max_connections=8, max_retries=3):
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max_connections,
+            pool_maxsize=max_connections,
+            max_retries=max_retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # the body is saved as is, so ask for it without a content-encoding
+        self.session.headers['Accept-Encoding'] = 'identity'
+
+        return
+
+    @staticmethod
+    def is_supported(url):
+        return url.split(':')[0].lower() in ('http', 'https')
+
+    @staticmethod
+    def get_validators(response):
+        """
+        :param response: requests.Response
+        :return: dict of the cache validators a server sent with a response
+        """
+        size = response.headers.get('Content-Length')
+        if size is not None and size != '':
+            size = int(size)
+        else:
+            size = None
+
+        return {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'size': size,
+        }
+
+    def head(self, url, headers=None):
+        """
+        :param url: remote file
+        :param headers: dict of request headers
+        :return: dict of validators or None if the server refuses HEAD
+        """
+        response = self.session.head(
+            url, headers=headers, allow_redirects=True, timeout=TIMEOUT)
+        if response.status_code in (403, 405, 501):
+            LOG.warning('HEAD is not supported (%i) for %s', response.status_code, url)
+            return None
+        response.raise_for_status()
+
+        return self.get_validators(response)
+
+    def download(self, url, localfile, headers=None, validators=None, segments=1):
+        """
+        Stream a remote file to disk as is (asked for without compression),
+        so the size on disk can be held against Content-Length.
+        Given the validators of an earlier fetch the GET is conditional
+        (If-None-Match/If-Modified-Since) and an unchanged file is not sent.
+
+        :param url: remote file
+        :param localfile: pathname to save file to locally
+        :param headers: dict of request headers
+        :param validators: dict of validators from an earlier fetch
+        :param segments: int ranges to fetch at once when the server allows
+                         (the whole file at once if it then sends no ranges)
+        :return: dict of validators and sha256 seen on the download
+                 or None if the server says the file is not modified
+        """
+        headers = dict(headers or {})
+        if validators is not None:
+            if validators.get('etag') is not None:
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified') is not None:
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        partfile = localfile + '.part'
+        LOG.info("Fetching from %s", url)
+        for attempt in range(RETRIES + 1):
+            offset = 0
+            request_headers = dict(headers)
+            # only a part file streamed from its start has its validators saved
+            partial = self._read_part_validators(partfile)
+            if partial is not None and os.path.exists(partfile):
+                offset = os.stat(partfile).st_size
+            if offset > 0:
+                LOG.info("Resuming %s from byte %i", url, offset)
+                request_headers['Range'] = 'bytes={}-'.format(offset)
+                request_headers['If-Range'] = \
+                    partial['etag'] or partial['last_modified']
+            try:
+                with self.session.get(
+                        url, headers=request_headers, stream=True,
+                        timeout=TIMEOUT) as response:
+                    if response.status_code == 304:
+                        LOG.info("Remote file is not modified %s", url)
+                        self._remove_part(partfile)
+                        return None
+                    if response.status_code == 416 and offset > 0:
+                        # the part file is no use, start over
+                        self._remove_part(partfile)
+                        raise ProtocolError('range not satisfiable')
+                    response.raise_for_status()
+                    remote = self.get_validators(response)
+                    if response.status_code == 206:
+                        # Content-Range: bytes 1000-9999/10000
+                        remote['size'] = int(
+                            response.headers['Content-Range'].split('/')[-1])
+                    else:
+                        offset = 0
+                    is_ranged = response.headers.get('Accept-Ranges') == 'bytes' \
+                        or response.status_code == 206
+                    is_resumable = is_ranged and (
+                        remote['etag'] is not None or
+                        remote['last_modified'] is not None)
+
+                    if offset == 0 and segments > 1 and is_resumable and \
+                            remote['size'] is not None and \
+                            remote['size'] >= SEGMENT_MIN:
+                        response.close()
+                        self._remove_part(partfile)
+                        try:
+                            is_segmented = self._download_segments(
+                                url, partfile, headers, remote, segments)
+                        except Exception:
+                            # preallocated to full size, so never resumed
+                            self._remove_part(partfile)
+                            raise
+                        if not is_segmented:
+                            self._remove_part(partfile)
+                            LOG.warning(
+                                "Ranges of %s were not served, fetching it whole", url)
+                            return self.download(url, localfile, headers, validators)
+                        sha256 = self.get_file_sha256(partfile)
+                    else:
+                        if offset == 0:
+                            self._remove_part(partfile)
+                            if is_resumable:
+                                self._write_part_validators(partfile, remote)
+                        sha256 = self._stream(response, partfile, offset)
+
+                local_size = os.stat(partfile).st_size
+                if remote['size'] is not None and local_size < remote['size']:
+                    raise ProtocolError('connection closed early')
+                break
+            except INTERRUPTED as err:
+                if attempt == RETRIES:
+                    raise
+                LOG.warning("Download of %s interrupted: %s", url, err)
+                time.sleep(2 ** attempt)
+
+        if remote['size'] is not None and local_size != remote['size']:
+            LOG.error(
+                'local file and remote file different sizes\n'
+                '%s has size %s, %s has size %s',
+                localfile, local_size, url, remote['size'])
+            raise Exception(
+                "Error downloading file: local file size  != remote file size")
+        os.replace(partfile, localfile)
+        self._remove_part(partfile)
+        LOG.info("Finished.  Wrote %i bytes to %s", local_size, localfile)
+        remote['size'] = local_size
+        remote['sha256'] = sha256
+
+        return remote
+
+    @staticmethod
+    def _stream(response, partfile, offset):
+        """
+        Append a response body to what is already in the part file
+        reading larger chunks while they keep arriving quickly
+        :return: str sha256 of the whole part file
+        """
+        sha256 = hashlib.sha256()
+        mode = 'wb'
+        if offset > 0:
+            mode = 'r+b'
+            with open(partfile, 'rb') as bin_reader:
+                while bin_reader.tell() < offset:
+                    buff = bin_reader.read(min(MAX_CHUNK, offset - bin_reader.tell()))
+                    if not buff:
+                        break
+                    sha256.update(buff)
+
+        chunk = MIN_CHUNK
+        with open(partfile, mode) as binwrite:
+            binwrite.seek(offset)
+            binwrite.truncate()
+            while True:
+                start = time.time()
+                buff = response.raw.read(chunk, decode_content=False)
+                if not buff:
+                    break
+                sha256.update(buff)
+                binwrite.write(buff)
+                elapsed = time.time() - start
+                if len(buff) == chunk and elapsed < 0.25 and chunk < MAX_CHUNK:
+                    chunk *= 2
+                elif elapsed > 2 and chunk > MIN_CHUNK:
+                    chunk //= 2
+
+        return sha256.hexdigest()
+
+    def _download_segments(self, url, partfile, headers, remote, segments):
+        """
+        Fetch byte ranges of one file at once into a preallocated part file.
+        Each range resumes on its own after a drop; a segmented part file
+        is not resumed by a later run.
+        :return: False if the server sent a whole file instead of a range
+        """
+        size = remote['size']
+        LOG.info("Fetching %s as %i ranges of %i bytes", url, segments, size)
+        with open(partfile, 'wb') as binwrite:
+            binwrite.truncate(size)
+        bounds = [
+            (size * num // segments, size * (num + 1) // segments - 1)
+            for num in range(segments)]
+        with ThreadPoolExecutor(max_workers=segments) as pool:
+            is_ranged = [
+                future.result() for future in [
+                    pool.submit(
+                        self._fetch_segment, url, partfile, headers, remote,
+                        first, last)
+                    for (first, last) in bounds]]
+
+        return all(is_ranged)
+
+    def _fetch_segment(self, url, partfile, headers, remote, first, last):
+        """
+        :return: False if the server ignored the range (or If-Range) and
+                 answered with the whole file, which is then not read
+        """
+        position = first
+        for attempt in range(RETRIES + 1):
+            request_headers = dict(headers)
+            request_headers['Range'] = 'bytes={}-{}'.format(position, last)
+            request_headers['If-Range'] = remote['etag'] or remote['last_modified']
+            try:
+                with self.session.get(
+                        url, headers=request_headers, stream=True,
+                        timeout=TIMEOUT) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        return False
+                    with open(partfile, 'r+b') as binwrite:
+                        binwrite.seek(position)
+                        while position <= last:
+                            buff = response.raw.read(
+                                min(MAX_CHUNK, last - position + 1),
+                                decode_content=False)
+                            if not buff:
+                                break
+                            binwrite.write(buff)
+                            position += len(buff)
+                if position <= last:
+                    raise ProtocolError('connection closed early')
+                return True
+            except INTERRUPTED as err:
+                if attempt == RETRIES:
+                    raise
+                LOG.warning(
+                    "Range %i-%i of %s interrupted: %s", position, last, url, err)
+                time.sleep(2 ** attempt)
+
+        return
+
+    @staticmethod
+    def _read_part_validators(partfile):
+        """
+        :return: dict of the validators a part file was started with, or None
+        """
+        if not os.path.exists(partfile + '.json'):
+            return None
+        with open(partfile + '.json', 'r') as json_reader:
+            return json.load(json_reader)
+
+    @staticmethod
+    def _write_part_validators(partfile, validators):
+        with open(partfile + '.json', 'w') as json_writer:
+            json.dump(validators, json_writer)
+
+        return
+
+    @staticmethod
+    def _remove_part(partfile):
+        for leftover in (partfile, partfile + '.json'):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+        return
+
+    @staticmethod
+    def get_file_sha256(localfile, blocksize=2**20):
+        sha256 = hashlib.sha256()
+        with open(localfile, 'rb') as bin_reader:
+            while True:
+                buff = bin_reader.read(blocksize)
+                if not buff:
+                    break
+                sha256.update(buff)
+
+        return sha256.hexdigest()
@@ -1,6 +1,9 @@
 import logging
 import hashlib
+import os
+from datetime import datetime
 
+import yaml
 from xml.sax import SAXParseException
 from rdflib import URIRef, ConjunctiveGraph, util as rdflib_util
 from rdflib.namespace import DC, RDF, OWL
@@ -12,6 +15,23 @@ __author__ = 'nlw'
 
 LOG = logging.getLogger(__name__)
 
+GH = 'https://raw.githubusercontent.com'
+MI = '/monarch-initiative'
+# where the property declarations for add_property_axioms() come from
+PROPERTY_ONTOLOGIES = [
+    GH + MI + '/SEPIO-ontology/master/src/ontology/sepio.owl',
+    GH + MI + '/GENO-ontology/develop/src/ontology/geno.owl',
+    GH + '/oborel/obo-relations/master/ro.owl',
+    'http://purl.obolibrary.org/obo/iao.owl',
+    'http://purl.obolibrary.org/obo/ero.owl',
+    GH + '/jamesmalone/OBAN/master/ontology/oban_core.ttl',
+    'http://purl.obolibrary.org/obo/pco.owl',
+    'http://purl.obolibrary.org/obo/xco.owl'
+]
+PROPERTY_TYPES = ('ObjectProperty', 'AnnotationProperty', 'DatatypeProperty')
+# the properties declared in PROPERTY_ONTOLOGIES, kept between runs
+PROPERTY_CACHE = 'raw/property_axioms.yaml'
+
 
 class GraphUtils:
 
@@ -61,26 +81,104 @@ class GraphUtils:
 
     @staticmethod
     def add_property_axioms(graph, properties):
-        ontology_graph = ConjunctiveGraph()
-        GH = 'https://raw.githubusercontent.com'
-        MI = '/monarch-initiative'
-        ontologies = [
-            GH + MI + '/SEPIO-ontology/master/src/ontology/sepio.owl',
-            GH + MI + '/GENO-ontology/develop/src/ontology/geno.owl',
-            GH + '/oborel/obo-relations/master/ro.owl',
-            'http://purl.obolibrary.org/obo/iao.owl',
-            'http://purl.obolibrary.org/obo/ero.owl',
-            GH + '/jamesmalone/OBAN/master/ontology/oban_core.ttl',
-            'http://purl.obolibrary.org/obo/pco.owl',
-            'http://purl.obolibrary.org/obo/xco.owl'
-        ]
+        """
+        Type each of the properties as it is declared in PROPERTY_ONTOLOGIES
+        (see get_property_types() for where those come from)
+        :param graph: rdflib graph to add the axioms to
+        :param properties: set of property URIRefs used in the graph
+        :return: the graph
+        """
+        property_types = GraphUtils.get_property_types()
+        for property_type in PROPERTY_TYPES:
+            graph = GraphUtils.add_property_to_graph(
+                property_types[property_type], graph, OWL[property_type], properties)
+
+        for row in graph.predicates(DC['source'], OWL['AnnotationProperty']):
+            if row == RDF['type']:
+                graph.remove(
+                    (DC['source'], RDF['type'], OWL['AnnotationProperty']))
+        graph.add((DC['source'], RDF['type'], OWL['ObjectProperty']))
+
+        # Hardcoded properties
+        graph.add((
+            URIRef('https://monarchinitiative.org/MONARCH_cliqueLeader'), RDF['type'],
+            OWL['AnnotationProperty']))
+
+        graph.add((
+            URIRef('https://monarchinitiative.org/MONARCH_anonymous'), RDF['type'],
+            OWL['AnnotationProperty']))
+
+        return graph
+
+    # properties per type once read, by cache file, for every source in the process
+    property_types = {}
+
+    @staticmethod
+    def get_property_types(cache_file=PROPERTY_CACHE, refresh=False):
+        """
+        The object, annotation and datatype properties declared in
+        PROPERTY_ONTOLOGIES. These are read from the network only when
+        cache_file is missing, was made from other ontologies, or on refresh;
+        otherwise from cache_file, once per process.
+        :param cache_file: str path of the yaml cache
+        :param refresh: bool parse the ontologies again and rewrite the cache
+        :return: dict of property type (i.e. 'ObjectProperty') to set of URIRef
+        """
+        if not refresh and cache_file in GraphUtils.property_types:
+            return GraphUtils.property_types[cache_file]
+
+        bundle = None
+        if not refresh and os.path.exists(cache_file):
+            with open(cache_file, 'r') as yaml_reader:
+                try:
+                    bundle = yaml.safe_load(yaml_reader)
+                except yaml.YAMLError as err:
+                    LOG.warning("Can not read %s: %s", cache_file, err)
+            if not isinstance(bundle, dict):
+                # e.g. empty or cut short
+                LOG.info("%s is not a property bundle, rebuilding it", cache_file)
+                bundle = None
+            elif sorted(bundle.get('ontologies') or {}) != sorted(PROPERTY_ONTOLOGIES):
+                LOG.info("%s is for other ontologies, rebuilding it", cache_file)
+                bundle = None
+            else:
+                LOG.info(
+                    "Using property axioms cached in %s on %s",
+                    cache_file, bundle['created'])
+        if bundle is None:
+            bundle = GraphUtils._get_property_bundle()
+            cache_dir = os.path.dirname(cache_file)
+            if cache_dir != '' and not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            with open(cache_file + '.part', 'w') as yaml_writer:
+                yaml.safe_dump(bundle, yaml_writer, default_flow_style=False)
+            os.replace(cache_file + '.part', cache_file)
+            LOG.info("Cached property axioms in %s", cache_file)
+
+        GraphUtils.property_types[cache_file] = {
+            property_type: {URIRef(iri) for iri in bundle[property_type]}
+            for property_type in PROPERTY_TYPES}
+        return GraphUtils.property_types[cache_file]
+
+    @staticmethod
+    def _get_property_bundle():
+        """
+        Parse each of PROPERTY_ONTOLOGIES for its property declarations
+        :return: dict of version per ontology and sorted list of IRIs per type
+        """
+        bundle = {
+            'created': datetime.now().isoformat(' ').split('.')[0],
+            'ontologies': {},
+        }
+        properties = {property_type: set() for property_type in PROPERTY_TYPES}
 
         # random timeouts can waste hours. (too many redirects?)
         # there is a timeout param in urllib.request,
         # but it is not exposed by rdflib.parsing
         # so retry once on URLError
-        for ontology in ontologies:
+        for ontology in PROPERTY_ONTOLOGIES:
             LOG.info("parsing: " + ontology)
+            ontology_graph = ConjunctiveGraph()
             try:
                 ontology_graph.parse(
                     ontology, format=rdflib_util.guess_format(ontology))
@@ -95,37 +193,20 @@ class GraphUtils:
                 ontology_graph.parse(
                     ontology, format=rdflib_util.guess_format(ontology))
 
-        # Get object properties
-        graph = GraphUtils.add_property_to_graph(
-            ontology_graph.subjects(RDF['type'], OWL['ObjectProperty']),
-            graph, OWL['ObjectProperty'], properties)
+            version = next(ontology_graph.objects(None, OWL['versionIRI']), None)
+            if version is None:
+                version = next(ontology_graph.objects(None, OWL['versionInfo']), None)
+            bundle['ontologies'][ontology] = None if version is None else str(version)
+            for property_type in PROPERTY_TYPES:
+                properties[property_type].update(
+                    str(row) for row in ontology_graph.subjects(
+                        RDF['type'], OWL[property_type])
+                    if isinstance(row, URIRef))
 
-        # Get annotation properties
-        graph = GraphUtils.add_property_to_graph(
-            ontology_graph.subjects(RDF['type'], OWL['AnnotationProperty']),
-            graph, OWL['AnnotationProperty'], properties)
+        for property_type in PROPERTY_TYPES:
+            bundle[property_type] = sorted(properties[property_type])
 
-        # Get data properties
-        graph = GraphUtils.add_property_to_graph(
-            ontology_graph.subjects(RDF['type'], OWL['DatatypeProperty']),
-            graph, OWL['DatatypeProperty'], properties)
-
-        for row in graph.predicates(DC['source'], OWL['AnnotationProperty']):
-            if row == RDF['type']:
-                graph.remove(
-                    (DC['source'], RDF['type'], OWL['AnnotationProperty']))
-        graph.add((DC['source'], RDF['type'], OWL['ObjectProperty']))
-
-        # Hardcoded properties
-        graph.add((
-            URIRef('https://monarchinitiative.org/MONARCH_cliqueLeader'), RDF['type'],
-            OWL['AnnotationProperty']))
-
-        graph.add((
-            URIRef('https://monarchinitiative.org/MONARCH_anonymous'), RDF['type'],
-            OWL['AnnotationProperty']))
-
-        return graph
+        return bundle
 
     @staticmethod
     def add_property_to_graph(results, graph, property_type, property_list):
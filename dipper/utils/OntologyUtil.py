@@ -0,0 +1,240 @@
+import hashlib
+import logging
+import os
+import pickle
+import re
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import RDFS, OWL, RDF
+
+from dipper.utils.CurieUtil import CurieUtil
+from dipper import curie_map
+
+LOG = logging.getLogger(__name__)
+
+INDEX_FORMAT = 1            # bump when the cached layout changes
+VERSION_SNIFF = 64 * 1024   # bytes read from the head of a file to find its version
+
+# owl:versionIRI / owl:versionInfo as written in RDF/XML
+VERSION_PATTERN = re.compile(
+    r'<owl:versionIRI\s+rdf:resource="([^"]+)"|<owl:versionInfo[^>]*>([^<]+)<')
+
+
+class OntologyUtil:
+    """
+    Subclass closure and labels of one ontology, for lookups during a parse.
+
+    The ontology is parsed with rdflib once per version, its rdfs:subClassOf
+    ancestors and rdfs:labels are computed and saved beside the file
+    ("<file>.<version>.index"); later loads read that instead.
+    Questions like "is X a descendant of Y" and "label of X" are then
+    set and list lookups instead of SPARQL queries.
+
+    Terms may be given as IRIs or as curies from curie_map.yaml.
+
+    """
+
+    curie_util = CurieUtil(curie_map.get())
+
+    def __init__(self, ontology_file, fmt='xml', cache_dir=None):
+        """
+        :param ontology_file: str path of the (local) ontology
+        :param fmt: str rdflib parser format
+        :param cache_dir: str directory of the index, defaults to the ontology's
+        """
+        self.ontology_file = ontology_file
+        self.fmt = fmt
+        if cache_dir is None:
+            cache_dir = os.path.dirname(os.path.abspath(ontology_file))
+        version = self.get_version(ontology_file)
+        self.version = version
+        self.index_file = os.path.join(
+            cache_dir, '{}.{}.index'.format(
+                os.path.basename(ontology_file),
+                hashlib.sha1(version.encode('utf-8')).hexdigest()[:12]))
+
+        index = self._load_index()
+        if index is None:
+            index = self._build_index()
+            self._save_index(index)
+
+        self.terms = index['terms']
+        self.labels = index['labels']
+        self.parents = [frozenset(ids) for ids in index['parents']]
+        self.ancestors = [frozenset(ids) for ids in index['ancestors']]
+        self.term_ids = {term: num for num, term in enumerate(self.terms)}
+        LOG.info(
+            "Indexed %i classes of %s version %s",
+            len(self.terms), ontology_file, version)
+
+    @staticmethod
+    def get_version(ontology_file):
+        """
+        The owl:versionIRI (or versionInfo) near the top of the file,
+        or failing that a digest of the whole file
+        :param ontology_file: str path
+        :return: str
+        """
+        with open(ontology_file, 'r', encoding='utf-8', errors='replace') as reader:
+            match = VERSION_PATTERN.search(reader.read(VERSION_SNIFF))
+        if match is not None:
+            return match.group(1) or match.group(2).strip()
+
+        sha256 = hashlib.sha256()
+        with open(ontology_file, 'rb') as reader:
+            for block in iter(lambda: reader.read(2 ** 20), b''):
+                sha256.update(block)
+        return sha256.hexdigest()
+
+    def get_label(self, term):
+        """
+        :param term: str IRI or curie
+        :return: str rdfs:label or None
+        """
+        num = self._get_id(term)
+        if num is None:
+            return None
+        return self.labels[num]
+
+    def is_descendant(self, term, ancestor):
+        """
+        :param term: str IRI or curie
+        :param ancestor: str IRI or curie
+        :return: bool term is a (proper, transitive) subclass of ancestor
+        """
+        num = self._get_id(term)
+        ancestor_num = self._get_id(ancestor)
+        if num is None or ancestor_num is None:
+            return False
+        return ancestor_num in self.ancestors[num]
+
+    def is_child(self, term, parent):
+        """
+        :return: bool term is asserted rdfs:subClassOf parent
+        """
+        num = self._get_id(term)
+        parent_num = self._get_id(parent)
+        if num is None or parent_num is None:
+            return False
+        return parent_num in self.parents[num]
+
+    def get_ancestors(self, term):
+        """
+        :return: set of str IRIs term is a subclass of, directly or not
+        """
+        num = self._get_id(term)
+        if num is None:
+            return set()
+        return {self.terms[ancestor] for ancestor in self.ancestors[num]}
+
+    def _get_id(self, term):
+        if term[:4] != 'http':
+            term = self.curie_util.get_uri(term)
+        return self.term_ids.get(term)
+
+    def _load_index(self):
+        if not os.path.exists(self.index_file):
+            return None
+        with open(self.index_file, 'rb') as reader:
+            index = pickle.load(reader)
+        if index.get('format') != INDEX_FORMAT or index.get('version') != self.version:
+            LOG.info("Ignoring stale ontology index %s", self.index_file)
+            return None
+        LOG.info("Loaded ontology index %s", self.index_file)
+        return index
+
+    def _save_index(self, index):
+        partfile = self.index_file + '.part'
+        with open(partfile, 'wb') as writer:
+            pickle.dump(index, writer, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partfile, self.index_file)
+        # indexes of earlier versions of the same file are of no further use
+        prefix = os.path.basename(self.ontology_file) + '.'
+        cache_dir = os.path.dirname(self.index_file)
+        for name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, name)
+            if name.startswith(prefix) and name.endswith('.index') and \
+                    path != self.index_file:
+                os.remove(path)
+        LOG.info("Saved ontology index %s", self.index_file)
+
+    def _build_index(self):
+        """
+        Parse the ontology and compute each class's ancestors
+        :return: dict of lists, position in each is the term id
+        """
+        LOG.info("Parsing %s to index it", self.ontology_file)
+        graph = Graph()
+        graph.parse(self.ontology_file, format=self.fmt)
+
+        term_ids = {}
+        terms = []
+        parents = []
+
+        def get_id(iri):
+            num = term_ids.get(iri)
+            if num is None:
+                num = term_ids[iri] = len(terms)
+                terms.append(iri)
+                parents.append(set())
+            return num
+
+        for subject in graph.subjects(RDF.type, OWL.Class):
+            if isinstance(subject, URIRef):
+                get_id(str(subject))
+        for (subject, parent) in graph.subject_objects(RDFS.subClassOf):
+            # restrictions and other class expressions are blank nodes
+            if isinstance(subject, URIRef) and isinstance(parent, URIRef):
+                parents[get_id(str(subject))].add(get_id(str(parent)))
+
+        labels = [None] * len(terms)
+        for (subject, label) in graph.subject_objects(RDFS.label):
+            num = term_ids.get(str(subject))
+            if num is not None and labels[num] is None and isinstance(label, Literal):
+                labels[num] = str(label)
+
+        return {
+            'format': INDEX_FORMAT,
+            'version': self.version,
+            'terms': terms,
+            'labels': labels,
+            'parents': [sorted(ids) for ids in parents],
+            'ancestors': self._get_closure(parents),
+        }
+
+    @staticmethod
+    def _get_closure(parents):
+        """
+        Ancestors of every term, each computed once from its parents' own.
+        A term in a subClassOf cycle gets the ancestors reachable before
+        the cycle closes.
+        :param parents: list of set of int
+        :return: list of sorted list of int
+        """
+        ancestors = [None] * len(parents)
+        for start in range(len(parents)):
+            if ancestors[start] is not None:
+                continue
+            in_progress = set()
+            stack = [start]
+            while stack:
+                num = stack[-1]
+                if ancestors[num] is not None:
+                    stack.pop()
+                    continue
+                pending = [
+                    parent for parent in parents[num]
+                    if ancestors[parent] is None and parent not in in_progress]
+                if num not in in_progress and pending:
+                    in_progress.add(num)
+                    stack.extend(pending)
+                    continue
+                closure = set(parents[num])
+                for parent in parents[num]:
+                    if ancestors[parent] is not None:
+                        closure.update(ancestors[parent])
+                ancestors[num] = closure
+                in_progress.discard(num)
+                stack.pop()
+
+        return [sorted(closure) for closure in ancestors]
@@ -0,0 +1,132 @@
+import gzip
+import heapq
+import io
+import logging
+import os
+import tempfile
+
+LOG = logging.getLogger(__name__)
+
+RUN_LINES = 2 ** 20     # lines sorted in memory at a time (~200MB of ntriples)
+MERGE_WIDTH = 64        # sorted runs open at once while merging
+
+
+class SortUtil:
+    """
+    External merge sort for line oriented RDF (N-Triples, N-Quads).
+
+    Lines are compared as bytes, the same order as `LC_ALL=C sort`,
+    so the output is reproducible whatever the locale or machine.
+    At most RUN_LINES lines are held in memory, sorted runs are spilled to a
+    temporary directory then merged MERGE_WIDTH at a time, dropping duplicates.
+    Files ending in .gz (or .zst with the zstandard package) are
+    read and written compressed.
+
+    """
+
+    @staticmethod
+    def sort_unique(infiles, outfile, run_lines=RUN_LINES, tmpdir=None):
+        """
+        Sort the lines of one or more files into one file without duplicates.
+        The outfile may be one of the infiles; it is replaced once complete.
+        :param infiles: list of str paths
+        :param outfile: str path
+        :param run_lines: int lines sorted in memory at a time
+        :param tmpdir: str directory for sorted runs, defaults to beside outfile
+        :return: int number of unique lines written
+        """
+        if tmpdir is None:
+            tmpdir = os.path.dirname(os.path.abspath(outfile))
+        with tempfile.TemporaryDirectory(prefix='sort_', dir=tmpdir) as rundir:
+            runs = []
+            for infile in infiles:
+                LOG.info("Sorting %s", infile)
+                with SortUtil.open_file(infile, 'rb') as reader:
+                    lines = set()
+                    for line in reader:
+                        if line.strip() == b'':
+                            continue
+                        if line[-1:] != b'\n':
+                            line += b'\n'
+                        lines.add(line)
+                        if len(lines) >= run_lines:
+                            runs.append(SortUtil._write_run(lines, rundir, len(runs)))
+                            lines = set()
+                    if lines:
+                        runs.append(SortUtil._write_run(lines, rundir, len(runs)))
+
+            # fold the runs until a single merge can produce the output
+            while len(runs) > MERGE_WIDTH:
+                merged = []
+                for start in range(0, len(runs), MERGE_WIDTH):
+                    runfile = os.path.join(rundir, 'merge_{}'.format(len(merged)))
+                    runfile += '_{}'.format(len(runs))
+                    SortUtil._merge(runs[start:start + MERGE_WIDTH], runfile)
+                    merged.append(runfile)
+                runs = merged
+
+            partfile = outfile + '.part'
+            count = SortUtil._merge(runs, partfile)
+            os.replace(partfile, outfile)
+
+        LOG.info("Wrote %i unique lines to %s", count, outfile)
+        return count
+
+    @staticmethod
+    def _write_run(lines, rundir, num):
+        runfile = os.path.join(rundir, 'run_{}'.format(num))
+        with open(runfile, 'wb') as writer:
+            writer.writelines(sorted(lines))
+
+        return runfile
+
+    @staticmethod
+    def _merge(runfiles, outfile):
+        """
+        Merge sorted files, each line once, removing the merged files
+        :return: int number of lines written
+        """
+        count = 0
+        readers = [open(runfile, 'rb') for runfile in runfiles]
+        try:
+            with SortUtil.open_file(outfile, 'wb') as writer:
+                previous = None
+                for line in heapq.merge(*readers):
+                    if line != previous:
+                        writer.write(line)
+                        count += 1
+                        previous = line
+        finally:
+            for reader in readers:
+                reader.close()
+        for runfile in runfiles:
+            os.remove(runfile)
+
+        return count
+
+    @staticmethod
+    def open_file(filename, mode):
+        """
+        A binary file object, (de)compressed according to the file suffix.
+        A '.part' suffix is ignored when deciding.
+        :param filename: str path
+        :param mode: 'rb' or 'wb'
+        """
+        name = filename
+        if name.endswith('.part'):
+            name = name[:-len('.part')]
+        if name.endswith('.gz'):
+            return gzip.open(filename, mode, compresslevel=6)
+        if name.endswith('.zst'):
+            try:
+                import zstandard
+            except ImportError:
+                LOG.error("%s needs zstandard, see requirements/zstd.txt", filename)
+                raise
+            if mode == 'rb':
+                return io.BufferedReader(
+                    zstandard.ZstdDecompressor().stream_reader(open(filename, 'rb')))
+            return zstandard.ZstdCompressor(level=3).stream_writer(
+                open(filename, 'wb'))
+
+        return open(filename, mode)
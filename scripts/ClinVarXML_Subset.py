@@ -34,13 +34,13 @@ ARGPARSER.add_argument(
     help="input filename. default: '" + files['f1']['file'] + "'")
 
 ARGPARSER.add_argument(
-    '-i', '--inputdir', default=RPATH + '/raw/clinvarxml_alpha',
-    help="input path. default: '" + RPATH + '/raw/clinvarxml_alpha' "'")
+    '-i', '--inputdir', default=RPATH + '/raw/clinvar',
+    help="input path. default: '" + RPATH + '/raw/clinvar' "'")
 
 # OUTPUT
 ARGPARSER.add_argument(
-    '-d', "--destination", default=RPATH + '/raw/clinvarxml_alpha',
-    help='output path. default: "' + RPATH + '/raw/clinvarxml_alpha')
+    '-d', "--destination", default=RPATH + '/raw/clinvar',
+    help='output path. default: "' + RPATH + '/raw/clinvar')
 
 ARGPARSER.add_argument(
     '-o', "--output", default=INAME + '.xml',
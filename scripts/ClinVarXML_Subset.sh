@@ -7,9 +7,9 @@
 # Usage:
 # ClinVarXML_Subset.sh	 [<rcvlist> <cvxml>] > ClinVarTestSet.xml
 # e.g.
-# ./scripts/ClinVarXML_Subset.sh | gzip > raw/clinvarxml_alpha/ClinVarTestSet.xml.gz
+# ./scripts/ClinVarXML_Subset.sh | gzip > raw/clinvar/ClinVarTestSet.xml.gz
 
-RPTH='raw/clinvarxml_alpha'
+RPTH='raw/clinvar'
 # Defaults if not given
 TEST=${1:-"${RPTH}/CV_test_RCV.txt"}
 CXML=${2:-"${RPTH}/ClinVarFullRelease_00-latest.xml.gz"}
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+Time CurieUtil expansion (curie -> IRI) and contraction (IRI -> curie)
+over every prefix in dipper/curie_map.yaml, next to the plain
+split/scan the class used before it memoized and indexed them.
+
+Reports the mean cost of one call in microseconds.
+"""
+
+import argparse
+import timeit
+
+from dipper import curie_map
+from dipper.utils.CurieUtil import CurieUtil
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    '--ids', '-i', type=int, default=50, help='local ids per prefix')
+parser.add_argument(
+    '--repeat', '-r', type=int, default=5, help='passes over all the ids')
+
+args = parser.parse_args()
+
+cmap = curie_map.get()
+cutil = CurieUtil(cmap)
+uri_map = {value: key for key, value in cmap.items()}
+
+curies = [
+    '{}:{:07d}'.format(prefix, num)
+    for prefix in cmap if prefix != ''
+    for num in range(args.ids)]
+iris = [cutil.get_uri(curie) for curie in curies]
+
+
+def scan_get_uri(curie):
+    parts = curie.split(':')
+    return cmap.get(parts[0]) + ':'.join(parts[1:])
+
+
+def scan_get_curie_prefix(iri):
+    for key, value in uri_map.items():
+        if iri.startswith(key):
+            return value
+    return None
+
+
+def report(label, func, items):
+    seconds = min(timeit.repeat(
+        lambda: [func(item) for item in items], number=1, repeat=args.repeat))
+    print('{:<32} {:8.3f} us/call'.format(label, seconds / len(items) * 1e6))
+
+
+print('{} prefixes, {} curies'.format(len(cmap), len(curies)))
+report('get_uri (split)', scan_get_uri, curies)
+report('CurieUtil.get_uri', cutil.get_uri, curies)
+report('get_curie_prefix (scan)', scan_get_curie_prefix, iris)
+report('CurieUtil.get_curie_prefix', cutil.get_curie_prefix, iris)
+report('CurieUtil.get_curie', cutil.get_curie, iris)
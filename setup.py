@@ -24,7 +24,8 @@ setup(
     license='BSD',
     install_requires=[
         'psycopg2', 'rdflib', 'isodate', 'roman', 'python-docx', 'pyyaml',
-        'pysftp', 'beautifulsoup4', 'GitPython', 'intermine', 'pandas'],
+        'pysftp', 'beautifulsoup4', 'GitPython', 'intermine', 'pandas',
+        'requests'],
     include_package_data=True,
 
     keywords='ontology graph obo owl sparql rdf',
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import io
+import unittest
+import logging
+
+from rdflib import URIRef
+
+from dipper.sources import Bgee as bgee
+from dipper.sources.Bgee import Bgee
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+HEADER = 'Ensembl gene ID\tgene name\tanatomical entity ID\t' \
+    'anatomical entity name\trank score\tXRefs to BTO\n'
+
+
+class BgeeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.bgee = Bgee('rdf_graph', True, tax_ids=['9606'])
+        self.chunk_rows = bgee.CHUNK_ROWS
+        bgee.CHUNK_ROWS = 2     # genes cross chunk boundaries
+
+    def tearDown(self):
+        bgee.CHUNK_ROWS = self.chunk_rows
+
+    def test_top_ranked_per_gene(self):
+        rows = [
+            ('ENSG01', 'UBERON:0000001', '10.5'),
+            ('ENSG01', 'UBERON:0000002', '1,200.00'),
+            ('ENSG01', 'UBERON:0000003', '99'),
+            ('ENSG02', 'UBERON:0000001', '5'),
+            ('ENSG02', 'UBERON:0000004', '7'),
+        ]
+        tsv = HEADER + ''.join(
+            '{}\tgene\t{}\tanatomy\t{}\t\n'.format(*row) for row in rows)
+        self.bgee._parse_gene_anatomy(io.StringIO(tsv), 2)
+
+        expressed_in = URIRef(self.bgee.graph._getnode(
+            self.bgee.globaltt['expressed in']))
+        pairs = {
+            (str(subj).split('/')[-1], str(obj).split('_')[-1])
+            for (subj, obj) in self.bgee.graph.subject_objects(expressed_in)}
+        self.assertEqual(pairs, {
+            ('ENSG01', '0000002'), ('ENSG01', '0000003'),
+            ('ENSG02', '0000001'), ('ENSG02', '0000004')})
+
+
+if __name__ == '__main__':
+    unittest.main()
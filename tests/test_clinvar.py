@@ -1,4 +1,7 @@
 #!/usr/bin/env python3
+import gzip
+import io
+import os
 import unittest
 import logging
 from dipper.sources.ClinVar import ClinVar
@@ -11,9 +14,7 @@ logger = logging.getLogger(__name__)
 class ClinVarTestCase(SourceTestCase):
 
     def setUp(self):
-        self.source = ClinVar('rdf_graph', True)
-        self.source.gene_ids = self._get_conf()['test_ids']['gene']
-        self.source.disease_ids = self._get_conf()['test_ids']['disease']
+        self.source = ClinVar('rdf_graph', True)  # test ids from test_ids.yaml
         self.source.settestonly(True)
         self._setDirToSource()
         return
@@ -22,6 +23,34 @@ class ClinVarTestCase(SourceTestCase):
         self.source = None
         return
 
+    def test_clinvarset(self):
+        """
+        the one ClinVarSet of the test resource, streamed or cut into a chunk
+        """
+        resource = os.path.join(
+            os.path.dirname(__file__), 'resources/clinvar/RCV000175394.xml.gz')
+        self.source.test_mode = False
+        streamed = list(self.source.process_xml(resource))
+        self.assertEqual(len(streamed), 1)
+        (triples, rejected) = streamed[0]
+        self.assertIsNone(rejected)
+        self.assertIn(
+            ('ClinVarVariant:194917', 'rdfs:label', 'NM_000182.4(HADHA):c.2146+1G>A'),
+            triples)
+
+        with gzip.open(resource, 'rb') as fh:
+            xml = fh.read()
+        chunks = list(self.source.split_clinvarsets(io.BytesIO(xml), 2))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(self.source.process_clinvarset_chunk(chunks[0]), streamed)
+
+        # five sets, limited to three, as the serial parse would be
+        start = xml.index(b'<ClinVarSet ')
+        end = xml.index(b'</ClinVarSet>') + len(b'</ClinVarSet>')
+        xml = xml[:end] + xml[start:end] * 4 + xml[end:]
+        chunks = list(self.source.split_clinvarsets(io.BytesIO(xml), 2, limit=3))
+        self.assertEqual([chunk.count(b'</ClinVarSet>') for chunk in chunks], [2, 1])
+
     # @unittest.skip('Clinvar-specific tests not yet defined')
     # def test_clinvar(self):
     #    logger.info("A ClinVar-specific test")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import unittest
+import logging
+
+from dipper.utils.CurieUtil import CurieUtil
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class CurieUtilTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cutil = CurieUtil({
+            '': 'https://monarchinitiative.org/',
+            'OBO': 'http://purl.obolibrary.org/obo/',
+            'HP': 'http://purl.obolibrary.org/obo/HP_',
+            'MONARCH': 'https://monarchinitiative.org/MONARCH_',
+        })
+
+    def tearDown(self):
+        self.cutil = None
+
+    def test_get_uri(self):
+        self.assertEqual(
+            self.cutil.get_uri('HP:0000118'),
+            'http://purl.obolibrary.org/obo/HP_0000118')
+        self.assertEqual(
+            self.cutil.get_uri(':foo:bar'), 'https://monarchinitiative.org/foo:bar')
+        self.assertIsNone(self.cutil.get_uri('NOPE:1'))
+        self.assertIsNone(self.cutil.get_uri('HP_0000118'))
+        self.assertIsNone(self.cutil.get_uri(None))
+
+    def test_get_uri_cache_clear(self):
+        self.assertIsNone(self.cutil.get_uri('GO:0008150'))
+        self.cutil.curie_map['GO'] = 'http://purl.obolibrary.org/obo/GO_'
+        self.cutil.cache_clear()
+        self.assertEqual(
+            self.cutil.get_uri('GO:0008150'),
+            'http://purl.obolibrary.org/obo/GO_0008150')
+
+    def test_get_curie_longest_prefix(self):
+        self.assertEqual(
+            self.cutil.get_curie('http://purl.obolibrary.org/obo/HP_0000118'),
+            'HP:0000118')
+        self.assertEqual(
+            self.cutil.get_curie('http://purl.obolibrary.org/obo/UBERON_0001062'),
+            'OBO:UBERON_0001062')
+        self.assertEqual(
+            self.cutil.get_curie('https://monarchinitiative.org/MONARCH_b1'),
+            'MONARCH:b1')
+        self.assertEqual(
+            self.cutil.get_curie('https://monarchinitiative.org/foo'), ':foo')
+        self.assertIsNone(self.cutil.get_curie('http://example.org/1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import time
+import unittest
+import logging
+
+from dipper.utils import DipperUtil as dipper_util
+from dipper.utils.DipperUtil import DipperUtil, EutilsClient, RateLimiter
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class EutilsTestCase(unittest.TestCase):
+    """
+    eutils answers from the local cache, without the network
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmpdir.name, 'eutils.sqlite')
+        DipperUtil.eutils = EutilsClient(self.cache_file)
+
+    def tearDown(self):
+        DipperUtil.eutils = None
+        self.tmpdir.cleanup()
+
+    def test_cached_taxon_label(self):
+        DipperUtil.eutils.cache.put(
+            dipper_util.ESEARCH,
+            {'db': 'taxonomy', 'term': 'Danio rerio', 'retmode': 'json'},
+            {'esearchresult': {'count': '1', 'idlist': ['7955']}})
+        self.assertEqual(DipperUtil.get_ncbi_taxon_num_by_label('Danio rerio'), '7955')
+
+    def test_cached_taxon_labels(self):
+        cache = DipperUtil.eutils.cache
+        cache.put(dipper_util.ESEARCH, {
+            'db': 'taxonomy', 'retmax': 4, 'retmode': 'json',
+            'term': '"Danio rerio"[Scientific Name] OR '
+                    '"zebrafish"[Scientific Name]'},
+            {'esearchresult': {'count': '1', 'idlist': ['7955']}})
+        cache.put(
+            dipper_util.ESUMMARY, {'db': 'taxonomy', 'id': '7955', 'retmode': 'json'},
+            {'result': {'uids': ['7955'], '7955': {
+                'uid': '7955', 'scientificname': 'Danio rerio'}}})
+        # not a scientific name, so looked up on its own
+        cache.put(
+            dipper_util.ESEARCH,
+            {'db': 'taxonomy', 'term': 'zebrafish', 'retmode': 'json'},
+            {'esearchresult': {'count': '1', 'idlist': ['7955']}})
+        self.assertEqual(
+            DipperUtil.get_ncbi_taxon_nums_by_label(
+                ['Danio rerio', 'zebrafish', 'Danio rerio']),
+            {'Danio rerio': '7955', 'zebrafish': '7955'})
+
+    def test_cache_ttl(self):
+        params = {'db': 'homologene', 'term': '1264[Gene ID]'}
+        cache = DipperUtil.eutils.cache
+        cache.put(dipper_util.ESEARCH, params, {'esearchresult': {}})
+        self.assertEqual(cache.get(dipper_util.ESEARCH, params), {'esearchresult': {}})
+        # the address and key sent along are not part of the request's identity
+        self.assertIsNotNone(
+            cache.get(dipper_util.ESEARCH, dict(params, **dipper_util.EREQ)))
+        cache.ttl = -1
+        self.assertIsNone(cache.get(dipper_util.ESEARCH, params))
+
+    def test_rate_limit(self):
+        limiter = RateLimiter(20)
+        start = time.monotonic()
+        for _ in range(30):
+            limiter.wait()
+        # a burst of 20, then 10 more at 20 a second
+        self.assertGreaterEqual(time.monotonic() - start, 0.45)
+
+
+if __name__ == '__main__':
+    unittest.main()
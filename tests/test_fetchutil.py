@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+import gzip
+import os
+import tempfile
+import threading
+import unittest
+import logging
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from dipper.utils import FetchUtil as fetch_util
+from dipper.utils.FetchUtil import FetchUtil
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+CONTENT = b'9606\t1\tA1BG\n' * 1000
+
+
+class GzipHandler(BaseHTTPRequestHandler):
+    """
+    Compresses the body whenever the client says it may
+    """
+
+    def do_GET(self):
+        body = CONTENT
+        self.send_response(200)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(CONTENT)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        return
+
+
+class RangeHandler(GzipHandler):
+    """
+    Serves byte ranges, refusing those starting past the end
+    """
+    ranges = []
+
+    def do_GET(self):
+        (first, last) = (0, len(CONTENT) - 1)
+        self.ranges.append(self.headers.get('Range'))
+        if 'Range' in self.headers and self.is_ranged():
+            (first, last) = self.headers['Range'].split('=')[1].split('-')
+            (first, last) = (int(first), int(last or len(CONTENT) - 1))
+            if first >= len(CONTENT):
+                self.send_response(416)
+                self.send_header('Content-Range', 'bytes */{}'.format(len(CONTENT)))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {}-{}/{}'.format(
+                first, last, len(CONTENT)))
+        else:
+            self.send_response(200)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(last + 1 - first))
+        self.end_headers()
+        self.wfile.write(CONTENT[first:last + 1])
+
+    def is_ranged(self):
+        return True
+
+
+class IgnoredRangeHandler(RangeHandler):
+    """
+    Says it serves ranges, then sends the whole file anyway
+    """
+
+    def is_ranged(self):
+        return False
+
+
+class ETagHandler(GzipHandler):
+    """
+    Answers 304 when asked If-None-Match its ETag, counting what it sent
+    """
+    statuses = []
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.statuses.append(304)
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            return
+        self.statuses.append(200)
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Last-Modified', 'Tue, 01 Jan 2019 00:00:00 GMT')
+        self.send_header('Content-Length', str(len(CONTENT)))
+        self.end_headers()
+        self.wfile.write(CONTENT)
+
+
+class ServerTestCase(unittest.TestCase):
+    """
+    Serves /gene_info from a local HTTPServer with the handler given
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.server = None
+
+    def tearDown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+        self.tmpdir.cleanup()
+
+    def serve(self, handler):
+        self.server = HTTPServer(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = 'http://127.0.0.1:{}/gene_info'.format(self.server.server_port)
+
+
+class FetchUtilTestCase(ServerTestCase):
+
+    def test_download_not_encoded(self):
+        self.serve(GzipHandler)
+        localfile = os.path.join(self.tmpdir.name, 'gene_info')
+        remote = FetchUtil().download(self.url, localfile)
+        with open(localfile, 'rb') as reader:
+            self.assertEqual(reader.read(), CONTENT)
+        self.assertEqual(remote['size'], len(CONTENT))
+        self.assertFalse(os.path.exists(localfile + '.part'))
+
+    def test_resume(self):
+        self.serve(RangeHandler)
+        localfile = os.path.join(self.tmpdir.name, 'gene_info')
+        with open(localfile + '.part', 'wb') as writer:
+            writer.write(CONTENT[:100])
+        # a part file without its validators is not resumed
+        FetchUtil().download(self.url, localfile)
+        with open(localfile, 'rb') as reader:
+            self.assertEqual(reader.read(), CONTENT)
+
+        with open(localfile + '.part', 'wb') as writer:
+            writer.write(CONTENT[:100])
+        FetchUtil._write_part_validators(
+            localfile + '.part', {'etag': '"v1"', 'last_modified': None,
+                                  'size': len(CONTENT)})
+        remote = FetchUtil().download(self.url, localfile)
+        self.assertEqual(remote['size'], len(CONTENT))
+        with open(localfile, 'rb') as reader:
+            self.assertEqual(reader.read(), CONTENT)
+
+    def test_range_not_satisfiable(self):
+        """
+        a part file as long as the remote file (e.g. a preallocated one)
+        is started over rather than failing the download
+        """
+        self.serve(RangeHandler)
+        localfile = os.path.join(self.tmpdir.name, 'gene_info')
+        with open(localfile + '.part', 'wb') as writer:
+            writer.write(b'\0' * len(CONTENT))
+        FetchUtil._write_part_validators(
+            localfile + '.part', {'etag': '"v1"', 'last_modified': None,
+                                  'size': len(CONTENT)})
+        FetchUtil().download(self.url, localfile)
+        with open(localfile, 'rb') as reader:
+            self.assertEqual(reader.read(), CONTENT)
+        self.assertFalse(os.path.exists(localfile + '.part.json'))
+
+    def download_segments(self, handler):
+        self.serve(handler)
+        handler.ranges = []
+        localfile = os.path.join(self.tmpdir.name, 'gene_info')
+        with mock.patch.object(fetch_util, 'SEGMENT_MIN', 1000):
+            remote = FetchUtil().download(self.url, localfile, segments=3)
+        with open(localfile, 'rb') as reader:
+            self.assertEqual(reader.read(), CONTENT)
+        self.assertEqual(remote['size'], len(CONTENT))
+        self.assertEqual(remote['sha256'], FetchUtil.get_file_sha256(localfile))
+        self.assertEqual(os.listdir(self.tmpdir.name), ['gene_info'])
+        return handler.ranges
+
+    def test_segments(self):
+        ranges = self.download_segments(RangeHandler)
+        self.assertEqual(
+            sorted(ranges[1:]), ['bytes=0-3999', 'bytes=4000-7999', 'bytes=8000-11999'])
+
+    def test_segments_not_served(self):
+        """
+        a server answering a range with the whole file is read from once more
+        """
+        ranges = self.download_segments(IgnoredRangeHandler)
+        self.assertEqual(len(ranges), 5)
+        self.assertEqual(ranges[-1], None)
+
+    def test_not_modified(self):
+        self.serve(ETagHandler)
+        ETagHandler.statuses = []
+        localfile = os.path.join(self.tmpdir.name, 'gene_info')
+        with open(localfile, 'wb') as writer:
+            writer.write(b'kept')
+        remote = FetchUtil().download(
+            self.url, localfile, validators={'etag': '"v1"', 'last_modified': None})
+        self.assertIsNone(remote)
+        self.assertEqual(ETagHandler.statuses, [304])
+        with open(localfile, 'rb') as reader:
+            self.assertEqual(reader.read(), b'kept')
+        self.assertFalse(os.path.exists(localfile + '.part'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 
+import gzip
+import os
+import tempfile
 import unittest
 import logging
+from unittest import mock
+from dipper.sources import GeneOntology as go_module
 from dipper.sources.GeneOntology import GeneOntology
 from tests.test_source import SourceTestCase
 
@@ -21,5 +26,108 @@ class GeneOntologyTestCase(SourceTestCase):
         self.source = None
         return
 
+
+class GafPartsTestCase(unittest.TestCase):
+    """
+    How the GAFs are cut into tasks for the forked workers
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.gaffile = os.path.join(self.tmpdir.name, 'goa_human.gaf.gz')
+        with open(self.gaffile, 'wb') as writer:
+            writer.write(b'x' * 64)
+        self.source = GeneOntology.__new__(GeneOntology)
+        self.source.workers = 4
+        self.source.outdir = self.tmpdir.name
+        self.source.graph = mock.Mock()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _get_tasks(self, limit):
+        context = mock.Mock()
+        context.Pool.return_value.starmap.return_value = []
+        with mock.patch.object(go_module, 'GAF_SPLIT_BYTES', 1), \
+                mock.patch.object(
+                    go_module.multiprocessing, 'get_context', return_value=context):
+            self.source.process_gafs_in_parallel([self.gaffile], limit)
+        return context.Pool.return_value.starmap.call_args[0][1]
+
+    def test_split_without_limit(self):
+        tasks = self._get_tasks(None)
+        self.assertEqual([task[2:4] for task in tasks], [(0, 4), (1, 4), (2, 4), (3, 4)])
+
+    def test_whole_with_limit(self):
+        # a limit is the first rows of the file, not of each part
+        tasks = self._get_tasks(10)
+        self.assertEqual([task[1:4] for task in tasks], [(10, 0, 1)])
+
+
+class UniProtIndexTestCase(unittest.TestCase):
+    """
+    The UniProt to gene index, from a few idmapping_selected.tab.gz rows
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.bigfile = os.path.join(self.tmpdir.name, 'idmapping_selected.tab.gz')
+        self.indexfile = os.path.join(self.tmpdir.name, 'idmapping.sqlite')
+        rows = [
+            ('P31946', '7529', '9606', ''),
+            ('P62258', '7531; 7532', '9606', 'ENSG00000108953'),  # ambiguous gene
+            ('Q9CQV8', '', '10090', 'ENSMUSG00000076609'),
+            ('Q12345', '', '10090', 'ENSMUSG1; ENSMUSG2'),        # no 1:1
+            ('P00001', '1', '562', ''),                           # other taxon
+        ]
+        with gzip.open(self.bigfile, 'wt') as writer:
+            for (acc, geneid, taxon, ensembl) in rows:
+                row = [''] * 22
+                row[0], row[2], row[12], row[18] = acc, geneid, taxon, ensembl
+                writer.write('\t'.join(row) + '\n')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_build_and_read(self):
+        count = GeneOntology.build_uniprot_index(
+            self.bigfile, self.indexfile, [9606, 10090])
+        self.assertEqual(count, 3)
+        self.assertEqual(
+            GeneOntology.read_uniprot_index(self.indexfile, [9606]), {
+                'P31946': 'NCBIGene:7529',
+                'P62258': 'ENSEMBL:ENSG00000108953'})
+        self.assertEqual(
+            GeneOntology.read_uniprot_index(self.indexfile, [10090, 562]), {
+                'Q9CQV8': 'ENSEMBL:ENSMUSG00000076609'})
+        self.assertEqual(
+            GeneOntology._get_uniprot_index_taxa(self.indexfile, self.bigfile),
+            {9606, 10090})
+        os.utime(self.bigfile, (0, 0))
+        self.assertEqual(
+            GeneOntology._get_uniprot_index_taxa(self.indexfile, self.bigfile), set())
+
+    def test_index_taxa(self):
+        """
+        built again only to add taxa, keeping those already indexed
+        """
+        source = GeneOntology.__new__(GeneOntology)
+        source.rawdir = self.tmpdir.name
+        source.files = {
+            '9606': {}, 'id-map': {'file': os.path.basename(self.bigfile), 'url': None}}
+        source.fetch_from_url = lambda url, localfile: None
+        source.tax_ids = [10090]
+        self.assertEqual(
+            source.get_uniprot_entrez_id_map(),
+            {'Q9CQV8': 'ENSEMBL:ENSMUSG00000076609'})
+        source.tax_ids = []
+        built = os.path.getmtime(self.indexfile)
+        source.get_uniprot_entrez_id_map()
+        self.assertEqual(os.path.getmtime(self.indexfile), built)
+        self.assertEqual(
+            GeneOntology._get_uniprot_index_taxa(self.indexfile, self.bigfile),
+            {9606, 10090})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -34,6 +34,20 @@ class GeneralGraphTestCase(unittest.TestCase):
 
         return
 
+    def test_getnode_interned(self):
+        """
+        The same curie gives back the same node object,
+        and its prefix is bound to the graph
+        """
+        node = self.graph._getnode('HP:0000118')
+        self.assertIs(node, self.graph._getnode('HP:0000118'))
+        self.assertIs(
+            self.graph._getnode('_:b1'), self.graph._getnode('_:b1'))
+        self.assertIn(
+            'HP', [pfx for (pfx, ns) in self.graph.namespace_manager.namespaces()])
+
+        return
+
     def readGraphFromTurtleFile(self, f):
         """
         This will read the specified file into a graph.  A simple parsing test.
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+import logging
+from unittest import mock
+
+import yaml
+from rdflib import URIRef
+from rdflib.namespace import RDF, OWL
+
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils import GraphUtils as graph_utils
+from dipper.utils.GraphUtils import GraphUtils
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class PropertyAxiomTestCase(unittest.TestCase):
+    """
+    add_property_axioms() from a cached property bundle, without the network
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmpdir.name, 'property_axioms.yaml')
+        with open(self.cache_file, 'w') as yaml_writer:
+            yaml.safe_dump({
+                'created': '2019-01-01 00:00:00',
+                'ontologies': {
+                    ontology: None for ontology in graph_utils.PROPERTY_ONTOLOGIES},
+                'ObjectProperty': ['http://purl.obolibrary.org/obo/RO_0002162'],
+                'AnnotationProperty': ['http://purl.obolibrary.org/obo/IAO_0000115'],
+                'DatatypeProperty': [],
+            }, yaml_writer)
+        self.default_cache = graph_utils.PROPERTY_CACHE
+        GraphUtils.property_types[self.default_cache] = \
+            GraphUtils.get_property_types(self.cache_file)
+
+    def tearDown(self):
+        GraphUtils.property_types.clear()
+        self.tmpdir.cleanup()
+
+    def test_add_property_axioms(self):
+        graph = RDFGraph()
+        graph.addTriple('HP:0000118', 'RO:0002162', 'NCBITaxon:9606')
+        graph = GraphUtils.add_property_axioms(
+            graph, GraphUtils.get_properties_from_graph(graph))
+        in_taxon = URIRef('http://purl.obolibrary.org/obo/RO_0002162')
+        self.assertIn((in_taxon, RDF['type'], OWL['ObjectProperty']), graph)
+        # declared, but not used in the graph
+        self.assertNotIn(
+            (URIRef('http://purl.obolibrary.org/obo/IAO_0000115'), RDF['type'],
+             OWL['AnnotationProperty']), graph)
+
+    def test_cache_read_once(self):
+        """
+        later sources in the same process reuse what was read
+        """
+        os.remove(self.cache_file)
+        property_types = GraphUtils.get_property_types(self.cache_file)
+        self.assertEqual(property_types['DatatypeProperty'], set())
+        self.assertEqual(len(property_types['ObjectProperty']), 1)
+
+    def test_unreadable_cache(self):
+        """
+        an empty or truncated cache is fetched again
+        """
+        bundle = {
+            'created': '2019-01-02 00:00:00',
+            'ontologies': {
+                ontology: None for ontology in graph_utils.PROPERTY_ONTOLOGIES},
+            'ObjectProperty': [], 'AnnotationProperty': [], 'DatatypeProperty': []}
+        for text in ('', 'created: [2019-01-01\n'):
+            with open(self.cache_file, 'w') as writer:
+                writer.write(text)
+            GraphUtils.property_types.pop(self.cache_file)
+            with mock.patch.object(
+                    GraphUtils, '_get_property_bundle', return_value=bundle) as fetch:
+                property_types = GraphUtils.get_property_types(self.cache_file)
+            fetch.assert_called_once_with()
+            self.assertEqual(property_types['ObjectProperty'], set())
+            with open(self.cache_file) as reader:
+                self.assertEqual(yaml.safe_load(reader), bundle)
+
+
+if __name__ == '__main__':
+    unittest.main()
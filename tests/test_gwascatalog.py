@@ -4,6 +4,7 @@ import unittest
 import logging
 from dipper.sources.GWASCatalog import GWASCatalog
 from dipper.graph.RDFGraph import RDFGraph
+from dipper.utils.OntologyUtil import OntologyUtil
 from dipper.utils.TestUtils import TestUtils
 
 logging.basicConfig()
@@ -150,11 +151,9 @@ class TestGwasSNPModel(unittest.TestCase):
         :return:
         """
         self.assertTrue(len(list(self.source.graph)) == 0)
-        efo_ontology = RDFGraph()
-        LOG.info("Loading EFO ontology in separate rdf graph")
-        efo_ontology.parse(self.source.files['efo']['url'], format='xml')
-        efo_ontology.bind_all_namespaces()
-        LOG.info("Finished loading EFO ontology")
+        efo_file = '/'.join((self.source.rawdir, self.source.files['efo']['file']))
+        self.source.fetch_from_url(self.source.files['efo']['url'], efo_file)
+        efo_ontology = OntologyUtil(efo_file)
 
         variant_curie, variant_type = self.source._get_curie_and_type_from_id(
             self.test_data['snp_label'])
@@ -250,11 +249,9 @@ class TestGwasHaplotypeModel(unittest.TestCase):
         variant_curie, variant_type = self.source._get_curie_and_type_from_id(
             self.test_data['snp_label'])
 
-        so_ontology = RDFGraph()
-        LOG.info("Loading SO ontology in separate rdf graph")
-        so_ontology.parse(self.source.files['so']['url'], format='xml')
-        so_ontology.bind_all_namespaces()
-        LOG.info("Finished loading SO ontology")
+        so_file = '/'.join((self.source.rawdir, self.source.files['so']['file']))
+        self.source.fetch_from_url(self.source.files['so']['url'], so_file)
+        so_ontology = OntologyUtil(so_file)
 
         self.source._process_haplotype(
             variant_curie, self.test_data['snp_label'], self.test_data['chrom_num'],
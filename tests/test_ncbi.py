@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 
+import gzip
+import os
+import tempfile
 import unittest
 import logging
 from tests.test_source import SourceTestCase
@@ -22,6 +25,40 @@ class NCBITestCase(SourceTestCase):
         self.source = None
         return
 
+    def test_split_by_taxon(self):
+        """
+        splits are made once per version of the file, for the taxa asked for
+        """
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.source.rawdir = tmpdir.name
+        gene2pubmed = os.path.join(tmpdir.name, 'gene2pubmed.gz')
+        with gzip.open(gene2pubmed, 'wt') as writer:
+            writer.write(
+                '#tax_id\tGeneID\tPubMed_ID\n9606\t1\t10\n'
+                '10090\t2\t20\n96060\t3\t30\n9606\t4\t40\n')
+
+        splits = self.source.split_by_taxon('gene2pubmed', ['9606'])
+        with gzip.open(splits['9606'], 'rt') as reader:
+            self.assertEqual(
+                reader.read(),
+                '#tax_id\tGeneID\tPubMed_ID\n35\t9606\t1\t10\n67\t9606\t4\t40\n')
+        mtime = os.stat(splits['9606']).st_mtime_ns
+
+        splits = self.source.split_by_taxon('gene2pubmed', ['9606', '10090'])
+        self.assertEqual(os.stat(splits['9606']).st_mtime_ns, mtime)
+
+        # in the order of the whole file, whatever the order of the taxa
+        self.source.test_mode = False
+        self.source.tax_ids = ['10090', '9606']
+        self.assertEqual(list(self.source._get_lines('gene2pubmed')), [
+            b'#tax_id\tGeneID\tPubMed_ID\n', b'9606\t1\t10\n', b'10090\t2\t20\n',
+            b'9606\t4\t40\n'])
+
+    def test_duplicate_taxa(self):
+        source = NCBIGene('rdf_graph', True, tax_ids=[9606, '9606', 10090])
+        self.assertEqual(source.tax_ids, ['9606', '10090'])
+
     # TODO add some specific tests to make sure we are hitting
     # all parts of the code
     # @unittest.skip('test not yet defined')
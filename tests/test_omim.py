@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
+import tempfile
 import unittest
 import logging
+from unittest import mock
 # import os
 # from rdflib import Graph
 # from tests import test_general, test_source
@@ -25,6 +27,59 @@ class OMIMTestCase(SourceTestCase):
         self.source = None
         return
 
+    def test_cached_entries(self):
+        """
+        entries fetched recently enough are not asked for again
+        """
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.source.rawdir = tmpdir.name
+        entries = [
+            {'entry': {'mimNumber': int(omimid), 'status': 'live'}}
+            for omimid in ('100100', '100200')]
+        cache = self.source._open_entry_cache()
+        try:
+            self.source._cache_entries(cache, entries, 'all')
+        finally:
+            cache.close()
+
+        self.source.test_mode = False
+        processed = self.source.process_entries(
+            ['OMIM:100100', '100200'], lambda e, graph, globaltt: e['entry'],
+            {'all'})
+        self.assertEqual(
+            [entry['mimNumber'] for entry in processed], [100100, 100200])
+
+    def test_cached_and_fetched_in_order(self):
+        """
+        entries come out in the order asked for, cached or not
+        """
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.source.rawdir = tmpdir.name
+        omimids = [str(100100 + num * 100) for num in range(45)]
+        cache = self.source._open_entry_cache()
+        try:
+            self.source._cache_entries(cache, [
+                {'entry': {'mimNumber': int(omimid)}} for omimid in omimids[::3]],
+                'all')
+        finally:
+            cache.close()
+
+        def fetch_entry_group(group, omimparams, limiter):
+            return [{'entry': {'mimNumber': int(omimid)}} for omimid in group]
+
+        self.source.test_mode = False
+        with mock.patch.object(
+                OMIM, '_fetch_entry_group', side_effect=fetch_entry_group) as fetch:
+            processed = self.source.process_entries(
+                omimids, lambda e, graph, globaltt: e['entry'], {'all'})
+        tofetch = [omimid for (num, omimid) in enumerate(omimids) if num % 3]
+        self.assertEqual(
+            [call[0][0] for call in fetch.call_args_list], [tofetch[:20], tofetch[20:]])
+        self.assertEqual(
+            [str(entry['mimNumber']) for entry in processed], omimids)
+
     # TODO add some specific tests to make sure we are
     # hitting all parts of the code
     # @unittest.skip('test not yet defined')
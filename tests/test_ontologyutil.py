@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+import logging
+
+from dipper.utils.OntologyUtil import OntologyUtil
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+ONTOLOGY = """<?xml version="1.0"?>
+<rdf:RDF xmlns="http://purl.obolibrary.org/obo/so.owl#"
+     xmlns:owl="http://www.w3.org/2002/07/owl#"
+     xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+     xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#">
+    <owl:Ontology rdf:about="http://purl.obolibrary.org/obo/so.owl">
+        <owl:versionIRI rdf:resource="http://purl.obolibrary.org/obo/so/{0}/so.owl"/>
+    </owl:Ontology>
+    <owl:Class rdf:about="http://purl.obolibrary.org/obo/SO_0001564">
+        <rdfs:label>gene_variant</rdfs:label>
+    </owl:Class>
+    <owl:Class rdf:about="http://purl.obolibrary.org/obo/SO_0001576">
+        <rdfs:subClassOf rdf:resource="http://purl.obolibrary.org/obo/SO_0001564"/>
+        <rdfs:label>transcript_variant</rdfs:label>
+    </owl:Class>
+    <owl:Class rdf:about="http://purl.obolibrary.org/obo/SO_0001627">
+        <rdfs:subClassOf rdf:resource="http://purl.obolibrary.org/obo/SO_0001576"/>
+        <rdfs:subClassOf>
+            <owl:Restriction>
+                <owl:onProperty rdf:resource="http://purl.obolibrary.org/obo/RO_0002162"/>
+                <owl:someValuesFrom rdf:resource="http://purl.obolibrary.org/obo/SO_0000188"/>
+            </owl:Restriction>
+        </rdfs:subClassOf>
+        <rdfs:label>intron_variant</rdfs:label>
+    </owl:Class>
+</rdf:RDF>
+"""
+
+
+class OntologyUtilTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.owl_file = os.path.join(self.tmpdir.name, 'so.owl')
+        with open(self.owl_file, 'w') as writer:
+            writer.write(ONTOLOGY.format('2019-01-01'))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_closure_and_labels(self):
+        ontology = OntologyUtil(self.owl_file)
+        intron = 'http://purl.obolibrary.org/obo/SO_0001627'
+        self.assertEqual(ontology.version, 'http://purl.obolibrary.org/obo/so/2019-01-01/so.owl')
+        self.assertEqual(ontology.get_label(intron), 'intron_variant')
+        self.assertEqual(ontology.get_label('SO:0001564'), 'gene_variant')
+        self.assertTrue(ontology.is_descendant(intron, 'SO:0001564'))
+        self.assertFalse(ontology.is_child(intron, 'SO:0001564'))
+        self.assertTrue(ontology.is_child(intron, 'SO:0001576'))
+        self.assertFalse(ontology.is_descendant('SO:0001564', intron))
+        self.assertFalse(ontology.is_descendant('SO:9999999', 'SO:0001564'))
+        self.assertIsNone(ontology.get_label('SO:9999999'))
+        self.assertEqual(ontology.get_ancestors(intron), {
+            'http://purl.obolibrary.org/obo/SO_0001576',
+            'http://purl.obolibrary.org/obo/SO_0001564'})
+
+    def test_index_cache(self):
+        first = OntologyUtil(self.owl_file)
+        self.assertTrue(os.path.exists(first.index_file))
+        second = OntologyUtil(self.owl_file)
+        self.assertEqual(second.index_file, first.index_file)
+        self.assertEqual(second.terms, first.terms)
+
+        # a new version gets a new index, replacing the old one
+        with open(self.owl_file, 'w') as writer:
+            writer.write(ONTOLOGY.format('2019-06-01'))
+        third = OntologyUtil(self.owl_file)
+        self.assertNotEqual(third.index_file, first.index_file)
+        self.assertFalse(os.path.exists(first.index_file))
+
+    def test_closure_cycle(self):
+        ancestors = OntologyUtil._get_closure([{1}, {2}, {0}, {0}])
+        self.assertEqual(ancestors[3], [0, 1, 2])
+        self.assertIn(1, ancestors[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+import logging
+
+from dipper.utils.SortUtil import SortUtil
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class SortUtilTestCase(unittest.TestCase):
+    """
+    The external sort must agree with an in memory sorted(set())
+    however small its runs are.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.lines = [
+            '<http://x.org/{}> <http://x.org/p> "{}" .\n'.format(
+                num % 97, num % 13).encode('utf-8')
+            for num in range(1000)]
+        return
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        return
+
+    def _write(self, filename, lines, opener=open):
+        path = os.path.join(self.tmpdir, filename)
+        with opener(path, 'wb') as writer:
+            writer.writelines(lines)
+        return path
+
+    def test_sort_unique_small_runs(self):
+        infile = self._write('a.nt', self.lines)
+        count = SortUtil.sort_unique([infile], infile, run_lines=10)
+        with open(infile, 'rb') as reader:
+            result = reader.readlines()
+        self.assertEqual(result, sorted(set(self.lines)))
+        self.assertEqual(count, len(result))
+        self.assertEqual(os.listdir(self.tmpdir), ['a.nt'])
+
+    def test_merge_many_files_compressed(self):
+        infiles = [
+            self._write('a.nt', self.lines[:600]),
+            self._write('b.nt.gz', self.lines[400:], gzip.open)]
+        outfile = os.path.join(self.tmpdir, 'release.nt.gz')
+        SortUtil.sort_unique(infiles, outfile, run_lines=7)
+        with gzip.open(outfile, 'rb') as reader:
+            result = reader.readlines()
+        self.assertEqual(result, sorted(set(self.lines)))
+
+    def test_missing_final_newline(self):
+        infile = self._write('a.nt', [b'<b> <p> <o> .\n', b'<a> <p> <o> .'])
+        SortUtil.sort_unique([infile], infile)
+        with open(infile, 'rb') as reader:
+            self.assertEqual(reader.read(), b'<a> <p> <o> .\n<b> <p> <o> .\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
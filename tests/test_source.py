@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 
 import unittest
+import gzip
 import logging
+import multiprocessing
 import os
+import tempfile
 import yaml
+from rdflib import URIRef
 from tests import test_general
+from tests.test_fetchutil import CONTENT, ETagHandler, ServerTestCase
 # from tests import test_dataset
+from dipper.utils.FetchUtil import FetchUtil
 from dipper.utils.GraphUtils import GraphUtils
+from dipper.graph.StreamedGraph import StreamedGraph
+from dipper.sources.Source import Source
+from dipper.sources.Monochrom import Monochrom
+from dipper import config
 
 logging.basicConfig(level=logging.WARNING)
 LOG = logging.getLogger(__name__)
@@ -101,5 +111,225 @@ class SourceTestCase(unittest.TestCase):
         return
     """
 
+
+class ReadTsvTestCase(unittest.TestCase):
+
+    columns = ['tax_id', 'GeneID', 'Symbol']
+
+    def test_header_positions(self):
+        """
+        fields are found where the header says, even if not where expected
+        """
+        lines = [
+            b'#GeneID\ttax_id\tSymbol\n',
+            b'1\t9606\tA1BG\n',
+            b'#a comment\n',
+            b'\n',
+            b'2\t10090\n',   # too short
+            b'3\t7955\tabc\r\n',
+        ]
+        rows = list(Source.read_tsv(
+            lines, self.columns, ('tax_id', 'Symbol'), 'test', has_header=True))
+        self.assertEqual(rows, [('9606', 'A1BG'), ('7955', 'abc')])
+
+    def test_lines_starting_with(self):
+        lines = [b'#tax_id\tGeneID\n', b'9606\t1\n', b'96060\t2\n', b'7955\t3\n']
+        self.assertEqual(
+            list(Source.lines_starting_with(lines, [b'9606\t', b'7955\t'])),
+            [b'#tax_id\tGeneID\n', b'9606\t1\n', b'7955\t3\n'])
+
+    def test_no_header(self):
+        lines = ['9606\t1\tA1BG\n']
+        self.assertEqual(
+            list(Source.read_tsv(lines, self.columns, ('GeneID',))), [('1',)])
+
+
+class ProcessorSource(Source):
+    """
+    Three tables, the last looking up what the first wrote
+    """
+    processors = [
+        {'method': 'process_genes', 'writes': ['idhash.gene']},
+        {'method': 'process_labels', 'args': ['gene'], 'writes': ['label_hash']},
+        {'method': 'process_alleles', 'reads': ['idhash'], 'limit': False},
+    ]
+
+    def __init__(self, filename, workers):
+        # no raw or out directories
+        self.name = 'processors'
+        self.test_mode = False
+        self.are_bnodes_skized = True
+        self.graph = StreamedGraph(True, ':MONARCH_processors', filename=filename)
+        self.outdir = os.path.dirname(filename)
+        self.workers = workers
+        self.inherited_graph = None
+        self.idhash = {'gene': {}, 'allele': {}}
+        self.label_hash = {}
+
+    def process_genes(self, limit=None):
+        for num in range(limit):
+            self.idhash['gene'][num] = 'NCBIGene:{}'.format(num)
+            self.graph.addTriple(self.idhash['gene'][num], 'rdf:type', 'SO:0000704')
+
+    def process_labels(self, kind, limit=None):
+        for num in range(limit):
+            self.label_hash[num] = '{} {}'.format(kind, num)
+
+    def process_alleles(self):
+        for num, gene in sorted(self.idhash['gene'].items()):
+            self.graph.addTriple('MGI:{}'.format(num), 'GENO:0000408', gene)
+
+
+def _write_shards(source, shards):
+    """
+    Worker: one shard after another, as a worker of a Pool would
+    """
+    for shard in shards:
+        source.run_into_shard(shard, 'process_genes', 2)
+
+
+class RunProcessorsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_source(self, workers):
+        filename = os.path.join(self.tmpdir.name, '{}.nt'.format(workers))
+        source = ProcessorSource(filename, workers)
+        source.run_processors(source.processors, 3)
+        source.graph.close()
+        with open(filename) as reader:
+            return source, reader.read()
+
+    def test_same_as_one_by_one(self):
+        (serial, serial_nt) = self.run_source(1)
+        (parallel, parallel_nt) = self.run_source(3)
+        self.assertEqual(len(serial_nt.splitlines()), 6)
+        self.assertEqual(parallel_nt, serial_nt)
+        self.assertEqual(parallel.idhash, serial.idhash)
+        self.assertEqual(parallel.label_hash, serial.label_hash)
+        self.assertEqual(os.listdir(self.tmpdir.name), ['1.nt', '3.nt'])
+
+    @unittest.skipUnless(
+        'fork' in multiprocessing.get_all_start_methods(), 'needs fork')
+    def test_run_into_shard(self):
+        """
+        a worker leaves the file its parent has open alone
+        """
+        filename = os.path.join(self.tmpdir.name, 'parent.nt.gz')
+        source = ProcessorSource(filename, 2)
+        source.graph.addTriple('NCBIGene:9', 'rdf:type', 'SO:0000704')
+        source.graph.flush()
+        shards = [
+            os.path.join(self.tmpdir.name, '{}.nt'.format(num)) for num in range(2)]
+        worker = multiprocessing.get_context('fork').Process(
+            target=_write_shards, args=(source, shards))
+        worker.start()
+        worker.join()
+        source.graph.close()
+        with gzip.open(filename, 'rt') as reader:
+            self.assertEqual(len(reader.read().splitlines()), 1)
+        for shard in shards:
+            with open(shard) as reader:
+                self.assertEqual(len(reader.read().splitlines()), 2)
+
+    def test_is_same_hash(self):
+        self.assertTrue(Source._is_same_hash('idhash', 'idhash.gene'))
+        self.assertTrue(Source._is_same_hash('idhash.gene', 'idhash.gene'))
+        self.assertFalse(Source._is_same_hash('idhash.gene', 'idhash.allele'))
+        self.assertFalse(Source._is_same_hash('idhash', 'idhash_gene'))
+
+
+class FetchManifestTestCase(ServerTestCase):
+    """
+    What was fetched is kept in a manifest and makes the next fetch conditional
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.serve(ETagHandler)
+        ETagHandler.statuses = []
+        self.source = Monochrom('rdf_graph', True)
+        self.source.rawdir = self.tmpdir.name
+        self.files = {'genes': {'file': 'gene_info', 'url': self.url}}
+        self.localfile = os.path.join(self.tmpdir.name, 'gene_info')
+
+    def tearDown(self):
+        self.source.close()
+        super().tearDown()
+
+    def test_no_manifest(self):
+        self.assertEqual(self.source.load_fetch_manifest(), {})
+        self.assertFalse(self.source.verify_fetched_files(self.files))
+
+    def test_fetch_file(self):
+        entry = self.source._fetch_file(
+            FetchUtil(), self.url, self.localfile, False, None, None)
+        self.assertEqual(entry['etag'], '"v1"')
+        self.assertEqual(entry['size'], len(CONTENT))
+        self.assertEqual(entry['sha256'], FetchUtil.get_file_sha256(self.localfile))
+
+        # unchanged, the server is asked once and the entry handed back as is
+        self.assertIs(self.source._fetch_file(
+            FetchUtil(), self.url, self.localfile, False, None, entry), entry)
+        self.assertEqual(ETagHandler.statuses, [200, 304])
+
+    def test_not_modified(self):
+        self.source.get_files(False, self.files)
+        manifest = self.source.load_fetch_manifest()
+        self.assertEqual(sorted(manifest), ['gene_info'])
+        self.assertTrue(self.source.verify_fetched_files(self.files))
+        mtime = os.stat(self.localfile).st_mtime
+
+        self.source.get_files(False, self.files)
+        self.assertEqual(ETagHandler.statuses, [200, 304])
+        self.assertEqual(os.stat(self.localfile).st_mtime, mtime)
+        self.assertEqual(self.source.load_fetch_manifest(), manifest)
+        self.assertTrue(self.source.verify_fetched_files(self.files))
+        # the file is dated by its Last-Modified
+        issued = self.source.dataset.graph.objects(
+            URIRef(self.url), URIRef('http://purl.org/dc/terms/issued'))
+        self.assertEqual([str(date) for date in issued], ['2019-01-01'])
+
+        with open(self.localfile, 'ab') as writer:
+            writer.write(b'\n')
+        self.assertFalse(self.source.verify_fetched_files(self.files))
+
+
+class GraphStoreTestCase(unittest.TestCase):
+    """
+    with graph_store: sqlite every source gets a store file of its own
+    """
+
+    def setUp(self):
+        self.graph_store = config.get_config().get('graph_store')
+        config.get_config()['graph_store'] = 'sqlite'
+
+    def tearDown(self):
+        if self.graph_store is None:
+            del config.get_config()['graph_store']
+        else:
+            config.get_config()['graph_store'] = self.graph_store
+
+    def test_store_per_source(self):
+        first = Monochrom('rdf_graph', True)
+        try:
+            first.graph.addTriple('CHR:9606chr1', 'rdf:type', 'SO:0000340')
+            triples = len(first.graph)
+            # e.g. a helper instance of the same source
+            second = Monochrom('rdf_graph', True)
+            second.close()
+            self.assertNotEqual(second.graph.store.path, first.graph.store.path)
+            self.assertFalse(os.path.exists(second.graph.store.path))
+            self.assertEqual(len(first.graph), triples)
+        finally:
+            first.close()
+        self.assertFalse(os.path.exists(first.graph.store.path))
+        first.close()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+import logging
+
+from rdflib import Literal, URIRef
+from rdflib.compare import isomorphic
+
+from dipper.graph.RDFGraph import RDFGraph
+from dipper.graph.SQLiteStore import SQLiteStore
+
+logging.basicConfig(level=logging.WARNING)
+LOG = logging.getLogger(__name__)
+
+
+class SQLiteStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dbfile = os.path.join(self.tmpdir.name, 'graph.sqlite')
+        self.graph = RDFGraph(True, 'test_graph', SQLiteStore(self.dbfile))
+        self.memgraph = RDFGraph(True, 'test_graph')
+        for graph in (self.graph, self.memgraph):
+            graph.addTriple('HP:0000118', 'rdf:type', 'owl:Class')
+            graph.addTriple('HP:0000118', 'rdfs:label', 'Phenotypic abnormality')
+            graph.addTriple('HP:0000118', 'rdfs:label', 'Phenotypic abnormality')
+            graph.addTriple(
+                'HP:0000118', 'rdfs:comment', 'no', object_is_literal=True,
+                literal_type='xsd:string')
+            graph.addTriple('_:b1', 'rdf:type', 'owl:Class')
+            graph.addTriple('_:b1', 'IAO:0000115', 7, object_is_literal=True)
+
+    def tearDown(self):
+        self.graph.destroy(None)
+        self.tmpdir.cleanup()
+
+    def test_same_as_memory(self):
+        self.assertEqual(len(self.graph), 5)
+        self.assertTrue(isomorphic(self.graph, self.memgraph))
+        self.assertEqual(
+            sorted(self.graph.serialize(format='nt').splitlines()),
+            sorted(self.memgraph.serialize(format='nt').splitlines()))
+
+    def test_triple_patterns(self):
+        hp_iri = URIRef('http://purl.obolibrary.org/obo/HP_0000118')
+        self.assertEqual(
+            list(self.graph.objects(hp_iri, URIRef(
+                'http://www.w3.org/2000/01/rdf-schema#label'))),
+            [Literal('Phenotypic abnormality')])
+        self.assertEqual(
+            len(list(self.graph.subjects(
+                URIRef('http://www.w3.org/1999/02/22-rdf-syntax-ns#type'), None))), 2)
+        self.assertEqual(
+            list(self.graph.triples((URIRef('http://example.org/none'), None, None))),
+            [])
+        self.graph.remove((hp_iri, None, None))
+        self.assertEqual(len(self.graph), 2)
+
+    def test_destroy(self):
+        self.assertTrue(os.path.exists(self.dbfile))
+        self.graph.destroy(None)
+        self.assertFalse(os.path.exists(self.dbfile))
+
+
+if __name__ == '__main__':
+    unittest.main()
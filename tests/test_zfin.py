@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+import os
+import tempfile
 import unittest
 import logging
 from tests.test_source import SourceTestCase
@@ -36,5 +38,29 @@ class ZFINTestCase(SourceTestCase):
 
         return
 
+    def test_zp_mappings(self):
+        """
+        EQ sextuples map to ZP ids, from the mapping file or its saved index
+        """
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        zp_file = os.path.join(tmpdir.name, 'zp-mapping.txt')
+        with open(zp_file, 'w') as writer:
+            writer.write(
+                'ZP:0000001\tlabel\tZFA:0000107\t\tPATO:0000587\t'
+                'PATO:0000460\t\t\n')
+
+        for _ in ('file', 'index'):
+            self.source.zp_map = self.source._load_zp_mappings(zp_file)
+            self.assertTrue(os.path.exists(zp_file + '.index'))
+            self.assertEqual(
+                self.source._map_sextuple_to_phenotype(
+                    'ZFA:0000107', '', 'PATO:0000587', '', '', 'abnormal'),
+                'ZP:0000001')
+            self.assertIsNone(
+                self.source._map_sextuple_to_phenotype(
+                    'ZFA:0000107', '', 'PATO:0000587', '', '', 'normal'))
+
+
 if __name__ == '__main__':
     unittest.main()